@@ -1,32 +1,23 @@
-from functools import partial
+import os
+import time
 
-import gurobipy as gp
-from gurobipy import GRB
+from model_cache import read_cached
+from termination_policies import GapStagnation, optimize
+from trajectory import TrajectoryRecorder, attach_recorder
 
 
-class CallbackData:
-    def __init__(self):
-        self.last_gap_change_time = -GRB.INFINITY
-        self.last_gap = GRB.INFINITY
+recorder = TrajectoryRecorder(min_interval=0.1)
+start = time.perf_counter()
+with read_cached("data/mkp.mps.bz2") as model:
+    recorder.build_time = time.perf_counter() - start
 
-
-def callback(model, where, *, cbdata):
-    if where != GRB.Callback.MIP:
-        return
-    if model.cbGet(GRB.Callback.MIP_SOLCNT) == 0:
-        return
-
-    # Use model.terminate() to end the search when required...
-    # ...
-
-
-with gp.read("data/mkp.mps.bz2") as model:
-    # Global variables used in the callback function
+    # Stop when the gap has not improved by more than epsilon for time_from_best seconds
     time_from_best = 15
     epsilon_to_compare_gap = 1e-4
 
-    # Initialize data passed to the callback function
-    callback_data = CallbackData()
-    callback_func = partial(callback, cbdata=callback_data)
+    policy = GapStagnation(time_from_best, epsilon_to_compare_gap)
+    optimize(model, policy, attach_recorder(model, recorder))
+    recorder.finish(model)
 
-    model.optimize(callback_func)
\ No newline at end of file
+os.makedirs("trajectories", exist_ok=True)
+recorder.save("trajectories/mkp.json")
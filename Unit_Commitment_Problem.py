@@ -1,6 +1,12 @@
+import os
+import time
+
 import gurobipy as gp
 from gurobipy import GRB
 
+from termination_policies import GapStagnation, optimize
+from trajectory import TrajectoryRecorder, attach_recorder
+
 
 # 24 Hour Load Forecast (MW)
 load_forecast = [
@@ -110,23 +116,25 @@ def show_results():
     print("\n")
 
 
+recorder = TrajectoryRecorder()
+start = time.perf_counter()
 with gp.Env() as env, gp.Model(env=env) as model:
 
     # add variables for thermal units (power and statuses for commitment, startup and shutdown)
     thermal_units_out_power = model.addVars(
-        # ...
+        thermal_units, range(nTimeIntervals), vtype=GRB.CONTINUOUS, lb=0,
         name="thermal_units_out_power"
     )
     thermal_units_startup_status = model.addVars(
-        # ...
+        thermal_units, range(nTimeIntervals), vtype=GRB.BINARY,
         name="thermal_unit_startup_status",
     )
     thermal_units_shutdown_status = model.addVars(
-        # ...
+        thermal_units, range(nTimeIntervals), vtype=GRB.BINARY,
         name="thermal_unit_shutdown_status",
     )
     thermal_units_comm_status = model.addVars(
-        # ...
+        thermal_units, range(nTimeIntervals), vtype=GRB.BINARY,
         name="thermal_unit_comm_status"
     )
 
@@ -134,13 +142,18 @@ with gp.Env() as env, gp.Model(env=env) as model:
     obj_fun_expr = gp.QuadExpr(0)
     for t in range(nTimeIntervals):
         for g in thermal_units:
-                    # ...
+            power = thermal_units_out_power[g, t]
+            obj_fun_expr.add(a[g] * thermal_units_comm_status[g, t] + b[g] * power + c[g] * power * power)
+            obj_fun_expr.add(
+                sup_cost[g] * thermal_units_startup_status[g, t]
+                + sdn_cost[g] * thermal_units_shutdown_status[g, t]
+            )
     model.setObjective(obj_fun_expr)
 
     # Power balance equations
     for t in range(nTimeIntervals):
         model.addConstr(
-            # ...
+            thermal_units_out_power.sum("*", t) + solar_forecast[t] == load_forecast[t],
             name="power_balance_" + str(t),
         )
 
@@ -149,17 +162,19 @@ with gp.Env() as env, gp.Model(env=env) as model:
         for g in thermal_units:
             if t == 0:
                 model.addConstr(
-                    # ...
+                    thermal_units_comm_status[g, t] - init_status[g]
+                    == thermal_units_startup_status[g, t] - thermal_units_shutdown_status[g, t],
                     name="logical1_" + g + "_" + str(t),
                 )
             else:
                 model.addConstr(
-                    # ...
+                    thermal_units_comm_status[g, t] - thermal_units_comm_status[g, t - 1]
+                    == thermal_units_startup_status[g, t] - thermal_units_shutdown_status[g, t],
                     name="logical1_" + g + "_" + str(t),
                 )
 
             model.addConstr(
-                # ...
+                thermal_units_startup_status[g, t] + thermal_units_shutdown_status[g, t] <= 1,
                 name="logical2_" + g + "_" + str(t),
             )
 
@@ -167,15 +182,23 @@ with gp.Env() as env, gp.Model(env=env) as model:
     for t in range(nTimeIntervals):
         for g in thermal_units:
             model.addGenConstrIndicator(
-                # ...
+                thermal_units_comm_status[g, t], True, thermal_units_out_power[g, t] >= pmin[g],
+                name="physical_min_" + g + "_" + str(t),
             )
             model.addGenConstrIndicator(
-                # ...
-
+                thermal_units_comm_status[g, t], True, thermal_units_out_power[g, t] <= pmax[g],
+                name="physical_max_" + g + "_" + str(t),
             )
             model.addGenConstrIndicator(
-                # ...
+                thermal_units_comm_status[g, t], False, thermal_units_out_power[g, t] == 0,
+                name="physical_off_" + g + "_" + str(t),
             )
 
-    model.optimize()
-    show_results()
\ No newline at end of file
+    # Stop once the gap stops improving
+    recorder.build_time = time.perf_counter() - start
+    optimize(model, GapStagnation(10, 1e-4), attach_recorder(model, recorder))
+    recorder.finish(model)
+    show_results()
+
+os.makedirs("trajectories", exist_ok=True)
+recorder.save("trajectories/ucp.json")
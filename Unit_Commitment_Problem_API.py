@@ -0,0 +1,529 @@
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+import gurobipy as gp
+from gurobipy import GRB
+
+UNITS_PATH = "data/ucp_units.csv"
+FORECAST_PATH = "data/ucp_forecast.csv"
+
+# Columns of the unit file besides the name: costs (a + b*p + c*p^2, startup, shutdown),
+# operating limits and initial commitment status
+UNIT_COLUMNS = ("a", "b", "c", "startup_cost", "shutdown_cost", "pmin", "pmax", "init_status")
+
+# Power cost models: exact quadratic objective (MIQP), maximum of segments + 1 tangents
+# at evenly spaced points of [0, pmax] (MILP, under-estimate), or piecewise-linear
+# objective through the same points (MILP, over-estimate)
+COST_MODES = ("quadratic", "tangent", "pwl")
+
+
+def load_units(path=UNITS_PATH):
+    """Read the unit file into a dict of NumPy arrays (one entry per column)."""
+    table = np.genfromtxt(path, delimiter=",", names=True, dtype=None, encoding="utf-8")
+    table = np.atleast_1d(table)
+    units = {"name": table["name"].astype(str)}
+    for column in UNIT_COLUMNS:
+        units[column] = table[column].astype(float)
+    return units
+
+
+def load_forecast(path=FORECAST_PATH):
+    """Read the load and solar forecasts (one row per interval) into two arrays."""
+    table = np.atleast_1d(np.genfromtxt(path, delimiter=",", names=True, encoding="utf-8"))
+    return table["load"].astype(float), table["solar"].astype(float)
+
+
+def generate_fleet(num_units, num_intervals, seed=0):
+    """
+    Random fleet around the sample units and a daily load/solar profile
+    repeated over num_intervals, with enough capacity to meet the load.
+    """
+    rng = np.random.default_rng(seed)
+    pmax = rng.uniform(3.0, 10.0, num_units)
+    units = {
+        "name": np.array([f"gen{g + 1}" for g in range(num_units)]),
+        "a": rng.uniform(2.0, 8.0, num_units),
+        "b": rng.uniform(0.5, 3.0, num_units),
+        "c": rng.uniform(0.05, 2.0, num_units),
+        "startup_cost": rng.uniform(1.0, 3.0, num_units),
+        "shutdown_cost": rng.uniform(0.5, 1.5, num_units),
+        "pmin": pmax * rng.uniform(0.1, 0.4, num_units),
+        "pmax": pmax,
+        "init_status": np.zeros(num_units),
+    }
+    # Daily cycle of 96 quarter-hours (or of the whole horizon when shorter), midnight at t=0
+    phase = 2.0 * np.pi * np.arange(num_intervals) / min(num_intervals, 96)
+    capacity = pmax.sum()
+    load = capacity * (0.5 - 0.2 * np.cos(phase) + 0.05 * rng.random(num_intervals))
+    solar = np.maximum(0.0, -0.1 * capacity * np.cos(phase))
+    return units, load, solar
+
+
+def build_model(units, load, solar, env=None, cost_mode="quadratic", segments=4):
+    """
+    Build the unit commitment model from arrays: power, commitment, startup
+    and shutdown are (units, intervals) MVar blocks and every constraint
+    family is one sparse matrix constraint over their concatenation.
+    cost_mode selects how b*p + c*p^2 is modelled (see COST_MODES). The
+    blocks and the constraints that later solves update are stored on the
+    model: model._power, ..., model._balance (one row per interval) and
+    model._initial (the t=0 rows whose right-hand side is init_status).
+    """
+    num_units, num_intervals = len(units["name"]), len(load)
+    shape = (num_units, num_intervals)
+    size = num_units * num_intervals
+    model = gp.Model("unit_commitment", env=env)
+
+    # add variables for thermal units (power and statuses for commitment, startup and shutdown)
+    power = model.addMVar(shape, lb=0.0, name="thermal_units_out_power")
+    commitment = model.addMVar(shape, vtype=GRB.BINARY, name="thermal_unit_comm_status")
+    startup = model.addMVar(shape, vtype=GRB.BINARY, name="thermal_unit_startup_status")
+    shutdown = model.addMVar(shape, vtype=GRB.BINARY, name="thermal_unit_shutdown_status")
+    x = gp.hstack([power.reshape(-1), commitment.reshape(-1), startup.reshape(-1), shutdown.reshape(-1)])
+
+    per_interval = lambda values: np.broadcast_to(values[:, None], shape)
+    repeat = lambda values: np.repeat(values, num_intervals)
+    identity = sp.identity(size, format="csr")
+
+    # Power costs b*p + c*p^2
+    points = np.linspace(0.0, 1.0, segments + 1)[:, None] * units["pmax"]
+    if cost_mode == "quadratic":
+        flat_power = power.reshape(-1)
+        model.setMObjective(sp.diags(repeat(units["c"])), None, 0.0, flat_power, flat_power, None)
+        power.Obj = per_interval(units["b"])
+    elif cost_mode == "tangent":
+        cost = model.addMVar(shape, lb=0.0, obj=1.0, name="power_cost")
+        power_and_cost = gp.hstack([power.reshape(-1), cost.reshape(-1)])
+        for k, point in enumerate(points):
+            # cost >= f(point) + f'(point) (p - point) = (b + 2 c point) p - c point^2
+            slope = sp.diags(repeat(units["b"] + 2.0 * units["c"] * point))
+            model.addMConstr(
+                sp.hstack([-slope, identity]).tocsr(), power_and_cost, ">", -repeat(units["c"] * point ** 2),
+                name=f"cost_tangent_{k}",
+            )
+    elif cost_mode == "pwl":
+        values = units["b"] * points + units["c"] * points ** 2
+        for g, row in enumerate(power.tolist()):
+            for variable in row:
+                model.setPWLObj(variable, points[:, g], values[:, g])
+    else:
+        raise ValueError(f"unknown cost mode {cost_mode!r}, expected one of {COST_MODES}")
+
+    # Fixed cost a when committed, startup and shutdown costs (after setMObjective, which resets them)
+    commitment.Obj = per_interval(units["a"])
+    startup.Obj = per_interval(units["startup_cost"])
+    shutdown.Obj = per_interval(units["shutdown_cost"])
+
+    zeros = sp.csr_matrix((size, size))
+
+    # Power balance equations: the sum over units of each interval
+    balance = sp.hstack([sp.kron(np.ones((1, num_units)), sp.identity(num_intervals)), sp.csr_matrix((num_intervals, 3 * size))])
+    model._balance = model.addMConstr(balance.tocsr(), x, "=", load - solar, name="power_balance")
+
+    # Logical constraints: u[t] - u[t-1] = startup - shutdown, with u[-1] = init_status on the right-hand side
+    difference = sp.kron(sp.identity(num_units), sp.identity(num_intervals) - sp.eye(num_intervals, k=-1))
+    initial = np.zeros(shape)
+    initial[:, 0] = units["init_status"]
+    logical1 = sp.hstack([zeros, difference, -identity, identity]).tocsr()
+    logical1 = model.addMConstr(logical1, x, "=", initial.reshape(-1), name="logical1")
+    model._initial = logical1[::num_intervals]
+    model.addMConstr(sp.hstack([zeros, zeros, identity, identity]).tocsr(), x, "<", np.ones(size), name="logical2")
+
+    # Operating limits: pmin <= p <= pmax when committed, p = 0 otherwise
+    limits = lambda column: sp.hstack([identity, -sp.diags(repeat(units[column]))]).tocsr()
+    model.addMConstr(limits("pmin"), x[:2 * size], ">", np.zeros(size), name="physical_min")
+    model.addMConstr(limits("pmax"), x[:2 * size], "<", np.zeros(size), name="physical_max")
+
+    model._power, model._commitment, model._startup, model._shutdown = power, commitment, startup, shutdown
+    return model
+
+
+def _build_model_loops(units, load, solar, env=None):
+    """Former per-unit, per-interval construction (tupledicts, loops), kept for the benchmark."""
+    names = list(units["name"])
+    num_intervals = len(load)
+    model = gp.Model("unit_commitment", env=env)
+    power = model.addVars(names, range(num_intervals), lb=0, name="thermal_units_out_power")
+    startup = model.addVars(names, range(num_intervals), vtype=GRB.BINARY, name="thermal_unit_startup_status")
+    shutdown = model.addVars(names, range(num_intervals), vtype=GRB.BINARY, name="thermal_unit_shutdown_status")
+    commitment = model.addVars(names, range(num_intervals), vtype=GRB.BINARY, name="thermal_unit_comm_status")
+
+    objective = gp.QuadExpr(0)
+    for t in range(num_intervals):
+        for i, g in enumerate(names):
+            p = power[g, t]
+            objective.add(units["a"][i] * commitment[g, t] + units["b"][i] * p + units["c"][i] * p * p)
+            objective.add(units["startup_cost"][i] * startup[g, t] + units["shutdown_cost"][i] * shutdown[g, t])
+    model.setObjective(objective)
+
+    for t in range(num_intervals):
+        model.addConstr(power.sum("*", t) + solar[t] == load[t], name=f"power_balance_{t}")
+    for t in range(num_intervals):
+        for i, g in enumerate(names):
+            previous = units["init_status"][i] if t == 0 else commitment[g, t - 1]
+            model.addConstr(commitment[g, t] - previous == startup[g, t] - shutdown[g, t], name=f"logical1_{g}_{t}")
+            model.addConstr(startup[g, t] + shutdown[g, t] <= 1, name=f"logical2_{g}_{t}")
+            model.addGenConstrIndicator(commitment[g, t], True, power[g, t] >= units["pmin"][i])
+            model.addGenConstrIndicator(commitment[g, t], True, power[g, t] <= units["pmax"][i])
+            model.addGenConstrIndicator(commitment[g, t], False, power[g, t] == 0)
+    return model
+
+
+def schedule(model):
+    """Power and commitment of the solved model as (units, intervals) arrays."""
+    return model._power.X, model._commitment.X > 0.5
+
+
+def schedule_cost(units, power, commitment):
+    """
+    Cost of a (units, intervals) schedule: a + b*p + c*p^2 per committed
+    interval, plus startup and shutdown costs counted from init_status.
+    """
+    previous = np.concatenate([units["init_status"][:, None], commitment[:, :-1]], axis=1)
+    change = commitment.astype(float) - previous
+    column = lambda values: values[:, None]
+    return float(
+        (column(units["a"]) * commitment + column(units["b"]) * power + column(units["c"]) * power ** 2).sum()
+        + (column(units["startup_cost"]) * np.maximum(change, 0.0)).sum()
+        + (column(units["shutdown_cost"]) * np.maximum(-change, 0.0)).sum()
+    )
+
+
+def _shift(values, step):
+    """Move a (units, intervals) array step intervals to the left, repeating its last column."""
+    return np.concatenate([values[:, step:], np.repeat(values[:, -1:], step, axis=1)], axis=1)
+
+
+def solve_rolling_horizon(
+    units, load, solar, window, step, env=None, time_limit=None, cost_mode="quadratic", segments=4
+):
+    """
+    Solve the horizon in overlapping windows of window intervals and keep
+    the first step intervals of each. The window model is built once: each
+    re-solve only updates the balance right-hand side, carries the last
+    kept commitment forward as init_status and starts from the previous
+    window's solution shifted by step. The net load is padded with its last
+    value past the end of the horizon. Returns the power and commitment
+    arrays and the time spent in each window.
+    """
+    num_units, num_intervals = len(units["name"]), len(load)
+    if not 0 < step <= window <= num_intervals:
+        raise ValueError(
+            f"expected 0 < step <= window <= horizon, got step {step}, window {window}, horizon {num_intervals}"
+        )
+    net_load = np.concatenate([load - solar, np.repeat(load[-1] - solar[-1], window)])
+    power = np.zeros((num_units, num_intervals))
+    commitment = np.zeros((num_units, num_intervals), dtype=bool)
+    window_times = []
+
+    with build_model(units, load[:window], solar[:window], env, cost_mode, segments) as model:
+        blocks = (model._power, model._commitment, model._startup, model._shutdown)
+        if time_limit is not None:
+            model.Params.TimeLimit = time_limit
+        status = units["init_status"]
+        for start in range(0, num_intervals, step):
+            begin = time.perf_counter()
+            model._balance.RHS = net_load[start:start + window]
+            model._initial.RHS = status
+            model.optimize()
+            if model.SolCount == 0:
+                raise gp.GurobiError(model.Status, f"no solution for the window starting at interval {start}")
+            window_times.append(time.perf_counter() - begin)
+
+            # Keep the first step intervals and carry their final commitment forward
+            kept = slice(start, min(start + step, num_intervals))
+            length = kept.stop - kept.start
+            power[:, kept] = model._power.X[:, :length]
+            commitment[:, kept] = model._commitment.X[:, :length] > 0.5
+            status = commitment[:, kept.stop - 1].astype(float)
+            for block in blocks:
+                block.Start = _shift(block.X, step)
+
+    return power, commitment, window_times
+
+
+def compare_rolling_horizon(units, load, solar, window, step, env=None, cost_mode="quadratic", segments=4):
+    """Rolling-horizon cost and time against one monolithic solve of the whole horizon."""
+    start = time.perf_counter()
+    power, commitment, window_times = solve_rolling_horizon(
+        units, load, solar, window, step, env, cost_mode=cost_mode, segments=segments
+    )
+    rolling_time = time.perf_counter() - start
+    rolling_cost = schedule_cost(units, power, commitment)
+
+    start = time.perf_counter()
+    with build_model(units, load, solar, env, cost_mode, segments) as model:
+        model.optimize()
+        monolithic_time = time.perf_counter() - start
+        monolithic_cost = schedule_cost(units, *schedule(model))
+    print(
+        f"  rolling {rolling_cost:.3f} in {rolling_time:.3f} s ({len(window_times)} windows), "
+        f"monolithic {monolithic_cost:.3f} in {monolithic_time:.3f} s, "
+        f"gap {(rolling_cost - monolithic_cost) / monolithic_cost:.2%}"
+    )
+
+
+def generate_scenarios(load, solar, num_scenarios, load_noise=0.1, solar_noise=0.3, seed=0):
+    """(num_scenarios, intervals) load and solar matrices around the forecast, with multiplicative noise."""
+    rng = np.random.default_rng(seed)
+    shape = (num_scenarios, len(load))
+    load_scenarios = load * (1.0 + load_noise * rng.standard_normal(shape))
+    solar_scenarios = solar * np.maximum(0.0, 1.0 + solar_noise * rng.standard_normal(shape))
+    return load_scenarios, solar_scenarios
+
+
+def solve_scenarios_together(units, load_scenarios, solar_scenarios, env=None, cost_mode="quadratic", segments=4):
+    """
+    Solve the unit commitment of every scenario in one multi-scenario model
+    (NumScenarios, with the net load as ScenNRHS of the balance rows): each
+    scenario gets its own optimal commitment. Returns the cost of each
+    scenario (inf when infeasible) and the feasibility mask.
+    """
+    net_load = load_scenarios - solar_scenarios
+    with build_model(units, load_scenarios[0], solar_scenarios[0], env, cost_mode, segments) as model:
+        model.NumScenarios = len(net_load)
+        for scenario, row in enumerate(net_load):
+            model.Params.ScenarioNumber = scenario
+            model._balance.ScenNRHS = row
+        model.optimize()
+        costs = np.empty(len(net_load))
+        for scenario in range(len(net_load)):
+            model.Params.ScenarioNumber = scenario
+            costs[scenario] = model.ScenNObjVal if model.SolCount > 0 else GRB.INFINITY
+    feasible = costs < GRB.INFINITY
+    costs[~feasible] = np.inf
+    return costs, feasible
+
+
+def build_dispatch_model(units, commitment, load, solar, env=None, cost_mode="quadratic", segments=4):
+    """
+    Economic dispatch of a fixed commitment plan: build_model with the
+    commitment, startup and shutdown blocks fixed and made continuous, which
+    leaves a convex QP in the power, or an LP with the approximate cost
+    modes (the objective still counts their costs).
+    """
+    model = build_model(units, load, solar, env, cost_mode, segments)
+    previous = np.concatenate([units["init_status"][:, None], commitment[:, :-1]], axis=1)
+    change = commitment.astype(float) - previous
+    for block, values in (
+        (model._commitment, commitment.astype(float)),
+        (model._startup, np.maximum(change, 0.0)),
+        (model._shutdown, np.maximum(-change, 0.0)),
+    ):
+        block.LB = values
+        block.UB = values
+        block.VType = GRB.CONTINUOUS
+    return model
+
+
+def _dispatch(model, net_load):
+    """Re-solve the dispatch model for one net load row; returns (cost or inf, feasible)."""
+    model._balance.RHS = net_load
+    model.optimize()
+    if model.Status != GRB.OPTIMAL:
+        return np.inf, False
+    return model.ObjVal, True
+
+
+# Per-process dispatch model, set by _init_dispatch_worker
+_dispatch_model = None
+
+
+def _init_dispatch_worker(units, commitment, load, solar, cost_mode, segments):
+    global _dispatch_model
+    env = gp.Env(params={"OutputFlag": 0, "Threads": 1})
+    _dispatch_model = build_dispatch_model(units, commitment, load, solar, env, cost_mode, segments)
+
+
+def _dispatch_in_worker(net_load):
+    return _dispatch(_dispatch_model, net_load)
+
+
+def evaluate_commitment(
+    units, commitment, load_scenarios, solar_scenarios, env=None, processes=None, chunksize=8, cost_mode="quadratic",
+    segments=4,
+):
+    """
+    Check one commitment plan against every scenario: the dispatch model is
+    built once (once per worker when processes > 1) and re-solved with each
+    scenario's net load. Returns the cost of each scenario (inf when the
+    plan cannot meet it) and the feasibility mask.
+    """
+    net_load = load_scenarios - solar_scenarios
+    if processes is not None and processes > 1:
+        initargs = (units, commitment, load_scenarios[0], solar_scenarios[0], cost_mode, segments)
+        with ProcessPoolExecutor(processes, initializer=_init_dispatch_worker, initargs=initargs) as executor:
+            results = list(executor.map(_dispatch_in_worker, net_load, chunksize=chunksize))
+    else:
+        with build_dispatch_model(
+            units, commitment, load_scenarios[0], solar_scenarios[0], env, cost_mode, segments
+        ) as model:
+            results = [_dispatch(model, row) for row in net_load]
+    costs = np.fromiter((result[0] for result in results), dtype=float, count=len(results))
+    feasible = np.fromiter((result[1] for result in results), dtype=bool, count=len(results))
+    return costs, feasible
+
+
+def compare_scenarios(units, load, solar, num_scenarios, env=None, processes=None, cost_mode="quadratic", segments=4):
+    """
+    Evaluate num_scenarios generated scenarios with the fixed plan of the
+    forecast, with one multi-scenario model, and by rebuilding and solving
+    one full model per scenario; print the costs, feasibility and times.
+    """
+    load_scenarios, solar_scenarios = generate_scenarios(load, solar, num_scenarios)
+    with build_model(units, load, solar, env, cost_mode, segments) as model:
+        model.optimize()
+        _, commitment = schedule(model)
+
+    def report(label, function):
+        start = time.perf_counter()
+        costs, feasible = function()
+        elapsed = time.perf_counter() - start
+        print(
+            f"  {label:<26} {elapsed:7.3f} s, {np.count_nonzero(feasible)}/{num_scenarios} feasible, "
+            f"mean cost {costs[feasible].mean() if feasible.any() else np.nan:.3f}"
+        )
+        return costs
+
+    def rebuild():
+        costs = np.full(num_scenarios, np.inf)
+        for scenario in range(num_scenarios):
+            with build_model(
+                units, load_scenarios[scenario], solar_scenarios[scenario], env, cost_mode, segments
+            ) as model:
+                model.optimize()
+                if model.Status == GRB.OPTIMAL:
+                    costs[scenario] = model.ObjVal
+        return costs, np.isfinite(costs)
+
+    plan = report(
+        "fixed plan (dispatch)",
+        lambda: evaluate_commitment(
+            units, commitment, load_scenarios, solar_scenarios, env, processes, cost_mode=cost_mode, segments=segments
+        ),
+    )
+    together = report(
+        "multi-scenario model",
+        lambda: solve_scenarios_together(units, load_scenarios, solar_scenarios, env, cost_mode, segments),
+    )
+    rebuilt = report("one model per scenario", rebuild)
+    both = np.isfinite(plan)
+    if both.any():
+        print(f"  cost of the fixed plan over each scenario's optimum: {(plan[both] / together[both] - 1).mean():.2%} on average")
+    print(f"  multi-scenario and per-scenario optima agree: {np.allclose(together, rebuilt, rtol=1e-3)}")
+
+
+def compare_cost_modes(units, load, solar, segments=(2, 4, 8, 16), env=None, repetitions=3):
+    """
+    Solve with each approximate cost mode and number of segments, and
+    compare with the exact quadratic model: solve-time speed-up (best of
+    repetitions), and error of the schedule's exact cost, as solved and after
+    re-dispatching its commitment with the exact quadratic costs.
+    """
+    def solve(cost_mode, count):
+        best = np.inf
+        for _ in range(repetitions):
+            with build_model(units, load, solar, env, cost_mode, count) as model:
+                model.optimize()
+                best = min(best, model.Runtime)
+                power, commitment = schedule(model)
+        return best, power, commitment
+
+    try:
+        exact_time, power, commitment = solve("quadratic", 0)
+        exact = schedule_cost(units, power, commitment)
+        print(f"  quadratic              {exact_time * 1000:8.2f} ms, cost {exact:.3f}")
+    except gp.GurobiError as error:
+        exact_time = exact = None
+        print(f"  quadratic not solved: {error}")
+
+    for cost_mode in COST_MODES[1:]:
+        for count in segments:
+            solve_time, power, commitment = solve(cost_mode, count)
+            cost = schedule_cost(units, power, commitment)
+            line = f"  {cost_mode:<8} {count:>2} segments {solve_time * 1000:8.2f} ms, cost {cost:.3f}"
+            if exact is not None:
+                # The re-dispatch is a quadratic model too: only run when the exact model could be solved
+                redispatched = evaluate_commitment(units, commitment, load[None, :], solar[None, :], env)[0][0]
+                line += (
+                    f" (re-dispatched {redispatched:.3f}), speed-up x{exact_time / solve_time:.1f}, "
+                    f"error {cost / exact - 1:.3%} (re-dispatched {redispatched / exact - 1:.3%})"
+                )
+            print(line)
+
+
+def benchmark_build(unit_counts=(3, 30, 300), interval_counts=(24, 96, 672), loop_limit=50_000):
+    """
+    Build time of the array model (and of the loop model while units x
+    intervals <= loop_limit) as the fleet and the horizon grow.
+    """
+    with gp.Env(params={"OutputFlag": 0}) as env:
+        build_model(*generate_fleet(3, 4), env=env).dispose()
+        for num_units in unit_counts:
+            for num_intervals in interval_counts:
+                data = generate_fleet(num_units, num_intervals)
+                start = time.perf_counter()
+                model = build_model(*data, env=env)
+                model.update()
+                array_time = time.perf_counter() - start
+                size = f"{model.NumVars} vars, {model.NumConstrs} constraints"
+                model.dispose()
+
+                loop_time = "-"
+                if num_units * num_intervals <= loop_limit:
+                    start = time.perf_counter()
+                    model = _build_model_loops(*data, env=env)
+                    model.update()
+                    loop_time = f"{time.perf_counter() - start:.3f} s"
+                    model.dispose()
+                print(
+                    f"  {num_units:>4} units x {num_intervals:>4} intervals ({size}): "
+                    f"arrays {array_time:.3f} s, loops {loop_time}"
+                )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        benchmark_build()
+    elif len(sys.argv) > 1 and sys.argv[1] == "rolling":
+        # rolling [window step days cost_mode]: the sample forecast repeated over days
+        window = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+        step = int(sys.argv[3]) if len(sys.argv) > 3 else 6
+        days = int(sys.argv[4]) if len(sys.argv) > 4 else 1
+        cost_mode = sys.argv[5] if len(sys.argv) > 5 else "quadratic"
+        load, solar = load_forecast()
+        with gp.Env(params={"OutputFlag": 0}) as env:
+            compare_rolling_horizon(
+                load_units(), np.tile(load, days), np.tile(solar, days), window, step, env, cost_mode
+            )
+    elif len(sys.argv) > 1 and sys.argv[1] == "scenarios":
+        # scenarios [num_scenarios processes intervals cost_mode]: noisy scenarios around the sample forecast
+        num_scenarios = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+        processes = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        load, solar = load_forecast()
+        intervals = int(sys.argv[4]) if len(sys.argv) > 4 else len(load)
+        cost_mode = sys.argv[5] if len(sys.argv) > 5 else "quadratic"
+        with gp.Env(params={"OutputFlag": 0}) as env:
+            compare_scenarios(
+                load_units(), load[:intervals], solar[:intervals], num_scenarios, env, processes, cost_mode
+            )
+    elif len(sys.argv) > 1 and sys.argv[1] == "costs":
+        # costs [intervals]: approximate cost modes against the quadratic model on the sample data
+        load, solar = load_forecast()
+        intervals = int(sys.argv[2]) if len(sys.argv) > 2 else len(load)
+        with gp.Env(params={"OutputFlag": 0}) as env:
+            compare_cost_modes(load_units(), load[:intervals], solar[:intervals], env=env)
+    else:
+        units = load_units(sys.argv[1] if len(sys.argv) > 1 else UNITS_PATH)
+        load, solar = load_forecast(sys.argv[2] if len(sys.argv) > 2 else FORECAST_PATH)
+        with gp.Env() as env, build_model(units, load, solar, env) as model:
+            model.optimize()
+            power, _ = schedule(model)
+            print(f" OverAll Cost = {round(model.ObjVal, 2)}")
+            for name, row in zip(units["name"], power):
+                print("%5s" % name, " ".join("%4.1f" % value for value in row))
+            print("%5s" % "Solar", " ".join("%4.1f" % value for value in solar))
+            print("%5s" % "Load", " ".join("%4.1f" % value for value in load))
@@ -0,0 +1,118 @@
+import gurobipy as gp
+from gurobipy import GRB
+
+from lecture import charger_magasin
+from stockage import compter_communes_plages, construire_diapositives
+
+# Nombre de photos libres examinées pour trouver le partenaire d'une photo
+FENETRE = 50
+# Nombre de paires réoptimisées ensemble par le MIP de raffinement (0 : pas de raffinement)
+TAILLE_BLOC_MIP = 0
+
+
+def _chevauchement(photos, p, q):
+    debuts = photos.debuts
+    return compter_communes_plages(photos.etiquettes, debuts[p], debuts[p + 1], debuts[q], debuts[q + 1])
+
+
+def apparier_glouton(photos, verticales, fenetre=FENETRE):
+    """
+    Apparier les photos verticales sans modèle : par nombre d'étiquettes
+    décroissant, chaque photo libre prend, parmi les fenetre photos libres
+    suivantes, celle qui partage le moins d'étiquettes avec elle (arrêt
+    immédiat dès qu'un chevauchement nul est trouvé).
+
+    Toutes les photos sont utilisées ; si leur nombre est impair, celle qui
+    a le moins d'étiquettes reste seule.
+    """
+    ordre = sorted(verticales, key=photos.nombre_etiquettes, reverse=True)
+    if len(ordre) % 2:
+        ordre.pop()
+    n = len(ordre)
+    prises = bytearray(n)
+    paires = []
+
+    suivante = 0
+    for _ in range(n // 2):
+        while prises[suivante]:
+            suivante += 1
+        p = ordre[suivante]
+        prises[suivante] = 1
+
+        meilleure = -1
+        meilleur_chevauchement = None
+        examinees = 0
+        k = suivante + 1
+        while k < n and examinees < fenetre:
+            if not prises[k]:
+                chevauchement = _chevauchement(photos, p, ordre[k])
+                if meilleur_chevauchement is None or chevauchement < meilleur_chevauchement:
+                    meilleure = k
+                    meilleur_chevauchement = chevauchement
+                    if chevauchement == 0:
+                        break
+                examinees += 1
+            k += 1
+
+        prises[meilleure] = 1
+        paires.append((p, ordre[meilleure]))
+
+    return paires
+
+
+def raffiner_paires_mip(photos, paires, taille_bloc, env=None):
+    """
+    Réoptimiser exactement les paires par blocs de taille_bloc paires :
+    couplage parfait des 2 * taille_bloc photos maximisant le nombre total
+    d'étiquettes des diapositives obtenues.
+    """
+    resultat = []
+    for debut in range(0, len(paires), taille_bloc):
+        bloc = [photo for paire in paires[debut:debut + taille_bloc] for photo in paire]
+        n = len(bloc)
+        union = {
+            (i, j): photos.nombre_etiquettes(bloc[i]) + photos.nombre_etiquettes(bloc[j])
+            - _chevauchement(photos, bloc[i], bloc[j])
+            for i in range(n) for j in range(i + 1, n)
+        }
+
+        with gp.Model("AppariementBloc", env=env) as modele:
+            modele.setParam("OutputFlag", 0)
+            X = modele.addVars(union.keys(), obj=union, vtype=GRB.BINARY, name="X")
+            modele.ModelSense = GRB.MAXIMIZE
+
+            # Chaque photo du bloc appartient à exactement une paire
+            modele.addConstrs((X.sum(i, "*") + X.sum("*", i) == 1 for i in range(n)), name="Couplage")
+
+            # Départ : les paires heuristiques du bloc
+            for k in range(0, n, 2):
+                X[k, k + 1].Start = 1
+
+            modele.optimize()
+            if modele.SolCount == 0:
+                resultat.extend(paires[debut:debut + taille_bloc])
+                continue
+            resultat.extend((bloc[i], bloc[j]) for (i, j), variable in X.items() if variable.X > 0.5)
+
+    return resultat
+
+
+def apparier_verticales(photos, verticales, fenetre=FENETRE, taille_bloc_mip=TAILLE_BLOC_MIP, env=None):
+    """
+    Appariement des verticales : heuristique gloutonne, puis raffinement MIP
+    optionnel sur de petits blocs.
+    """
+    paires = apparier_glouton(photos, verticales, fenetre)
+    if taille_bloc_mip > 0:
+        paires = raffiner_paires_mip(photos, paires, taille_bloc_mip, env)
+    return paires
+
+
+def charger_diapositives(fichier_entree, fenetre=FENETRE, taille_bloc_mip=TAILLE_BLOC_MIP):
+    """
+    Charger les photos puis construire le MagasinDiapositives : horizontales
+    d'abord, puis les paires de verticales.
+    """
+    photos, horizontales, verticales = charger_magasin(fichier_entree)
+    paires = apparier_verticales(photos, verticales, fenetre, taille_bloc_mip)
+    return construire_diapositives(photos, horizontales, paires)
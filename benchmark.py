@@ -0,0 +1,165 @@
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import projet
+import slideshow
+import slideshow2
+import verify
+from generateur import generer_instance
+from lecture import lire_entete
+from matrice_interet import CACHE
+from reglages import Reglages
+
+# Programmes mesurés (leur fonction executer, partagée avec leur fonction principal)
+PROGRAMMES = {"projet": projet, "slideshow": slideshow, "slideshow2": slideshow2}
+
+
+class Chronometre:
+    """
+    Durée et pic mémoire (tracemalloc, s'il est actif) de chaque phase.
+    """
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextlib.contextmanager
+    def phase(self, nom):
+        trace = tracemalloc.is_tracing()
+        if trace:
+            tracemalloc.reset_peak()
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            mesure = {"duree_s": time.perf_counter() - debut}
+            if trace:
+                mesure["pic_memoire_octets"] = tracemalloc.get_traced_memory()[1]
+            self.phases[nom] = mesure
+
+
+def phases_programme(module, fichier_entree, fichier_sortie, chrono, budget_recherche_locale=None):
+    """
+    Exécuter un programme phase par phase (module.executer, le même
+    enchaînement que sa fonction principal) avec ses réglages par défaut.
+    Le fichier de sortie est d'abord supprimé : chaque passe part de zéro,
+    sans reprise d'une solution précédente.
+    """
+    reglages = Reglages()
+    if budget_recherche_locale is not None:
+        reglages.budget_recherche_locale = budget_recherche_locale
+    if os.path.exists(fichier_sortie):
+        os.remove(fichier_sortie)
+    module.executer(fichier_entree, fichier_sortie, reglages, chrono)
+
+
+def phases_verification(fichier_entree, fichier_solution, chrono):
+    """
+    Rejouer verify.principal phase par phase ; retourne le score (None si invalide).
+    """
+    with chrono.phase("lecture_entree"):
+        photos = verify.lire_fichier_entree(fichier_entree)
+    with chrono.phase("lecture_solution"):
+        diapositives = verify.lire_fichier_solution(fichier_solution)
+    with chrono.phase("validation"):
+        erreurs = verify.valider_diaporama(photos, diapositives, lire_entete(fichier_solution))
+    if erreurs:
+        return None
+    with chrono.phase("score"):
+        return verify.calculer_score_diaporama(photos, diapositives)
+
+
+def mesurer(executer, memoire=True):
+    """
+    Exécuter deux fois : une passe chronométrée sans tracemalloc (qui ralentit
+    fortement le code Python), puis une passe sous tracemalloc pour les pics.
+    Le cache des matrices d'intérêt est vidé avant chaque passe.
+    """
+    CACHE.vider()
+    chrono = Chronometre()
+    resultat = executer(chrono)
+
+    if memoire:
+        CACHE.vider()
+        chrono_memoire = Chronometre()
+        tracemalloc.start()
+        try:
+            executer(chrono_memoire)
+        finally:
+            tracemalloc.stop()
+        for nom, mesure in chrono_memoire.phases.items():
+            chrono.phases[nom]["pic_memoire_octets"] = mesure["pic_memoire_octets"]
+
+    return chrono.phases, resultat
+
+
+def executer_benchmark(fichiers_entree, programmes=None, budget_recherche_locale=None, memoire=True):
+    """
+    Mesurer chaque programme sur chaque instance, puis vérifier et noter la
+    solution produite. Retourne un dictionnaire prêt pour json.dump.
+    """
+    programmes = programmes or list(PROGRAMMES)
+    resultats = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "plateforme": platform.platform(), "processeurs": os.cpu_count()},
+        "instances": [],
+    }
+
+    with tempfile.TemporaryDirectory() as dossier:
+        for fichier_entree in fichiers_entree:
+            instance = {"fichier": fichier_entree, "nombre_photos": lire_entete(fichier_entree), "programmes": {}}
+            for nom in programmes:
+                fichier_sortie = os.path.join(dossier, f"{nom}.sol")
+                # Les programmes affichent beaucoup : leur sortie est écartée
+                with open(os.devnull, "w") as nul, contextlib.redirect_stdout(nul):
+                    phases, _ = mesurer(
+                        lambda chrono: phases_programme(PROGRAMMES[nom], fichier_entree, fichier_sortie, chrono, budget_recherche_locale),
+                        memoire,
+                    )
+                    phases_verify, score = mesurer(lambda chrono: phases_verification(fichier_entree, fichier_sortie, chrono), memoire)
+                instance["programmes"][nom] = {
+                    "phases": phases,
+                    "duree_totale_s": sum(mesure["duree_s"] for mesure in phases.values()),
+                    "verification": phases_verify,
+                    "score": score,
+                }
+                duree_verification = sum(mesure["duree_s"] for mesure in phases_verify.values())
+                # Phase absente si la solution est invalide
+                duree_score = phases_verify.get("score", {}).get("duree_s", 0.0)
+                print(
+                    f"{fichier_entree} / {nom} : {instance['programmes'][nom]['duree_totale_s']:.2f} s, score {score}"
+                    f" (vérification {duree_verification:.2f} s dont score {duree_score:.2f} s)"
+                )
+            resultats["instances"].append(instance)
+
+    return resultats
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Utilisation: python benchmark.py <fichier_resultats.json> <fichier_entree | nombre_photos>...")
+        print("  Un nombre génère une instance synthétique de cette taille (graine 0).")
+        sys.exit(1)
+
+    fichier_resultats = sys.argv[1]
+    with tempfile.TemporaryDirectory() as dossier_instances:
+        fichiers_entree = []
+        for argument in sys.argv[2:]:
+            if argument.isdigit():
+                fichier = os.path.join(dossier_instances, f"instance-{argument}.txt")
+                generer_instance(fichier, int(argument))
+                fichiers_entree.append(fichier)
+            else:
+                fichiers_entree.append(argument)
+
+        resultats = executer_benchmark(fichiers_entree)
+
+    with open(fichier_resultats, "w") as fichier:
+        json.dump(resultats, fichier, indent=2)
+    print(f"Résultats écrits dans le fichier : {fichier_resultats}")
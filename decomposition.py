@@ -0,0 +1,115 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import gurobipy as gp
+
+from appariement import charger_diapositives
+from glouton import ordonner_glouton
+from modele_creux import LIMITE_LICENCE, TOP_K, optimiser_diaporama_creux
+from stockage import MagasinPhotos, construire_diapositives, ordre_vers_sequence, sequence_vers_ordre
+
+# Nombre maximal de diapositives par grappe : n diapositives et leurs TOP_K arêtes coûtent au plus
+# 2n(TOP_K + 1) variables, ce qui doit tenir dans la licence (200 sans limite de licence)
+TAILLE_GRAPPE = LIMITE_LICENCE // (2 * (TOP_K + 1)) if LIMITE_LICENCE is not None else 200
+# Temps de résolution accordé à chaque grappe (secondes)
+LIMITE_TEMPS_GRAPPE = 10.0
+
+# Environnement Gurobi propre à chaque processus de travail
+_env = None
+
+
+def _initialiser_travailleur(threads):
+    global _env
+    _env = gp.Env(params={"OutputFlag": 0, "Threads": threads})
+
+
+def partitionner(diapositives, taille_grappe=TAILLE_GRAPPE):
+    """
+    Découper les diapositives en grappes de taille bornée : tranches
+    consécutives de l'ordre glouton, dont les diapositives voisines partagent
+    déjà des étiquettes.
+    """
+    sequence = ordre_vers_sequence(ordonner_glouton(diapositives)) or list(range(len(diapositives)))
+    return [sequence[k:k + taille_grappe] for k in range(0, len(sequence), taille_grappe)]
+
+
+def _resoudre_grappe(etiquettes_grappe, top_k, limite_temps):
+    """
+    Ordonner une grappe dans un processus de travail. Les diapositives de la
+    grappe sont reconstruites comme des photos horizontales ; en cas d'échec
+    du modèle (licence, temps), l'ordre reçu est conservé. Retourne
+    (séquence locale, grappe résolue ou non).
+    """
+    photos = MagasinPhotos()
+    for etiquettes in etiquettes_grappe:
+        photos.ajouter("H", etiquettes)
+    grappe = construire_diapositives(photos, range(len(photos)), [])
+
+    try:
+        ordre = optimiser_diaporama_creux(grappe, top_k, limite_temps=limite_temps, env=_env)
+    except gp.GurobiError:
+        ordre = []
+    sequence = ordre_vers_sequence(ordre)
+    if not sequence:
+        return list(range(len(grappe))), len(grappe) < 2
+    return sequence, True
+
+
+def recoller(diapositives, chemins):
+    """
+    Relier les chemins des grappes : à partir du premier, on ajoute à chaque
+    pas le chemin restant (éventuellement inversé) dont l'extrémité offre le
+    meilleur intérêt avec la fin du chemin courant.
+    """
+    restants = list(range(1, len(chemins)))
+    sequence = list(chemins[0]) if chemins else []
+
+    while restants:
+        fin = sequence[-1]
+        meilleur = None
+        for position, k in enumerate(restants):
+            chemin = chemins[k]
+            for inverse, extremite in ((False, chemin[0]), (True, chemin[-1])):
+                score = diapositives.interet(fin, extremite)
+                if meilleur is None or score > meilleur[0]:
+                    meilleur = (score, position, inverse)
+
+        _, position, inverse = meilleur
+        chemin = chemins[restants.pop(position)]
+        sequence.extend(reversed(chemin) if inverse else chemin)
+
+    return sequence
+
+
+def optimiser_diaporama_decompose(
+    diapositives, taille_grappe=TAILLE_GRAPPE, top_k=TOP_K, limite_temps=LIMITE_TEMPS_GRAPPE, processus=None
+):
+    """
+    Partitionner les diapositives, résoudre chaque grappe en parallèle (un
+    gp.Env par processus, threads répartis entre les cœurs), puis recoller
+    les chemins. Retourne l'ordre sous forme de transitions (i, j) et le
+    nombre de grappes non résolues, restées dans l'ordre glouton.
+    """
+    grappes = partitionner(diapositives, taille_grappe)
+    processus = processus or os.cpu_count() or 1
+    threads = max(1, (os.cpu_count() or 1) // processus)
+
+    taches = [[diapositives.etiquettes_de(i) for i in grappe] for grappe in grappes]
+    with ProcessPoolExecutor(processus, initializer=_initialiser_travailleur, initargs=(threads,)) as executeur:
+        resultats = list(
+            executeur.map(_resoudre_grappe, taches, [top_k] * len(taches), [limite_temps] * len(taches))
+        )
+
+    chemins = [[grappe[k] for k in locale] for grappe, (locale, _) in zip(grappes, resultats)]
+    echecs = sum(not resolue for _, resolue in resultats)
+    return sequence_vers_ordre(recoller(diapositives, chemins)), echecs
+
+
+def construire_diaporama_decompose(fichier_entree, taille_grappe=TAILLE_GRAPPE, processus=None):
+    """
+    Chaîne complète en mode décomposition : lecture, appariement des
+    verticales puis résolution par grappes. Retourne (diapositives, ordre,
+    nombre de grappes non résolues).
+    """
+    diapositives = charger_diapositives(fichier_entree)
+    return (diapositives, *optimiser_diaporama_decompose(diapositives, taille_grappe, processus=processus))
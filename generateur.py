@@ -0,0 +1,57 @@
+import sys
+
+import numpy as np
+
+
+def generer_instance(
+    fichier_sortie,
+    nombre_photos,
+    ratio_horizontal=0.5,
+    nombre_etiquettes=None,
+    etiquettes_par_photo=(1, 30),
+    asymetrie=1.0,
+    graine=0,
+):
+    """
+    Écrire une instance au format lu par lire_fichier_entree.
+
+    Les étiquettes suivent une loi de Zipf d'exposant asymetrie sur un
+    vocabulaire de nombre_etiquettes étiquettes (0 : tirage uniforme) ;
+    chaque photo en porte entre etiquettes_par_photo[0] et
+    etiquettes_par_photo[1] (doublons retirés). La graine fixe l'instance.
+    """
+    rng = np.random.default_rng(seed=graine)
+    if nombre_etiquettes is None:
+        nombre_etiquettes = max(100, 2 * nombre_photos)
+
+    rangs = np.arange(1, nombre_etiquettes + 1, dtype=np.float64)
+    probabilites = rangs ** -asymetrie
+    probabilites /= probabilites.sum()
+
+    minimum, maximum = etiquettes_par_photo
+    tailles = rng.integers(minimum, maximum + 1, size=nombre_photos)
+    horizontales = rng.random(nombre_photos) < ratio_horizontal
+    tirages = rng.choice(nombre_etiquettes, size=int(tailles.sum()), p=probabilites)
+    bornes = np.concatenate(([0], np.cumsum(tailles)))
+
+    with open(fichier_sortie, "w") as fichier:
+        fichier.write(f"{nombre_photos}\n")
+        for i in range(nombre_photos):
+            etiquettes = np.unique(tirages[bornes[i]:bornes[i + 1]])
+            orientation = "H" if horizontales[i] else "V"
+            fichier.write(f"{orientation} {len(etiquettes)} " + " ".join(f"t{e}" for e in etiquettes) + "\n")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Utilisation: python generateur.py <fichier_sortie> <nombre_photos> [ratio_horizontal] [asymetrie] [graine]")
+        sys.exit(1)
+
+    generer_instance(
+        sys.argv[1],
+        int(sys.argv[2]),
+        ratio_horizontal=float(sys.argv[3]) if len(sys.argv) > 3 else 0.5,
+        asymetrie=float(sys.argv[4]) if len(sys.argv) > 4 else 1.0,
+        graine=int(sys.argv[5]) if len(sys.argv) > 5 else 0,
+    )
+    print(f"Instance générée dans le fichier : {sys.argv[1]}")
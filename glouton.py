@@ -0,0 +1,112 @@
+from array import array
+
+from appariement import charger_diapositives
+from stockage import construire_index_inverse, sequence_vers_ordre
+
+# Nombre maximal d'entrées de l'index inverse examinées pour choisir la diapositive suivante
+MAX_CANDIDATS = 100
+
+
+def ordonner_glouton(diapositives, max_candidats=MAX_CANDIDATS, depart=0):
+    """
+    Enchaîner les diapositives en choisissant à chaque pas la meilleure suivante
+    parmi les candidates trouvées par l'index inverse.
+
+    Les candidates sont les diapositives rencontrées en parcourant les listes
+    de l'index (au plus max_candidats entrées par pas). Si le parcours est
+    interrompu par ce budget, leurs étiquettes communes sont recomptées en
+    entier : un compte partiel fausserait min(c, |A| - c, |B| - c). Les
+    candidates qui ne peuvent plus battre la meilleure ne sont pas
+    recomptées, et la notation s'arrête dès que le maximum théorique
+    len(A) // 2 est atteint. Retourne l'ordre sous forme de
+    transitions (i, j) pour ecrire_fichier_sortie.
+    """
+    n = len(diapositives)
+    if n == 0:
+        return []
+
+    index = construire_index_inverse(diapositives)
+    longueurs = diapositives.longueurs
+    debuts = diapositives.debuts
+    etiquettes = diapositives.etiquettes
+    utilisees = bytearray(n)
+    communes = {}
+
+    courant = depart
+    utilisees[courant] = 1
+    sequence = array("l", [courant])
+    prochaine_libre = 0
+
+    for _ in range(n - 1):
+        taille = longueurs[courant]
+        plafond = taille // 2
+        meilleure = -1
+        meilleur_score = -1
+        budget = max_candidats
+        communes.clear()
+
+        debut = debuts[courant]
+        fin = debut + taille
+        for k in range(debut, fin):
+            liste = index[etiquettes[k]]
+            position = len(liste) - 1
+            while position >= 0 and budget > 0:
+                j = liste[position]
+                if utilisees[j]:
+                    # Retrait paresseux : la diapositive ne sera plus jamais candidate
+                    liste[position] = liste[-1]
+                    liste.pop()
+                    position -= 1
+                    continue
+                position -= 1
+                budget -= 1
+                communes[j] = communes.get(j, 0) + 1
+            if budget == 0:
+                break
+
+        if budget > 0:
+            for j, c in communes.items():
+                score = min(c, taille - c, longueurs[j] - c)
+                if score > meilleur_score:
+                    meilleur_score = score
+                    meilleure = j
+                    if meilleur_score >= plafond:
+                        break
+        else:
+            # Budget épuisé : les étiquettes k..fin-1 n'ont pas été parcourues
+            # en entier, les comptes sont incomplets et on les refait, en
+            # commençant par les plus prometteurs
+            restantes = fin - k
+            ensemble = set(etiquettes[debut:fin])
+            for j, c in sorted(communes.items(), key=lambda item: item[1], reverse=True):
+                longueur = longueurs[j]
+                if min(c + restantes, plafond, longueur // 2) <= meilleur_score:
+                    continue
+                c = len(ensemble.intersection(etiquettes[debuts[j] : debuts[j] + longueur]))
+                score = min(c, taille - c, longueur - c)
+                if score > meilleur_score:
+                    meilleur_score = score
+                    meilleure = j
+                    if meilleur_score >= plafond:
+                        break
+
+        if meilleure < 0:
+            # Aucune étiquette partagée : on passe à la prochaine diapositive libre
+            while utilisees[prochaine_libre]:
+                prochaine_libre += 1
+            meilleure = prochaine_libre
+
+        utilisees[meilleure] = 1
+        sequence.append(meilleure)
+        courant = meilleure
+
+    return sequence_vers_ordre(sequence)
+
+
+def construire_diaporama_glouton(fichier_entree, max_candidats=MAX_CANDIDATS):
+    """
+    Chaîne complète pour les grandes instances : lecture dans le magasin,
+    appariement des verticales puis ordonnancement glouton.
+    """
+    diapositives = charger_diapositives(fichier_entree)
+    return diapositives, ordonner_glouton(diapositives, max_candidats)
@@ -1,52 +1,320 @@
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
 import numpy as np
 import gurobipy as gp
 from gurobipy import GRB
+
+from termination_policies import optimize
+from trajectory import attach_recorder
  
  
-def generate_knapsack(num_items):
+# Largest dynamic-programming table (items x capacity cells) before falling back to a MIP
+DP_MAX_CELLS = 50_000_000
+# Largest power of ten tried to turn the weights into integers for the dynamic programme
+MAX_WEIGHT_SCALE = 1000
+ 
+ 
+def generate_knapsack(num_items, seed=0, dimensions=None, decimals=None):
     # Fix seed value
-    rng = np.random.default_rng(seed=0)
-    # Item values, weights
+    rng = np.random.default_rng(seed=seed)
+    # Item values, weights (one row of weights per capacity constraint when dimensions is given)
     values = rng.uniform(low=1, high=25, size=num_items)
-    weights = rng.uniform(low=5, high=100, size=num_items)
+    weights = rng.uniform(low=5, high=100, size=num_items if dimensions is None else (dimensions, num_items))
+    # Weights rounded to a number of decimals can be scaled to integers
+    if decimals is not None:
+        weights = np.round(weights, decimals)
     # Knapsack capacity
-    capacity = 0.7 * weights.sum()
+    capacity = 0.7 * weights.sum(axis=-1)
  
     return values, weights, capacity
  
  
-def solve_knapsack_model(values, weights, capacity):
-    num_items = len(values)
+def build_knapsack_model(env, values, weights, capacity):
+    """
+    Build the knapsack model straight from the arrays. weights is a vector
+    (single capacity) or a (dimensions, num_items) matrix with one capacity
+    per row. Returns the model and the MVar x.
+    """
+    model = gp.Model(name="knapsack", env=env)
+    x = model.addMVar(len(values), vtype=GRB.BINARY, obj=values, name="x")
+    model.ModelSense = GRB.MAXIMIZE
+    model.addConstr(np.atleast_2d(weights) @ x <= np.atleast_1d(capacity), name="capacity")
+    return model, x
  
-    # Turn values and weights numpy arrays to dict
+ 
+def _build_knapsack_model_dicts(env, values, weights, capacity):
+    """Former dict / tupledict.prod() construction, kept for the benchmark."""
+    num_items = len(values)
     values_dict = {i: values[i] for i in range(num_items)}
     weights_dict = {i: weights[i] for i in range(num_items)}
+    model = gp.Model(name="knapsack", env=env)
+    x = model.addVars(num_items, vtype=GRB.BINARY, name="x")
+    model.setObjective(x.prod(values_dict), GRB.MAXIMIZE)
+    model.addConstr(x.prod(weights_dict) <= capacity, "capacity")
+    return model, x
  
-    with gp.Env() as env:
-        with gp.Model(name="knapsack", env=env) as model:
-            # Define decision variables using the Model.addVars() method
-            x = model.addVars(num_items, vtype=GRB.BINARY, name="x")
  
-            # Define objective function using the Model.setObjective() method
-            # Build the LinExpr using the tupledict.prod() method
-            model.setObjective(x.prod(values_dict), GRB.MAXIMIZE)
- 
-            # Define capacity constraint using the Model.addConstr() method
-            model.addConstr(x.prod(weights_dict) <= capacity, "capacity")
- 
-            # Optimize the model
-            model.optimize()
+def solve_knapsack_model(values, weights, capacity, policy=None, recorder=None, env=None):
+    start = time.perf_counter()
+    with gp.Env() if env is None else nullcontext(env) as env:
+        model, x = build_knapsack_model(env, values, weights, capacity)
+        with model:
+            # Optimize the model, stopping early if the termination policy asks to
+            if recorder is None:
+                optimize(model, policy)
+            else:
+                recorder.build_time = time.perf_counter() - start
+                optimize(model, policy, attach_recorder(model, recorder))
+                recorder.finish(model)
  
             # Retrieve and print the solution
-            if model.status == GRB.OPTIMAL:
-                print("Optimal objective value:", model.objVal)
-                selected_items = [i for i in range(num_items) if x[i].x > 0.5]
-                print("Selected items:", selected_items)
-                print("Total weight:", sum(weights[i] for i in selected_items))
+            if model.SolCount > 0:
+                label = "Optimal" if model.status == GRB.OPTIMAL else "Best"
+                print(f"{label} objective value:", model.objVal)
+                selected_items = np.flatnonzero(x.X > 0.5)
+                print("Selected items:", selected_items.tolist())
+                print("Total weight:", weights[..., selected_items].sum(axis=-1))
             else:
                 print("No optimal solution found.")
  
  
-data = generate_knapsack(10)
-solve_knapsack_model(*data)
- 
\ No newline at end of file
+def _solve_instance(env, instance, time_limit=None, mip_gap=None):
+    """Solve one (values, weights, capacity) instance; returns (objective, status, runtime, selected mask)."""
+    model, x = build_knapsack_model(env, *instance)
+    with model:
+        if time_limit is not None:
+            model.Params.TimeLimit = time_limit
+        if mip_gap is not None:
+            model.Params.MIPGap = mip_gap
+        model.optimize()
+        if model.SolCount == 0:
+            return np.nan, model.Status, model.Runtime, np.zeros(len(instance[0]), dtype=bool)
+        return model.ObjVal, model.Status, model.Runtime, x.X > 0.5
+ 
+ 
+# Per-process Gurobi environment and time limit, set by _init_worker
+_env = None
+_time_limit = None
+ 
+ 
+def _init_worker(time_limit):
+    global _env, _time_limit
+    _env = gp.Env(params={"OutputFlag": 0, "Threads": 1})
+    _time_limit = time_limit
+ 
+ 
+def _solve_in_worker(instance):
+    return _solve_instance(_env, instance, _time_limit)
+ 
+ 
+def solve_knapsack_batch(instances, env=None, processes=None, time_limit=None, chunksize=16):
+    """
+    Solve many (values, weights, capacity) instances, reusing one Gurobi
+    environment (one per worker, single-threaded, when processes > 1).
+    Returns arrays of objective values (NaN without a solution), statuses
+    and solver runtimes, and the list of selected-item boolean masks.
+    """
+    if processes is not None and processes > 1:
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(time_limit,)) as executor:
+            results = list(executor.map(_solve_in_worker, instances, chunksize=chunksize))
+    else:
+        with gp.Env(params={"OutputFlag": 0}) if env is None else nullcontext(env) as env:
+            results = [_solve_instance(env, instance, time_limit) for instance in instances]
+ 
+    objectives = np.fromiter((result[0] for result in results), dtype=float, count=len(results))
+    statuses = np.fromiter((result[1] for result in results), dtype=int, count=len(results))
+    runtimes = np.fromiter((result[2] for result in results), dtype=float, count=len(results))
+    return objectives, statuses, runtimes, [result[3] for result in results]
+ 
+ 
+def integer_scale(weights, max_scale=MAX_WEIGHT_SCALE):
+    """Smallest power of ten turning every weight into an integer, or None."""
+    scale = 1
+    while scale <= max_scale:
+        scaled = weights * scale
+        if np.all(np.abs(scaled - np.round(scaled)) <= 1e-9 * scale):
+            return scale
+        scale *= 10
+    return None
+ 
+ 
+def solve_knapsack_dp(values, weights, capacity):
+    """
+    Exact 0-1 knapsack by dynamic programming over integer weights and
+    capacity, one vectorised pass over the capacities per item. Returns the
+    objective and the selected-item mask.
+    """
+    capacity = int(capacity)
+    best = np.zeros(capacity + 1)
+    take = np.zeros((len(values), capacity + 1), dtype=bool)
+    for i, (value, weight) in enumerate(zip(values, weights)):
+        if weight > capacity:
+            continue
+        candidate = best[:capacity + 1 - weight] + value
+        improved = candidate > best[weight:]
+        take[i, weight:] = improved
+        best[weight:] = np.where(improved, candidate, best[weight:])
+ 
+    # Walk back through the decisions from the full capacity
+    selected = np.zeros(len(values), dtype=bool)
+    remaining = capacity
+    for i in range(len(values) - 1, -1, -1):
+        if take[i, remaining]:
+            selected[i] = True
+            remaining -= weights[i]
+    return values[selected].sum(), selected
+ 
+ 
+def dantzig_bound(values, weights, capacity):
+    """
+    Greedy fractional (Dantzig) bound of a single-constraint knapsack.
+    Returns the bound, the greedy solution mask (items in decreasing
+    value/weight order until the critical item, then any later item that
+    still fits) and the critical value/weight ratio.
+    """
+    ratios = values / weights
+    order = np.argsort(-ratios, kind="stable")
+    cumulative = np.cumsum(weights[order])
+    critical = np.searchsorted(cumulative, capacity, side="right")
+    greedy = np.zeros(len(values), dtype=bool)
+    greedy[order[:critical]] = True
+    if critical == len(values):
+        return values.sum(), greedy, 0.0
+ 
+    residual = capacity - (cumulative[critical - 1] if critical > 0 else 0.0)
+    ratio = ratios[order[critical]]
+    bound = values[greedy].sum() + residual * ratio
+    for item in order[critical + 1:][weights[order[critical + 1:]] <= residual]:
+        if weights[item] <= residual:
+            greedy[item] = True
+            residual -= weights[item]
+    return bound, greedy, ratio
+ 
+ 
+def reduce_knapsack(values, weights, capacity):
+    """
+    Core-problem reduction: with the Dantzig bound U, the greedy value L and
+    the critical ratio r, an item whose reduced value |v - r w| exceeds U - L
+    cannot leave its LP value in any optimal solution and is fixed.
+    Returns (greedy mask, fixed-in mask, core mask).
+    """
+    bound, greedy, ratio = dantzig_bound(values, weights, capacity)
+    lower = values[greedy].sum()
+    reduced = values - ratio * weights
+    fixed = bound - np.abs(reduced) < lower - 1e-9 * max(1.0, abs(lower))
+    return greedy, fixed & (reduced > 0), ~fixed
+ 
+ 
+def solve_knapsack(values, weights, capacity, env=None):
+    """
+    Solve a knapsack with the cheapest exact method: reduction to the core
+    problem, then dynamic programming when the core weights scale to
+    integers and the table stays under DP_MAX_CELLS, a MIP on the core
+    otherwise. Multi-dimensional knapsacks go to the full MIP. Returns the
+    objective, the selected-item mask and the method used.
+    """
+    if np.ndim(weights) > 1:
+        method, (core_values, core_weights, core_capacity) = "mip", (values, weights, capacity)
+        selected, core = np.zeros(len(values), dtype=bool), np.ones(len(values), dtype=bool)
+    else:
+        greedy, selected, core = reduce_knapsack(values, weights, capacity)
+        if not core.any():
+            return values[greedy].sum(), greedy, "reduction"
+        core_values, core_weights = values[core], weights[core]
+        core_capacity = capacity - weights[selected].sum()
+        scale = integer_scale(core_weights)
+        if scale is not None and len(core_values) * (core_capacity * scale + 1) <= DP_MAX_CELLS:
+            integer_weights = np.round(core_weights * scale).astype(np.int64)
+            _, core_selected = solve_knapsack_dp(core_values, integer_weights, np.floor(core_capacity * scale + 1e-9))
+            selected[core] = core_selected
+            return values[selected].sum(), selected, "dp"
+        method = "core mip" if not core.all() else "mip"
+ 
+    with gp.Env(params={"OutputFlag": 0}) if env is None else nullcontext(env) as env:
+        _, _, _, core_selected = _solve_instance(env, (core_values, core_weights, core_capacity), mip_gap=0.0)
+    selected[core] = core_selected
+    return values[selected].sum(), selected, method
+ 
+ 
+def verify_engine(sizes=(10, 100, 1_000), num_instances=20, decimals=(None, 0, 1)):
+    """
+    Compare solve_knapsack with Gurobi (MIPGap 0, shared environment) on
+    generated instances, and report the methods used and mean latencies.
+    """
+    with gp.Env(params={"OutputFlag": 0}) as env:
+        # Warm up both paths so that the first timing does not include one-off costs
+        solve_knapsack(*generate_knapsack(10), env=env)
+        _solve_instance(env, generate_knapsack(10))
+        for num_items in sizes:
+            for digits in decimals:
+                instances = [generate_knapsack(num_items, seed, decimals=digits) for seed in range(num_instances)]
+                engine_time = gurobi_time = 0.0
+                methods = set()
+                worst = 0.0
+                for instance in instances:
+                    start = time.perf_counter()
+                    objective, selected, method = solve_knapsack(*instance, env=env)
+                    engine_time += time.perf_counter() - start
+                    start = time.perf_counter()
+                    reference = _solve_instance(env, instance, mip_gap=0.0)[0]
+                    gurobi_time += time.perf_counter() - start
+                    assert instance[1][selected].sum() <= instance[2] + 1e-6
+                    worst = max(worst, abs(objective - reference) / reference)
+                    methods.add(method)
+                print(
+                    f"  {num_items:>5} items, decimals {str(digits):<4}: engine {engine_time / num_instances * 1000:7.2f} ms, "
+                    f"Gurobi {gurobi_time / num_instances * 1000:7.2f} ms, worst relative difference {worst:.1e}, "
+                    f"methods {sorted(methods)}"
+                )
+ 
+ 
+def benchmark_batch(num_items, num_instances, processes=None):
+    """
+    Compare the dict and array builders on one instance of num_items items,
+    then time solve_knapsack_batch on num_instances generated instances.
+    """
+    instance = generate_knapsack(num_items)
+    repetitions = max(1, 10_000 // num_items)
+    start = time.perf_counter()
+    with gp.Env(params={"OutputFlag": 0}) as env:
+        print(f"  environment start    : {time.perf_counter() - start:.4f} s")
+        for label, builder in (("dicts + prod", _build_knapsack_model_dicts), ("addMVar", build_knapsack_model)):
+            # Warm up the builder on a tiny instance, then keep the best of the repetitions
+            builder(env, *generate_knapsack(10))[0].dispose()
+            best = float("inf")
+            for _ in range(repetitions):
+                start = time.perf_counter()
+                model, _ = builder(env, *instance)
+                model.update()
+                best = min(best, time.perf_counter() - start)
+                model.dispose()
+            print(f"  build ({label:<12}): {best:.4f} s")
+ 
+    instances = [generate_knapsack(num_items, seed=seed) for seed in range(num_instances)]
+    start = time.perf_counter()
+    try:
+        objectives, statuses, _, _ = solve_knapsack_batch(instances, processes=processes)
+    except gp.GurobiError as error:
+        print(f"  batch solve not run: {error}")
+        return
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {num_instances} instances in {elapsed:.2f} s ({num_instances / elapsed:.1f} instances/s), "
+        f"{np.count_nonzero(statuses == GRB.OPTIMAL)} optimal, mean objective {np.nanmean(objectives):.2f}"
+    )
+ 
+ 
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        processes = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        for num_items, num_instances in ((1_000, 1_000), (1_000_000, 3)):
+            print(f"{num_items} items:")
+            benchmark_batch(num_items, num_instances, processes)
+    elif len(sys.argv) > 1 and sys.argv[1] == "engine":
+        verify_engine()
+    else:
+        data = generate_knapsack(10)
+        solve_knapsack_model(*data)
@@ -0,0 +1,108 @@
+import mmap
+import sys
+import time
+import tracemalloc
+from array import array
+
+from stockage import MagasinPhotos
+
+
+def lire_entete(fichier_entree):
+    """
+    Lire uniquement le nombre de photos annoncé en première ligne.
+    """
+    with open(fichier_entree, "rb") as fichier:
+        return int(fichier.readline())
+
+
+def lire_photos(fichier_entree):
+    """
+    Parcourir les photos une à une depuis le fichier projeté en mémoire.
+
+    Produit des triplets (id, orientation, etiquettes) où l'orientation et les
+    étiquettes sont des octets ; seule la ligne courante est découpée.
+    """
+    with open(fichier_entree, "rb") as fichier:
+        with mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ) as tampon:
+            N = int(tampon.readline())  # Nombre de photos
+            for ident in range(N):
+                donnees = tampon.readline().split()
+                yield ident, donnees[0], donnees[2:]
+
+
+def lire_photos_bloc(fichier_entree):
+    """
+    Même sortie que lire_photos, mais tout le tampon est découpé en jetons en
+    une seule passe : plus rapide, au prix de la liste complète des jetons.
+    """
+    with open(fichier_entree, "rb") as fichier:
+        with mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ) as tampon:
+            jetons = tampon[:].split()
+
+    N = int(jetons[0])
+    position = 1
+    for ident in range(N):
+        nombre = int(jetons[position + 1])
+        yield ident, jetons[position], jetons[position + 2:position + 2 + nombre]
+        position += 2 + nombre
+
+
+def charger_magasin(fichier_entree, mode="flux"):
+    """
+    Charger les photos dans un MagasinPhotos en séparant au passage les
+    identifiants horizontaux et verticaux.
+
+    mode vaut "flux" (ligne par ligne) ou "bloc" (découpage en une passe).
+    """
+    source = lire_photos_bloc if mode == "bloc" else lire_photos
+    photos = MagasinPhotos()
+    horizontales = array("l")
+    verticales = array("l")
+
+    for ident, orientation, etiquettes in source(fichier_entree):
+        photos.ajouter(orientation, etiquettes)
+        if orientation == b"H":
+            horizontales.append(ident)
+        elif orientation == b"V":
+            verticales.append(ident)
+
+    return photos, horizontales, verticales
+
+
+def mesurer_lecture(fichier_entree, mode="flux"):
+    """
+    Mesurer le temps de lecture puis, dans un second chargement, le pic
+    mémoire (tracemalloc ralentit trop la lecture pour chronométrer les deux).
+    """
+    debut = time.perf_counter()
+    photos, horizontales, verticales = charger_magasin(fichier_entree, mode)
+    duree = time.perf_counter() - debut
+    del photos, horizontales, verticales
+
+    tracemalloc.start()
+    photos, horizontales, verticales = charger_magasin(fichier_entree, mode)
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mode": mode,
+        "photos": len(photos),
+        "horizontales": len(horizontales),
+        "verticales": len(verticales),
+        "etiquettes_distinctes": len(photos.dictionnaire),
+        "duree_s": duree,
+        "pic_memoire_octets": pic,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Utilisation: python lecture.py <fichier_entree>")
+        sys.exit(1)
+
+    for mode in ("flux", "bloc"):
+        mesure = mesurer_lecture(sys.argv[1], mode)
+        print(
+            f"{mode:5s} : {mesure['photos']} photos, {mesure['etiquettes_distinctes']} étiquettes, "
+            f"{mesure['duree_s']:.3f} s, pic mémoire {mesure['pic_memoire_octets'] / 2**20:.1f} Mo"
+        )
@@ -0,0 +1,164 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+
+from stockage import DictionnaireEtiquettes
+
+# Jusqu'à ce nombre de diapositives, la matrice d'intérêt est rendue dense
+SEUIL_DENSE = 2000
+# Taille totale (octets) des matrices gardées en cache
+CAPACITE_CACHE = 64 * 2**20
+
+
+def taille_octets(matrice):
+    """
+    Mémoire occupée par une matrice d'intérêt dense (ndarray) ou creuse (CSR).
+    """
+    if sp.issparse(matrice):
+        return matrice.data.nbytes + matrice.indices.nbytes + matrice.indptr.nbytes
+    return matrice.nbytes
+
+
+class CacheInteret:
+    """
+    Cache LRU des matrices d'intérêt, indexé par l'ensemble (ordonné) des
+    diapositives et de leurs étiquettes et borné par la mémoire occupée :
+    les plus anciennes matrices sont écartées au-delà de capacite octets, et
+    une matrice plus grande que capacite n'est pas gardée.
+    """
+
+    def __init__(self, capacite=CAPACITE_CACHE):
+        self.capacite = capacite
+        self.matrices = OrderedDict()
+        self.octets = 0
+        self.succes = 0
+        self.echecs = 0
+
+    def obtenir(self, cle, calculer):
+        matrice = self.matrices.get(cle)
+        if matrice is not None:
+            self.matrices.move_to_end(cle)
+            self.succes += 1
+            return matrice
+
+        self.echecs += 1
+        matrice = calculer()
+        taille = taille_octets(matrice)
+        if taille > self.capacite:
+            return matrice
+        self.matrices[cle] = matrice
+        self.octets += taille
+        while self.octets > self.capacite:
+            _, ancienne = self.matrices.popitem(last=False)
+            self.octets -= taille_octets(ancienne)
+        return matrice
+
+    def vider(self):
+        self.matrices.clear()
+        self.octets = 0
+
+
+# Cache partagé par les constructeurs de modèles et les calculs de score. Le glouton, la
+# recherche locale et verify n'évaluent que O(n) paires et calculent l'intérêt à la demande
+CACHE = CacheInteret()
+
+
+def interet_depuis_incidence(incidence, dense=None):
+    """
+    Calculer toutes les valeurs d'intérêt d'un bloc de diapositives à partir
+    de sa matrice d'incidence diapositive x étiquette (0/1).
+
+    incidence @ incidence.T donne le nombre d'étiquettes communes ; l'intérêt
+    vaut min(communes, |A| - communes, |B| - communes). La diagonale est nulle.
+    """
+    incidence = sp.csr_matrix(incidence, dtype=np.int32)
+    n = incidence.shape[0]
+    longueurs = np.asarray(incidence.sum(axis=1), dtype=np.int32).ravel()
+
+    communes = (incidence @ incidence.T).tocoo()
+    lignes, colonnes, c = communes.row, communes.col, communes.data
+    valeurs = np.minimum(c, np.minimum(longueurs[lignes] - c, longueurs[colonnes] - c))
+    valeurs[lignes == colonnes] = 0
+
+    interets = sp.csr_matrix((valeurs, (lignes, colonnes)), shape=(n, n))
+    interets.eliminate_zeros()
+
+    if dense is None:
+        dense = n <= SEUIL_DENSE
+    return interets.toarray() if dense else interets
+
+
+def incidence_magasin(diapositives, indices=None):
+    """
+    Matrice d'incidence (CSR) des diapositives d'un MagasinDiapositives,
+    éventuellement restreinte aux indices donnés.
+    """
+    if indices is None:
+        indices = np.arange(len(diapositives))
+    indices = np.asarray(indices, dtype=np.int64)
+    debuts = np.asarray(diapositives.debuts)
+    longueurs = np.asarray(diapositives.longueurs)
+    etiquettes = np.asarray(diapositives.etiquettes)
+
+    longueurs_bloc = longueurs[indices]
+    indptr = np.zeros(len(indices) + 1, dtype=np.int64)
+    np.cumsum(longueurs_bloc, out=indptr[1:])
+    # Position de chaque étiquette du bloc dans le tableau partagé
+    positions = np.repeat(debuts[indices] - indptr[:-1], longueurs_bloc) + np.arange(indptr[-1])
+    colonnes = etiquettes[positions]
+    donnees = np.ones(len(colonnes), dtype=np.int32)
+
+    return sp.csr_matrix(
+        (donnees, colonnes, indptr), shape=(len(indices), len(diapositives.photos.dictionnaire))
+    )
+
+
+def incidence_ensembles(ensembles_etiquettes):
+    """
+    Matrice d'incidence (CSR) d'une liste d'ensembles d'étiquettes quelconques.
+    """
+    dictionnaire = DictionnaireEtiquettes()
+    indptr = [0]
+    colonnes = []
+    for etiquettes in ensembles_etiquettes:
+        colonnes.extend(dictionnaire.encoder(etiquettes))
+        indptr.append(len(colonnes))
+    donnees = np.ones(len(colonnes), dtype=np.int32)
+    return sp.csr_matrix((donnees, colonnes, indptr), shape=(len(indptr) - 1, max(len(dictionnaire), 1)))
+
+
+def _cle(incidence):
+    """
+    Clé de cache : empreinte du contenu de la matrice d'incidence, donc de
+    l'ensemble ordonné des diapositives et de leurs étiquettes.
+    """
+    empreinte = hashlib.sha1(np.asarray(incidence.shape, dtype=np.int64).tobytes())
+    empreinte.update(np.ascontiguousarray(incidence.indptr, dtype=np.int64).tobytes())
+    empreinte.update(np.ascontiguousarray(incidence.indices, dtype=np.int64).tobytes())
+    return empreinte.hexdigest()
+
+
+def interet_incidence(incidence, dense=None, cache=CACHE):
+    """
+    Matrice d'intérêt d'une matrice d'incidence, calculée une seule fois par
+    contenu grâce au cache.
+    """
+    cle = (_cle(incidence), dense)
+    return cache.obtenir(cle, lambda: interet_depuis_incidence(incidence, dense))
+
+
+def interet_diapositives(diapositives, indices=None, dense=None, cache=CACHE):
+    """
+    Matrice d'intérêt (en cache) des diapositives d'un MagasinDiapositives.
+    """
+    return interet_incidence(incidence_magasin(diapositives, indices), dense, cache)
+
+
+def interet_dicts(elements, dense=None, cache=CACHE):
+    """
+    Matrice d'intérêt (en cache) d'une liste de diapositives ou de photos au
+    format dictionnaire du code existant (clé "etiquettes").
+    """
+    return interet_incidence(incidence_ensembles(e["etiquettes"] for e in elements), dense, cache)
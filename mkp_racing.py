@@ -0,0 +1,171 @@
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import gurobipy as gp
+from gurobipy import GRB
+
+from model_cache import read_cached
+
+MODEL_PATH = "data/mkp.mps.bz2"
+
+# Parameter settings raced against each other (default first)
+CONFIGS = [
+    {},
+    {"Seed": 1},
+    {"Seed": 2},
+    {"MIPFocus": 1},
+    {"MIPFocus": 2},
+    {"MIPFocus": 3},
+    {"Heuristics": 0.5},
+    {"Cuts": 2},
+]
+
+# Per-process Gurobi environment and shared race state, set by _init_worker
+_env = None
+_shared = None
+
+
+class RaceData:
+    """
+    State shared by all racing workers: the best objective found so far
+    (multiprocessing.Value), the stop event, the optimisation sense and the
+    target relative gap.
+    """
+
+    def __init__(self, best, stop, sense, target_gap):
+        self.best = best
+        self.stop = stop
+        self.sense = sense
+        self.target_gap = target_gap
+        self.proved = False
+
+
+def _init_worker(threads, best, stop, sense, target_gap):
+    global _env, _shared
+    _env = gp.Env(params={"OutputFlag": 0, "Threads": threads})
+    _shared = RaceData(best, stop, sense, target_gap)
+
+
+def race_callback(model, where, *, cbdata):
+    if where != GRB.Callback.MIP:
+        return
+    if cbdata.stop.is_set():
+        model.terminate()
+        return
+    if model.cbGet(GRB.Callback.MIP_SOLCNT) == 0:
+        return
+
+    # Publish this worker's incumbent if it beats the shared one
+    incumbent = model.cbGet(GRB.Callback.MIP_OBJBST)
+    with cbdata.best.get_lock():
+        if cbdata.sense * (incumbent - cbdata.best.value) < 0:
+            cbdata.best.value = incumbent
+        best = cbdata.best.value
+
+    # This worker's bound is valid for the problem: once the shared incumbent
+    # is within the target gap of it, the race is won
+    bound = model.cbGet(GRB.Callback.MIP_OBJBND)
+    if cbdata.sense * (best - bound) <= cbdata.target_gap * abs(best):
+        cbdata.proved = True
+        cbdata.stop.set()
+        model.terminate()
+
+
+def _solve_config(path, params, deadline):
+    """
+    Solve one configuration in a worker until the race deadline (time.time()).
+    A configuration started after others have found solutions uses the
+    shared best objective as Cutoff.
+    """
+    start = time.perf_counter()
+    with read_cached(path, env=_env) as model:
+        for name, value in params.items():
+            model.setParam(name, value)
+        model.Params.MIPGap = _shared.target_gap
+        model.Params.TimeLimit = max(0.0, deadline - time.time())
+        best = _shared.best.value
+        if not math.isinf(best):
+            model.Params.Cutoff = best
+
+        _shared.proved = False
+        if not _shared.stop.is_set() and model.Params.TimeLimit > 0:
+            model.optimize(partial(race_callback, cbdata=_shared))
+        if model.SolCount > 0:
+            with _shared.best.get_lock():
+                if _shared.sense * (model.ObjVal - _shared.best.value) < 0:
+                    _shared.best.value = model.ObjVal
+        if model.Status == GRB.OPTIMAL:
+            _shared.proved = True
+            _shared.stop.set()
+
+        return {
+            "params": params,
+            "status": model.Status,
+            "skipped": model.Status == GRB.LOADED,
+            "objective": model.ObjVal if model.SolCount > 0 else None,
+            "bound": model.ObjBound if model.SolCount > 0 else None,
+            "runtime": time.perf_counter() - start,
+            "proved": _shared.proved,
+        }
+
+
+def race(path=MODEL_PATH, configs=CONFIGS, processes=None, target_gap=1e-4, time_limit=60.0):
+    """
+    Race configs in a process pool (one gp.Env per worker, threads split
+    across cores) for at most time_limit seconds overall. Returns (results per config, wall time, best objective).
+    """
+    # Reading here also fills the model cache before the workers start
+    with read_cached(path) as model:
+        sense = model.ModelSense
+
+    processes = processes or min(len(configs), os.cpu_count() or 1)
+    threads = max(1, (os.cpu_count() or 1) // processes)
+    context = multiprocessing.get_context()
+    best = context.Value("d", sense * math.inf)
+    stop = context.Event()
+
+    start = time.perf_counter()
+    deadline = time.time() + time_limit
+    with ProcessPoolExecutor(
+        processes, mp_context=context, initializer=_init_worker, initargs=(threads, best, stop, sense, target_gap)
+    ) as executor:
+        results = list(executor.map(_solve_config, [path] * len(configs), configs, [deadline] * len(configs)))
+    wall_time = time.perf_counter() - start
+
+    return results, wall_time, best.value
+
+
+def solve_default(path=MODEL_PATH, target_gap=1e-4, time_limit=60.0):
+    """Single default run with every core, for comparison with the race."""
+    start = time.perf_counter()
+    with gp.Env(params={"OutputFlag": 0}) as env, read_cached(path, env=env) as model:
+        model.Params.MIPGap = target_gap
+        model.Params.TimeLimit = time_limit
+        model.optimize()
+        return time.perf_counter() - start, model.ObjVal, model.Status == GRB.OPTIMAL
+
+
+if __name__ == "__main__":
+    target_gap = float(sys.argv[1]) if len(sys.argv) > 1 else 1e-3
+    time_limit = float(sys.argv[2]) if len(sys.argv) > 2 else 60.0
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    default_time, default_obj, default_proved = solve_default(MODEL_PATH, target_gap, time_limit)
+    print(f"Default run: {default_time:.2f} s, objective {default_obj}, target reached: {default_proved}")
+
+    results, wall_time, best = race(MODEL_PATH, CONFIGS, processes, target_gap, time_limit)
+    for result in results:
+        if result["skipped"]:
+            print(f"  {str(result['params']):<22} skipped (race over)")
+            continue
+        print(
+            f"  {str(result['params']):<22} status {result['status']:>2}  objective {result['objective']}  "
+            f"{result['runtime']:.2f} s{'  (proved)' if result['proved'] else ''}"
+        )
+    print(f"Race: {wall_time:.2f} s, best objective {best}, target reached: {any(r['proved'] for r in results)}")
+    print(f"Speed-up over the default run: x{default_time / wall_time:.2f}")
@@ -0,0 +1,211 @@
+import heapq
+import time
+from functools import partial
+from operator import itemgetter
+
+import numpy as np
+import gurobipy as gp
+from gurobipy import GRB
+
+from appariement import charger_diapositives
+from matrice_interet import interet_diapositives
+from sauvegarde import DonneesSauvegarde, callback_sauvegarde, enchainer_callbacks
+from sous_tours import DonneesSousTours, callback_sous_tours, trouver_cycles
+from stockage import sequence_vers_ordre
+from termination_policies import attach
+from trajectory import attach_recorder
+
+# Nombre maximal d'arêtes conservées par diapositive (None : toutes les arêtes utiles)
+TOP_K = 10
+# Taille maximale du modèle (variables comme contraintes) permise par la licence Gurobi (None : illimitée)
+LIMITE_LICENCE = 2000
+
+
+def budget_aretes(n, limite_licence=LIMITE_LICENCE):
+    """
+    Nombre maximal d'arêtes du modèle creux à n diapositives qui tient dans
+    limite_licence : chaque arête coûte deux variables X et une contrainte
+    AntiCycle, en plus des 2n variables Debut/Fin et des 2n + 1 contraintes
+    de degré. Retourne None sans limite.
+    """
+    if limite_licence is None:
+        return None
+    return max(0, min((limite_licence - 2 * n) // 2, limite_licence - 2 * n - 1))
+
+
+def aretes_candidates(diapositives, top_k=TOP_K, max_aretes=None):
+    """
+    Énumérer les paires de diapositives d'intérêt strictement positif à partir
+    de la matrice d'intérêt creuse (en cache).
+
+    Retourne un dictionnaire {(i, j): interet} avec i < j. Avec top_k, seules
+    les top_k meilleures voisines de chaque diapositive sont gardées ; avec
+    max_aretes, seules les max_aretes arêtes de plus fort intérêt.
+    """
+    interets = interet_diapositives(diapositives, dense=False)
+    aretes = {}
+
+    for i in range(len(diapositives)):
+        debut, fin = interets.indptr[i], interets.indptr[i + 1]
+        voisines = interets.indices[debut:fin]
+        valeurs = interets.data[debut:fin]
+        if top_k is not None and len(valeurs) > top_k:
+            meilleures = np.argpartition(-valeurs, top_k - 1)[:top_k]
+            voisines = voisines[meilleures]
+            valeurs = valeurs[meilleures]
+
+        for j, interet in zip(voisines.tolist(), valeurs.tolist()):
+            aretes[min(i, j), max(i, j)] = interet
+
+    if max_aretes is not None and len(aretes) > max_aretes:
+        aretes = dict(heapq.nlargest(max_aretes, aretes.items(), key=itemgetter(1)))
+    return aretes
+
+
+def _decoder_chemins(n, successeurs, debuts_chemin, poids):
+    """
+    Reconstituer la séquence à partir des successeurs choisis : les chemins
+    partant du nœud de début, puis, par sécurité, les éventuels cycles coupés
+    à leur arête la plus faible.
+    """
+    sequence = []
+    visites = bytearray(n)
+    for i in debuts_chemin:
+        while i is not None and not visites[i]:
+            visites[i] = 1
+            sequence.append(i)
+            i = successeurs.get(i)
+
+    for i in range(n):
+        if visites[i]:
+            continue
+        cycle = []
+        while not visites[i]:
+            visites[i] = 1
+            cycle.append(i)
+            i = successeurs[i]
+        coupure = min(range(len(cycle)), key=lambda k: poids[cycle[k], cycle[(k + 1) % len(cycle)]])
+        sequence.extend(cycle[coupure + 1:] + cycle[:coupure + 1])
+
+    return sequence
+
+
+def optimiser_diaporama_creux(
+    diapositives, top_k=TOP_K, limite_temps=None, env=None, fichier_sauvegarde=None, politique_arret=None,
+    trajectoire=None, limite_licence=LIMITE_LICENCE, verbeux=False,
+):
+    """
+    Ordonner les diapositives avec un modèle Gurobi construit uniquement sur
+    les arêtes d'intérêt positif.
+
+    Deux nœuds fictifs (début et fin) ouvrent le chemin ; plusieurs chemins
+    peuvent être choisis, ils sont ensuite mis bout à bout (transition
+    d'intérêt nul, donc sans perte sur l'objectif). Les cycles de longueur 2
+    sont interdits d'emblée, les plus longs sont coupés à la demande par
+    callback_sous_tours. Retourne l'ordre sous forme de transitions (i, j).
+
+    Si fichier_sauvegarde est donné, chaque nouvelle meilleure solution y est
+    écrite pendant la résolution (mode à tout moment) ; politique_arret
+    (termination_policies) arrête la résolution quand elle ne progresse plus ;
+    trajectoire (TrajectoryRecorder) enregistre la progression de la résolution.
+    Avec verbeux, la taille du modèle et l'absence de solution sont affichées
+    (muet par défaut : la décomposition résout un modèle par grappe).
+
+    Les arêtes sont plafonnées par budget_aretes pour tenir dans limite_licence ;
+    au-delà d'environ limite_licence / 2 diapositives, aucun modèle ne tient et
+    Gurobi lève GurobiError, à l'appelant de se replier sur le glouton.
+    """
+    n = len(diapositives)
+    if n < 2:
+        return []
+
+    debut_construction = time.perf_counter()
+    aretes = aretes_candidates(diapositives, top_k, budget_aretes(n, limite_licence))
+    poids = {}
+    for (i, j), interet in aretes.items():
+        poids[i, j] = interet
+        poids[j, i] = interet
+
+    modele = gp.Model("DiaporamaCreux", env=env)
+    if limite_temps is not None:
+        modele.setParam("TimeLimit", limite_temps)
+
+    # X[i, j] : la diapositive i est suivie de la diapositive j (arêtes utiles seulement)
+    X = modele.addVars(poids.keys(), obj=poids, vtype=GRB.BINARY, name="X")
+    # Arcs depuis le nœud fictif de début et vers le nœud fictif de fin
+    Debut = modele.addVars(n, vtype=GRB.BINARY, name="Debut")
+    Fin = modele.addVars(n, vtype=GRB.BINARY, name="Fin")
+    modele.ModelSense = GRB.MAXIMIZE
+
+    # ** Chaque diapositive a un unique successeur et un unique prédécesseur (réels ou fictifs)**
+    modele.addConstrs((X.sum(i, "*") + Fin[i] == 1 for i in range(n)), name="Successeur")
+    modele.addConstrs((X.sum("*", i) + Debut[i] == 1 for i in range(n)), name="Predecesseur")
+    modele.addConstr(Debut.sum() >= 1, name="AuMoinsUnChemin")
+
+    # ** Empêcher les cycles de longueur 2**
+    modele.addConstrs((X[i, j] + X[j, i] <= 1 for i, j in aretes), name="AntiCycle")
+
+    modele.update()
+    duree_construction = time.perf_counter() - debut_construction
+    if verbeux:
+        print(
+            f"Modèle creux : {n} diapositives, {len(poids)} arcs, {modele.NumConstrs} contraintes, "
+            f"construit en {duree_construction:.3f} s"
+        )
+
+    # ** Sous-tours plus longs : contraintes paresseuses**
+    modele.setParam("LazyConstraints", 1)
+    donnees_sous_tours = DonneesSousTours(X)
+    callbacks = [partial(callback_sous_tours, cbdata=donnees_sous_tours)]
+
+    # ** Mode à tout moment : les solutions sans sous-tour sont écrites au fil de la résolution**
+    if fichier_sauvegarde is not None:
+        cles = list(X.keys())
+
+        def decoder(valeurs):
+            successeurs = {i: j for (i, j), valeur in zip(cles, valeurs) if valeur > 0.5}
+            if trouver_cycles(successeurs):
+                return None
+            debuts_chemin = np.flatnonzero(valeurs[len(cles):] > 0.5).tolist()
+            return [diapositives.ids(k) for k in _decoder_chemins(n, successeurs, debuts_chemin, poids)]
+
+        donnees_sauvegarde = DonneesSauvegarde(
+            modele, fichier_sauvegarde, list(X.values()) + list(Debut.values()), decoder
+        )
+        callbacks.append(partial(callback_sauvegarde, cbdata=donnees_sauvegarde))
+    if politique_arret is not None:
+        callbacks.append(attach(modele, politique_arret))
+    if trajectoire is not None:
+        trajectoire.build_time = duree_construction
+        callbacks.append(attach_recorder(modele, trajectoire))
+
+    modele.optimize(enchainer_callbacks(*callbacks))
+    if fichier_sauvegarde is not None:
+        donnees_sauvegarde.ecrire_en_attente()
+    if trajectoire is not None:
+        trajectoire.finish(modele)
+
+    if modele.SolCount == 0:
+        if verbeux:
+            print("\n Aucune solution trouvée.")
+        return []
+
+    successeurs = {i: j for (i, j), var in X.items() if var.X > 0.5}
+    debuts_chemin = [i for i in range(n) if Debut[i].X > 0.5]
+    sequence = _decoder_chemins(n, successeurs, debuts_chemin, poids)
+    return sequence_vers_ordre(sequence)
+
+
+def construire_diaporama_creux(
+    fichier_entree, top_k=TOP_K, limite_temps=None, fichier_sauvegarde=None, politique_arret=None, trajectoire=None,
+    verbeux=False,
+):
+    """
+    Chaîne complète pour les instances moyennes : lecture dans le magasin,
+    appariement des verticales puis modèle creux.
+    """
+    diapositives = charger_diapositives(fichier_entree)
+    return diapositives, optimiser_diaporama_creux(
+        diapositives, top_k, limite_temps=limite_temps, fichier_sauvegarde=fichier_sauvegarde,
+        politique_arret=politique_arret, trajectoire=trajectoire, verbeux=verbeux,
+    )
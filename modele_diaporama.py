@@ -0,0 +1,439 @@
+import sys
+import time
+import tracemalloc
+from functools import partial
+
+import gurobipy as gp
+import numpy as np
+import scipy.sparse as sp
+from gurobipy import GRB
+
+from matrice_interet import interet_depuis_incidence, interet_dicts
+from sauvegarde import DonneesSauvegarde, callback_sauvegarde, enchainer_callbacks
+from sous_tours import DonneesSousTours, callback_sous_tours, chemin_depuis_fictif
+from stockage import sequence_vers_ordre
+from termination_policies import attach
+from trajectory import attach_recorder
+
+
+def construire_modele_diaporama(interets, env=None):
+    """
+    Modèle de tournée des diapositives construit avec l'API matricielle.
+
+    Les n diapositives et le nœud fictif n forment n + 1 nœuds ; Z porte un
+    arc par couple (i, j), i != j, avec pour coût l'intérêt de la transition
+    (0 pour les arcs du nœud fictif). Les contraintes de degré sont deux
+    matrices d'incidence creuses nœud x arc.
+
+    Retourne (modele, Z, (origines, destinations)), tableaux donnant les
+    extrémités de l'arc de chaque composante de Z.
+    """
+    n = len(interets)
+    origines, destinations = np.nonzero(~np.eye(n + 1, dtype=bool))
+    nombre_arcs = len(origines)
+
+    poids = np.zeros(nombre_arcs)
+    reels = (origines < n) & (destinations < n)
+    poids[reels] = np.asarray(interets[origines[reels], destinations[reels]]).ravel()
+
+    modele = gp.Model("Diaporama", env=env)
+    Z = modele.addMVar(nombre_arcs, vtype=GRB.BINARY, obj=poids, name="Z")
+    modele.ModelSense = GRB.MAXIMIZE
+
+    # ** Contrainte : Chaque diapositive a un unique successeur et un unique prédécesseur**
+    colonnes = np.arange(nombre_arcs)
+    uns = np.ones(nombre_arcs)
+    sortants = sp.csr_matrix((uns, (origines, colonnes)), shape=(n + 1, nombre_arcs))
+    entrants = sp.csr_matrix((uns, (destinations, colonnes)), shape=(n + 1, nombre_arcs))
+    modele.addMConstr(sortants, Z, "=", np.ones(n + 1), name="Successeur")
+    modele.addMConstr(entrants, Z, "=", np.ones(n + 1), name="Predecesseur")
+
+    return modele, Z, (origines, destinations)
+
+
+def construire_modele_couplage(interets, env=None):
+    """
+    Modèle d'appariement des photos verticales construit avec l'API
+    matricielle : X porte une composante par paire (i, j), i < j ; chaque
+    photo appartient à au plus une paire et n // 2 paires sont formées.
+
+    Retourne (modele, X, (premiers, seconds)), tableaux donnant les deux
+    photos de la paire de chaque composante de X.
+    """
+    n = len(interets)
+    premiers, seconds = np.triu_indices(n, k=1)
+    nombre_paires = len(premiers)
+
+    modele = gp.Model("CombinaisonVerticale", env=env)
+    X = modele.addMVar(
+        nombre_paires, vtype=GRB.BINARY, obj=np.asarray(interets[premiers, seconds]).ravel(), name="X"
+    )
+    modele.ModelSense = GRB.MAXIMIZE
+
+    # ** Contraintes : Chaque photo verticale appartient à une seule paire (couplage, pas affectation)**
+    colonnes = np.arange(nombre_paires)
+    incidence = sp.csr_matrix(
+        (np.ones(2 * nombre_paires), (np.concatenate([premiers, seconds]), np.concatenate([colonnes, colonnes]))),
+        shape=(n, nombre_paires),
+    )
+    modele.addMConstr(incidence, X, "<", np.ones(n), name="Couplage")
+    # Toutes les photos sont utilisées (une seule reste seule si n est impair)
+    modele.addMConstr(sp.csr_matrix(np.ones((1, nombre_paires))), X, "=", np.array([n // 2]), name="NombrePaires")
+
+    return modele, X, (premiers, seconds)
+
+
+def ordre_glouton_interets(interets):
+    """
+    Ordre glouton des diapositives (plus proche voisin sur la matrice
+    d'intérêt dense), utilisé comme solution de départ du modèle de tournée.
+    """
+    n = len(interets)
+    visitees = np.zeros(n, dtype=bool)
+    i = 0
+    sequence = [i]
+    visitees[i] = True
+    for _ in range(n - 1):
+        i = int(np.argmax(np.where(visitees, -1, interets[i])))
+        sequence.append(i)
+        visitees[i] = True
+    return sequence
+
+
+def couplage_glouton_interets(interets):
+    """
+    Couplage glouton des photos verticales par intérêt décroissant, utilisé
+    comme solution de départ du modèle d'appariement.
+    """
+    n = len(interets)
+    premiers, seconds = np.triu_indices(n, k=1)
+    libres = np.ones(n, dtype=bool)
+    paires = []
+    for k in np.argsort(-interets[premiers, seconds], kind="stable"):
+        i, j = premiers[k], seconds[k]
+        if libres[i] and libres[j]:
+            paires.append((int(i), int(j)))
+            libres[i] = libres[j] = False
+            if len(paires) == n // 2:
+                break
+    return paires
+
+
+def fixer_depart_tournee(Z, n, sequence):
+    """
+    Charger une séquence de diapositives comme départ (attribut Start) du
+    modèle de tournée : fictif -> sequence -> fictif. Les diapositives
+    absentes de la séquence sont ajoutées à la fin.
+    """
+    vues = set(sequence)
+    noeuds = np.array([n] + list(sequence) + [i for i in range(n) if i not in vues] + [n])
+    origines, destinations = noeuds[:-1], noeuds[1:]
+    depart = np.zeros(Z.shape[0])
+    # Position de l'arc (i, j) : les arcs sont rangés par origine, sans la diagonale
+    depart[origines * n + destinations - (destinations > origines)] = 1
+    Z.Start = depart
+
+
+def fixer_depart_couplage(X, n, paires):
+    """
+    Charger des paires de photos comme départ (attribut Start) du modèle
+    d'appariement. Les photos restées libres sont appariées dans l'ordre
+    pour que le départ forme n // 2 paires.
+    """
+    libres = np.ones(n, dtype=bool)
+    completes = []
+    for i, j in paires:
+        if i != j and libres[i] and libres[j]:
+            completes.append((min(i, j), max(i, j)))
+            libres[i] = libres[j] = False
+    restantes = np.flatnonzero(libres)
+    completes.extend(zip(restantes[0::2].tolist(), restantes[1::2].tolist()))
+
+    completes = np.array(completes, dtype=np.int64).reshape(-1, 2)
+    premiers, seconds = completes[:, 0], completes[:, 1]
+    depart = np.zeros(X.shape[0])
+    # Position de la paire (i, j), i < j, dans l'ordre de np.triu_indices
+    depart[premiers * n - premiers * (premiers + 1) // 2 + seconds - premiers - 1] = 1
+    X.Start = depart
+
+
+def sequence_depuis_valeurs(arcs, valeurs, n):
+    """
+    Séquence des diapositives lue sur les valeurs de Z (tournée depuis le
+    nœud fictif n) ; None si la solution contient des sous-tours.
+    """
+    choisis = np.flatnonzero(np.asarray(valeurs) > 0.5)
+    successeurs = dict(zip(arcs[0][choisis].tolist(), arcs[1][choisis].tolist()))
+    sequence = chemin_depuis_fictif(successeurs, n)
+    return sequence if len(sequence) == n else None
+
+
+def diaporama_depuis_valeurs(diapositives, arcs, valeurs):
+    """
+    Identifiants de photos de chaque diapositive, dans l'ordre de la tournée
+    lue sur les valeurs de Z (None si la tournée est incomplète).
+    """
+    sequence = sequence_depuis_valeurs(arcs, valeurs, len(diapositives))
+    if sequence is None:
+        return None
+    return [diapositives[k]["ids"] for k in sequence]
+
+
+def sequence_depuis_solution(diapositives, lignes):
+    """
+    Retrouver dans diapositives (format dictionnaire) la séquence d'un
+    fichier de solution déjà lu (listes d'identifiants de photos).
+    """
+    positions = {tuple(sorted(diapositive["ids"])): k for k, diapositive in enumerate(diapositives)}
+    return [positions[cle] for cle in (tuple(sorted(ids)) for ids in lignes) if cle in positions]
+
+
+def paires_depuis_solution(photos_verticales, lignes):
+    """
+    Retrouver les paires de photos verticales (positions dans
+    photos_verticales) d'un fichier de solution déjà lu.
+    """
+    positions = {photo["id"]: k for k, photo in enumerate(photos_verticales)}
+    return [
+        (positions[ids[0]], positions[ids[1]])
+        for ids in lignes if len(ids) == 2 and ids[0] in positions and ids[1] in positions
+    ]
+
+
+def optimiser_diaporama(
+    diapositives,
+    depart=None,
+    limite_temps=None,
+    fichier_sauvegarde=None,
+    politique_arret=None,
+    trajectoire=None,
+    verbeux=False,
+):
+    """
+    Optimisation du diaporama avec Gurobi en maximisant l'intérêt total.
+
+    diapositives est au format dictionnaire ("ids", "etiquettes") ; retourne
+    l'ordre sous forme de transitions (i, j), vide sans solution. Avec
+    verbeux, l'issue de la résolution est affichée.
+    """
+    n_diapositives = len(diapositives)
+    if n_diapositives < 2:
+        return []
+
+    # Le nœud fictif relie la dernière diapositive à la première : le chemin devient une tournée
+    fictif = n_diapositives
+
+    # Variables binaires : Z[k] indique si l'arc (origines[k], destinations[k]) est emprunté (intérêt en coût)
+    debut_construction = time.perf_counter()
+    interets = interet_dicts(diapositives)
+    modele, Z, arcs = construire_modele_diaporama(interets)
+
+    # ** Démarrage à chaud : séquence donnée (solution précédente) ou ordre glouton**
+    fixer_depart_tournee(Z, n_diapositives, depart or ordre_glouton_interets(interets))
+
+    # ** Empêcher les Cycles : sous-tours coupés à la demande par le callback**
+    modele.setParam("LazyConstraints", 1)
+    donnees_sous_tours = DonneesSousTours(arcs, noeud_autorise=fictif, variables=Z)
+    callbacks = [partial(callback_sous_tours, cbdata=donnees_sous_tours)]
+
+    # ** Mode à tout moment : chaque nouvelle meilleure solution est écrite dans le fichier de sortie**
+    if limite_temps is not None:
+        modele.setParam("TimeLimit", limite_temps)
+    if fichier_sauvegarde is not None:
+        donnees_sauvegarde = DonneesSauvegarde(
+            modele, fichier_sauvegarde, Z, lambda valeurs: diaporama_depuis_valeurs(diapositives, arcs, valeurs)
+        )
+        callbacks.append(partial(callback_sauvegarde, cbdata=donnees_sauvegarde))
+    if politique_arret is not None:
+        callbacks.append(attach(modele, politique_arret))
+    if trajectoire is not None:
+        trajectoire.build_time = time.perf_counter() - debut_construction
+        callbacks.append(attach_recorder(modele, trajectoire))
+
+    # ** Résolution du modèle**
+    modele.optimize(enchainer_callbacks(*callbacks))
+    if fichier_sauvegarde is not None:
+        donnees_sauvegarde.ecrire_en_attente()
+    if trajectoire is not None:
+        trajectoire.finish(modele)
+
+    ordre = []
+    if modele.SolCount > 0:
+        if verbeux and modele.Status == GRB.OPTIMAL:
+            print("\n Solution optimale trouvée !")
+            print(f" Objectif optimal : {modele.ObjVal}")
+        elif verbeux:
+            print(f"\n Résolution interrompue : meilleure solution {modele.ObjVal} (borne {modele.ObjBound})")
+
+        # Construire la séquence ordonnée en suivant la tournée depuis le nœud fictif
+        ordre = sequence_vers_ordre(sequence_depuis_valeurs(arcs, Z.X, fictif))
+    elif verbeux:
+        print("\n Aucune solution trouvée.")
+    return ordre
+
+
+def construire_modele_diaporama_quicksum(interets, env=None):
+    """
+    Ancienne construction du modèle de tournée (boucles quicksum), gardée
+    pour la comparaison des temps de construction.
+    """
+    n_diapositives = len(interets)
+    noeuds = range(n_diapositives + 1)
+    modele = gp.Model("Diaporama", env=env)
+    Z = modele.addVars([(i, j) for i in noeuds for j in noeuds if i != j], vtype=GRB.BINARY, name="Z")
+    for i in noeuds:
+        modele.addConstr(gp.quicksum(Z[i, j] for j in noeuds if i != j) == 1)
+        modele.addConstr(gp.quicksum(Z[j, i] for j in noeuds if i != j) == 1)
+    modele.setObjective(
+        gp.quicksum(
+            interets[i, j] * Z[i, j]
+            for i in range(n_diapositives) for j in range(n_diapositives) if i != j
+        ),
+        GRB.MAXIMIZE
+    )
+    return modele, Z
+
+
+def construire_modele_couplage_quicksum(interets, env=None):
+    """
+    Ancienne construction du modèle d'appariement (boucles quicksum), gardée
+    pour la comparaison des temps de construction.
+    """
+    n = len(interets)
+    modele = gp.Model("CombinaisonVerticale", env=env)
+    X = modele.addVars([(i, j) for i in range(n) for j in range(i + 1, n)], vtype=GRB.BINARY, name="X")
+    for i in range(n):
+        modele.addConstr(gp.quicksum(X[min(i, j), max(i, j)] for j in range(n) if i != j) <= 1)
+    modele.addConstr(X.sum() == n // 2)
+    modele.setObjective(gp.quicksum(interets[i, j] * X[i, j] for i, j in X.keys()), GRB.MAXIMIZE)
+    return modele, X
+
+
+def mesurer_construction(constructeur, interets, env):
+    """
+    Temps de construction (update compris) puis, sur une seconde
+    construction sous tracemalloc, nombre de blocs Python encore alloués.
+    """
+    debut = time.perf_counter()
+    resultat = constructeur(interets, env)
+    resultat[0].update()
+    duree = time.perf_counter() - debut
+    resultat[0].dispose()
+    del resultat
+
+    tracemalloc.start()
+    resultat = constructeur(interets, env)
+    resultat[0].update()
+    blocs = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    resultat[0].dispose()
+    return duree, blocs
+
+
+def interets_aleatoires(rng, n, etiquettes_par_diapositive=10, nombre_etiquettes=200):
+    """
+    Matrice d'intérêt dense de n diapositives aux étiquettes tirées au hasard.
+    """
+    lignes = np.repeat(np.arange(n), etiquettes_par_diapositive)
+    colonnes = rng.integers(nombre_etiquettes, size=len(lignes))
+    incidence = sp.csr_matrix((np.ones(len(lignes)), (lignes, colonnes)), shape=(n, nombre_etiquettes))
+    incidence.data[:] = 1
+    return interet_depuis_incidence(incidence, dense=True)
+
+
+def comparer_constructeurs(tailles, graine=0):
+    """
+    Construire côte à côte les anciens et les nouveaux modèles sur des
+    matrices d'intérêt aléatoires de chaque taille.
+    """
+    rng = np.random.default_rng(seed=graine)
+    constructeurs = [
+        ("diaporama", construire_modele_diaporama_quicksum, construire_modele_diaporama),
+        ("couplage", construire_modele_couplage_quicksum, construire_modele_couplage),
+    ]
+    with gp.Env(params={"OutputFlag": 0}) as env:
+        for n in tailles:
+            interets = interets_aleatoires(rng, n)
+            for nom, ancien, nouveau in constructeurs:
+                duree_ancien, blocs_ancien = mesurer_construction(ancien, interets, env)
+                duree_nouveau, blocs_nouveau = mesurer_construction(nouveau, interets, env)
+                print(
+                    f"{nom:>10} n={n:>5} : quicksum {duree_ancien:.3f} s / {blocs_ancien} blocs, "
+                    f"matriciel {duree_nouveau:.3f} s / {blocs_nouveau} blocs "
+                    f"(x{duree_ancien / duree_nouveau:.1f})"
+                )
+
+
+def temps_jusqu_a_cible(modele, cible, callback=None):
+    """
+    Résoudre le modèle et retourner le temps écoulé jusqu'à la première
+    solution d'objectif au moins égal à cible (temps total sinon).
+    """
+    atteinte = []
+    debut = time.perf_counter()
+
+    def suivre(model, where):
+        if callback is not None:
+            callback(model, where)
+        if where == GRB.Callback.MIP and not atteinte and model.cbGet(GRB.Callback.MIP_OBJBST) >= cible - 0.5:
+            atteinte.append(time.perf_counter() - debut)
+
+    modele.optimize(suivre)
+    return atteinte[0] if atteinte else time.perf_counter() - debut
+
+
+def _resoudre_tournee(interets, env, depart=None, cible=None):
+    n = len(interets)
+    modele, Z, arcs = construire_modele_diaporama(interets, env)
+    if depart is not None:
+        fixer_depart_tournee(Z, n, depart)
+    modele.setParam("LazyConstraints", 1)
+    donnees = DonneesSousTours(arcs, noeud_autorise=n, variables=Z)
+    duree = temps_jusqu_a_cible(modele, modele.ModelSense * GRB.INFINITY if cible is None else cible,
+                                partial(callback_sous_tours, cbdata=donnees))
+    return duree, modele.ObjVal
+
+
+def _resoudre_couplage(interets, env, depart=None, cible=None):
+    modele, X, _ = construire_modele_couplage(interets, env)
+    if depart is not None:
+        fixer_depart_couplage(X, len(interets), depart)
+    duree = temps_jusqu_a_cible(modele, modele.ModelSense * GRB.INFINITY if cible is None else cible)
+    return duree, modele.ObjVal
+
+
+def comparer_demarrages(tailles, repetitions=3, graine=0, limite_temps=60.0):
+    """
+    Temps jusqu'au score optimal, départ à froid contre départ glouton, pour
+    les modèles de tournée et d'appariement sur des matrices aléatoires. La
+    cible est l'optimum d'une première résolution ; les temps sont cumulés
+    sur repetitions instances par taille.
+    """
+    rng = np.random.default_rng(seed=graine)
+    modeles = [
+        ("diaporama", _resoudre_tournee, ordre_glouton_interets),
+        ("couplage", _resoudre_couplage, couplage_glouton_interets),
+    ]
+    with gp.Env(params={"OutputFlag": 0, "TimeLimit": limite_temps}) as env:
+        for n in tailles:
+            durees = {nom: [0.0, 0.0] for nom, _, _ in modeles}
+            for _ in range(repetitions):
+                interets = interets_aleatoires(rng, n)
+                for nom, resoudre, heuristique in modeles:
+                    _, cible = resoudre(interets, env)
+                    durees[nom][0] += resoudre(interets, env, cible=cible)[0]
+                    durees[nom][1] += resoudre(interets, env, heuristique(interets), cible)[0]
+            for nom, (duree_froid, duree_chaud) in durees.items():
+                print(
+                    f"{nom:>10} n={n:>5} : à froid {duree_froid / repetitions:.3f} s, "
+                    f"départ glouton {duree_chaud / repetitions:.3f} s (x{duree_froid / duree_chaud:.1f})"
+                )
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "construction"
+    tailles = [int(taille) for taille in sys.argv[2:]]
+    if mode == "demarrage":
+        comparer_demarrages(tailles or [20, 30, 40])
+    else:
+        comparer_constructeurs(tailles or [50, 100, 200, 400])
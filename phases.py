@@ -0,0 +1,70 @@
+import contextlib
+
+import gurobipy as gp
+
+from appariement import apparier_verticales
+from decomposition import optimiser_diaporama_decompose
+from glouton import ordonner_glouton
+from lecture import charger_magasin
+from modele_creux import optimiser_diaporama_creux
+from recherche_locale import ameliorer_ordre
+from stockage import construire_diapositives
+
+
+class SansChrono:
+    """
+    Chronomètre neutre : les programmes exécutent leurs phases sans les
+    mesurer (benchmark.Chronometre les mesure).
+    """
+
+    def phase(self, nom):
+        return contextlib.nullcontext()
+
+
+SANS_CHRONO = SansChrono()
+
+
+def ordonner_grande_instance(diapositives, nombre_photos, reglages, fichier_sauvegarde=None, trajectoire=None):
+    """
+    Ordonner un MagasinDiapositives selon les réglages : par grappes en mode
+    décomposition, par le glouton au-delà de seuil_glouton, sinon par le
+    modèle creux (avec repli sur le glouton si le modèle ne tient pas dans
+    la licence). Retourne l'ordre sous forme de transitions (i, j).
+    """
+    if reglages.decomposition:
+        ordre, echecs = optimiser_diaporama_decompose(diapositives)
+        if echecs:
+            print(f"{echecs} grappe(s) non résolue(s), conservée(s) dans l'ordre glouton")
+        return ordre
+    if nombre_photos > reglages.seuil_glouton:
+        return ordonner_glouton(diapositives)
+
+    try:
+        return optimiser_diaporama_creux(
+            diapositives, limite_temps=reglages.limite_temps, fichier_sauvegarde=fichier_sauvegarde,
+            politique_arret=reglages.politique_arret, trajectoire=trajectoire, verbeux=True,
+        )
+    except gp.GurobiError as e:
+        # Modèle trop grand pour la licence : repli sur l'ordonnancement glouton
+        print(f"Modèle creux non résolu ({e}), repli sur l'ordonnancement glouton")
+        return ordonner_glouton(diapositives)
+
+
+def executer_grande_instance(
+    fichier_entree, nombre_photos, reglages, fichier_sauvegarde=None, trajectoire=None, chrono=SANS_CHRONO
+):
+    """
+    Phases communes aux programmes au-delà de seuil_creux : lecture dans le
+    magasin, appariement des verticales, ordonnancement puis recherche
+    locale. Retourne (diapositives, ordre).
+    """
+    with chrono.phase("lecture"):
+        photos, horizontales, verticales = charger_magasin(fichier_entree)
+    with chrono.phase("appariement"):
+        diapositives = construire_diapositives(photos, horizontales, apparier_verticales(photos, verticales))
+    with chrono.phase("ordonnancement"):
+        ordre = ordonner_grande_instance(diapositives, nombre_photos, reglages, fichier_sauvegarde, trajectoire)
+    if reglages.budget_recherche_locale > 0:
+        with chrono.phase("recherche_locale"):
+            ordre, _ = ameliorer_ordre(diapositives, ordre, reglages.budget_recherche_locale)
+    return diapositives, ordre
@@ -1,32 +1,166 @@
 import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 import gurobipy as gp
 from gurobipy import GRB
 
-with open("data/portfolio-example.json", "r") as f:
-    data = json.load(f)
+from termination_policies import GapStagnation, TimeSinceIncumbent, optimize
+from trajectory import TrajectoryRecorder, attach_recorder
+
 
-n = data["num_assets"]
-sigma = np.array(data["covariance"])
-mu = np.array(data["expected_return"])
-mu_0 = data["target_return"]
-k = data["portfolio_max_size"]
+def load_portfolio(path="data/portfolio-example.json"):
+    """Covariance matrix, expected returns, target return and maximum portfolio size."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    return np.array(data["covariance"]), np.array(data["expected_return"]), data["target_return"], data["portfolio_max_size"]
 
 
-with gp.Model("portfolio") as model:
+def build_portfolio_model(sigma, mu, k, mu_0, env=None):
+    """
+    Minimum-variance portfolio of at most k assets with expected return at
+    least mu_0. x, y and the return constraint are stored on the model
+    (model._x, model._y, model._return) so that mu_0 can be changed in place.
+    """
+    n = len(mu)
+    model = gp.Model("portfolio", env=env)
     # Name the modeling objects to retrieve them
-    # ...
-
-    model.optimize()
-
-    # Write the solution into a DataFrame
-    portfolio = [var.X for var in model.getVars() if "x" in var.VarName]
-    risk = model.ObjVal
-    expected_return = model.getRow(model.getConstrByName("return")).getValue()
-    df = pd.DataFrame(
-        data=portfolio + [risk, expected_return],
-        index=[f"asset_{i}" for i in range(n)] + ["risk", "return"],
-        columns=["Portfolio"],
-    )
-    print(df)
\ No newline at end of file
+    x = model.addMVar(n, lb=0, ub=1, name="x")
+    y = model.addMVar(n, vtype=GRB.BINARY, name="y")
+
+    # Minimise the portfolio variance
+    model.setObjective(x @ sigma @ x, GRB.MINIMIZE)
+
+    # Fully invested, expected return at least mu_0, at most k assets held
+    model.addConstr(x.sum() == 1, name="budget")
+    model._return = model.addConstr(mu @ x >= mu_0, name="return")
+    model.addConstr(x <= y, name="x_y")
+    model.addConstr(y.sum() <= k, name="cardinality")
+
+    model._x, model._y = x, y
+    return model
+
+
+def _sweep(sigma, mu, k, targets, time_limit=None, warm_start=True):
+    """
+    Solve the frontier points of targets (in the given order) on one model:
+    only the return right-hand side changes, and each solve starts from the
+    previous point's solution. Returns one row per target.
+    """
+    rows = []
+    with gp.Env(params={"OutputFlag": 0}) as env, build_portfolio_model(sigma, mu, k, targets[0], env) as model:
+        if time_limit is not None:
+            model.Params.TimeLimit = time_limit
+
+        # Minimum-variance portfolio: optimal for every target up to its own return
+        # (without a solution in the time limit, every target gets its own solve)
+        model._return.RHS = -GRB.INFINITY
+        model.optimize()
+        floor_row = None
+        if model.SolCount > 0:
+            floor = model._x.X
+            floor_row = [model.ObjVal, mu @ floor, model.Status, 0.0] + floor.tolist()
+
+        for target in targets:
+            if floor_row is not None and target <= floor_row[1]:
+                rows.append([target] + floor_row)
+                continue
+            model._return.RHS = target
+            model.optimize()
+            if model.SolCount == 0:
+                rows.append([target, np.nan, np.nan, model.Status, model.Runtime] + [np.nan] * len(mu))
+                continue
+            weights = model._x.X
+            rows.append([target, model.ObjVal, mu @ weights, model.Status, model.Runtime] + weights.tolist())
+            if warm_start:
+                model._x.Start = weights
+                model._y.Start = model._y.X
+    return rows
+
+
+def efficient_frontier(sigma, mu, k, targets, processes=None, time_limit=None, warm_start=True):
+    """
+    Minimum risk for each target return, building the cardinality-constrained
+    model once per worker. Targets below the return of the minimum-variance
+    portfolio reuse it without a solve; the others are swept from the
+    highest down, so the previous point's portfolio stays feasible as a
+    warm start. With processes > 1 contiguous ranges of targets go to
+    worker processes.
+    Returns a DataFrame indexed by target with risk, return, status,
+    runtime and the asset weights (NaN where the target is infeasible).
+    """
+    targets = np.sort(np.asarray(targets, dtype=float))[::-1]
+    if processes is not None and processes > 1:
+        chunks = [chunk for chunk in np.array_split(targets, processes) if len(chunk) > 0]
+        with ProcessPoolExecutor(len(chunks)) as executor:
+            futures = [executor.submit(_sweep, sigma, mu, k, chunk, time_limit, warm_start) for chunk in chunks]
+            rows = [row for future in futures for row in future.result()]
+    else:
+        rows = _sweep(sigma, mu, k, targets, time_limit, warm_start)
+
+    columns = ["target", "risk", "return", "status", "runtime"] + [f"asset_{i}" for i in range(len(mu))]
+    return pd.DataFrame(rows, columns=columns).set_index("target").sort_index()
+
+
+def benchmark_frontier(sigma, mu, k, num_targets=100, processes=None):
+    """Time per frontier point: one reused, warm-started model against a cold rebuild per target."""
+    targets = np.linspace(mu.min(), mu.max(), num_targets)
+    # Warm up so that one-off costs are not charged to the first method
+    efficient_frontier(sigma, mu, k, targets[:2])
+
+    start = time.perf_counter()
+    frontier = efficient_frontier(sigma, mu, k, targets, processes)
+    reused = (time.perf_counter() - start) / num_targets
+
+    start = time.perf_counter()
+    with gp.Env(params={"OutputFlag": 0}) as env:
+        cold_risk = []
+        for target in targets:
+            with build_portfolio_model(sigma, mu, k, target, env) as model:
+                model.optimize()
+                cold_risk.append(model.ObjVal if model.SolCount > 0 else np.nan)
+    cold = (time.perf_counter() - start) / num_targets
+
+    agree = np.allclose(frontier["risk"].to_numpy(), cold_risk, rtol=1e-3, equal_nan=True)
+    print(f"  {num_targets} targets: reused model {reused * 1000:.2f} ms per point, cold rebuild {cold * 1000:.2f} ms per point")
+    print(f"  ratio {reused / cold:.2f}, risks agree with the cold solves: {agree}")
+    return frontier
+
+
+if __name__ == "__main__":
+    sigma, mu, mu_0, k = load_portfolio()
+    n = len(mu)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "frontier":
+        # frontier [num_targets processes]
+        num_targets = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+        processes = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        frontier = benchmark_frontier(sigma, mu, k, num_targets, processes)
+        print(frontier[["risk", "return"]].dropna())
+        sys.exit()
+
+    recorder = TrajectoryRecorder()
+    start = time.perf_counter()
+    with build_portfolio_model(sigma, mu, k, mu_0) as model:
+        # Stop once more search stops paying off
+        policy = GapStagnation(10, 1e-4) | TimeSinceIncumbent(30)
+        recorder.build_time = time.perf_counter() - start
+        optimize(model, policy, attach_recorder(model, recorder))
+        recorder.finish(model)
+        os.makedirs("trajectories", exist_ok=True)
+        recorder.save("trajectories/portfolio.json")
+
+        # Write the solution into a DataFrame
+        portfolio = model._x.X.tolist()
+        risk = model.ObjVal
+        expected_return = model.getRow(model.getConstrByName("return")).getValue()
+        df = pd.DataFrame(
+            data=portfolio + [risk, expected_return],
+            index=[f"asset_{i}" for i in range(n)] + ["risk", "return"],
+            columns=["Portfolio"],
+        )
+        print(df)
@@ -0,0 +1,223 @@
+import random
+import time
+
+from stockage import facteur_interet, fusionner, ordre_vers_sequence, score_sequence, sequence_vers_ordre
+
+# Budget de temps par défaut de la recherche locale (secondes)
+BUDGET_SECONDES = 10.0
+# Distance maximale (en positions) entre les deux extrémités d'un mouvement
+FENETRE = 50
+# Longueur maximale du segment déplacé par Or-opt
+LONGUEUR_OR_OPT = 3
+
+
+class RechercheLocale:
+    """
+    Amélioration d'une séquence de diapositives par mouvements locaux :
+    2-opt (inversion de segment), Or-opt (déplacement d'un court segment),
+    échange de deux diapositives et échange de partenaires entre deux
+    diapositives verticales.
+
+    Chaque mouvement est évalué uniquement sur les transitions qu'il modifie,
+    puis appliqué s'il ne dégrade pas le score.
+    """
+
+    def __init__(self, diapositives, sequence, fenetre=FENETRE, graine=0):
+        self.diapositives = diapositives
+        self.sequence = list(sequence)
+        self.fenetre = fenetre
+        self.aleatoire = random.Random(graine)
+        self.score = score_sequence(diapositives, self.sequence)
+        self.mouvements = [self.deux_opt, self.or_opt, self.echange]
+        if any(diapositives.photo2[i] >= 0 for i in self.sequence):
+            self.mouvements.append(self.echange_partenaires)
+
+    def _interet(self, i, j):
+        """
+        Intérêt entre deux diapositives, nul si l'une d'elles est absente (bord).
+        """
+        if i is None or j is None:
+            return 0
+        return self.diapositives.interet(i, j)
+
+    def _diapositive(self, position):
+        if 0 <= position < len(self.sequence):
+            return self.sequence[position]
+        return None
+
+    def _deux_positions(self):
+        n = len(self.sequence)
+        a = self.aleatoire.randrange(n - 1)
+        b = self.aleatoire.randrange(a + 1, min(n, a + 1 + self.fenetre))
+        return a, b
+
+    def deux_opt(self):
+        """
+        Inverser le segment [a, b] : seules les deux transitions de bord changent.
+        """
+        a, b = self._deux_positions()
+        gauche = self._diapositive(a - 1)
+        droite = self._diapositive(b + 1)
+        premiere = self.sequence[a]
+        derniere = self.sequence[b]
+        delta = (
+            self._interet(gauche, derniere) + self._interet(premiere, droite)
+            - self._interet(gauche, premiere) - self._interet(derniere, droite)
+        )
+        if delta >= 0:
+            self.sequence[a:b + 1] = self.sequence[a:b + 1][::-1]
+            self.score += delta
+        return delta
+
+    def or_opt(self):
+        """
+        Échanger deux blocs adjacents dont l'un fait au plus LONGUEUR_OR_OPT
+        diapositives : revient à déplacer ce court segment plus loin.
+        """
+        a, c = self._deux_positions()
+        if c - a < 1:
+            return 0
+        longueur = self.aleatoire.randint(1, min(LONGUEUR_OR_OPT, c - a))
+        # Blocs [a, m) et [m, c] ; le court segment est placé d'un côté ou de l'autre
+        m = a + longueur if self.aleatoire.random() < 0.5 else c + 1 - longueur
+        gauche = self._diapositive(a - 1)
+        droite = self._diapositive(c + 1)
+        bloc1_debut, bloc1_fin = self.sequence[a], self.sequence[m - 1]
+        bloc2_debut, bloc2_fin = self.sequence[m], self.sequence[c]
+        delta = (
+            self._interet(gauche, bloc2_debut) + self._interet(bloc2_fin, bloc1_debut)
+            + self._interet(bloc1_fin, droite)
+            - self._interet(gauche, bloc1_debut) - self._interet(bloc1_fin, bloc2_debut)
+            - self._interet(bloc2_fin, droite)
+        )
+        if delta >= 0:
+            self.sequence[a:c + 1] = self.sequence[m:c + 1] + self.sequence[a:m]
+            self.score += delta
+        return delta
+
+    def _score_autour(self, positions, diapositive_en):
+        """
+        Somme des transitions touchant les positions données, chaque transition
+        n'étant comptée qu'une fois.
+        """
+        transitions = set()
+        for p in positions:
+            transitions.add(p - 1)
+            transitions.add(p)
+        total = 0
+        for k in transitions:
+            if 0 <= k < len(self.sequence) - 1:
+                total += diapositive_en(k, k + 1)
+        return total
+
+    def echange(self):
+        """
+        Échanger les diapositives des positions p et q.
+        """
+        p, q = self._deux_positions()
+        sequence = self.sequence
+
+        def avant(k, l):
+            return self.diapositives.interet(sequence[k], sequence[l])
+
+        def apres(k, l):
+            permutation = {p: sequence[q], q: sequence[p]}
+            return self.diapositives.interet(permutation.get(k, sequence[k]), permutation.get(l, sequence[l]))
+
+        delta = self._score_autour((p, q), apres) - self._score_autour((p, q), avant)
+        if delta >= 0:
+            sequence[p], sequence[q] = sequence[q], sequence[p]
+            self.score += delta
+        return delta
+
+    def echange_partenaires(self):
+        """
+        Pour deux diapositives verticales (a, b) et (c, d), essayer (a, d) + (c, b)
+        ou (a, c) + (b, d) ; le magasin de diapositives est mis à jour si le
+        mouvement est retenu.
+        """
+        p, q = self._deux_positions()
+        diapositives = self.diapositives
+        sequence = self.sequence
+        u, v = sequence[p], sequence[q]
+        if diapositives.photo2[u] < 0 or diapositives.photo2[v] < 0:
+            return 0
+
+        a, b = diapositives.photo1[u], diapositives.photo2[u]
+        c, d = diapositives.photo1[v], diapositives.photo2[v]
+        if self.aleatoire.random() < 0.5:
+            paire_u, paire_v = (a, d), (c, b)
+        else:
+            paire_u, paire_v = (a, c), (b, d)
+
+        photos = diapositives.photos
+        nouvelles = {
+            p: fusionner(photos.etiquettes_de(paire_u[0]), photos.etiquettes_de(paire_u[1])),
+            q: fusionner(photos.etiquettes_de(paire_v[0]), photos.etiquettes_de(paire_v[1])),
+        }
+
+        def etiquettes(k):
+            if k in nouvelles:
+                return nouvelles[k]
+            return diapositives.etiquettes_de(sequence[k])
+
+        def avant(k, l):
+            return diapositives.interet(sequence[k], sequence[l])
+
+        def apres(k, l):
+            return facteur_interet(etiquettes(k), etiquettes(l))
+
+        delta = self._score_autour((p, q), apres) - self._score_autour((p, q), avant)
+        if delta >= 0:
+            diapositives.remplacer_verticale(u, *paire_u)
+            diapositives.remplacer_verticale(v, *paire_v)
+            self.score += delta
+        return delta
+
+    def executer(self, budget_secondes=BUDGET_SECONDES, intervalle_journal=1.0):
+        """
+        Appliquer des mouvements tirés au hasard jusqu'à épuisement du budget.
+
+        Retourne le journal [(secondes écoulées, score)] relevé toutes les
+        intervalle_journal secondes.
+        """
+        debut = time.perf_counter()
+        journal = [(0.0, self.score)]
+        print(f"Recherche locale : score initial {self.score}")
+        if len(self.sequence) < 2:
+            return journal
+
+        prochain_releve = intervalle_journal
+        mouvements = self.mouvements
+        choisir = self.aleatoire.choice
+        diapositives = self.diapositives
+        while True:
+            for _ in range(1000):
+                choisir(mouvements)()
+            # Les échanges de partenaires ajoutent des étiquettes : libérer les
+            # plages remplacées dès qu'elles occupent plus de la moitié du tableau
+            if 2 * diapositives.mortes > len(diapositives.etiquettes):
+                diapositives.compacter()
+            ecoule = time.perf_counter() - debut
+            if ecoule >= prochain_releve or ecoule >= budget_secondes:
+                journal.append((ecoule, self.score))
+                print(f"  {ecoule:6.1f} s : score {self.score}")
+                prochain_releve += intervalle_journal
+            if ecoule >= budget_secondes:
+                break
+
+        # Libérer les dernières plages remplacées
+        diapositives.compacter()
+        return journal
+
+
+def ameliorer_ordre(diapositives, ordre, budget_secondes=BUDGET_SECONDES, fenetre=FENETRE, graine=0):
+    """
+    Améliorer un ordre (transitions (i, j), par exemple celui d'optimiser_diaporama
+    ou d'ordonner_glouton) dans le budget de temps donné.
+
+    Retourne le nouvel ordre et le journal score / temps.
+    """
+    recherche = RechercheLocale(diapositives, ordre_vers_sequence(ordre), fenetre, graine)
+    journal = recherche.executer(budget_secondes)
+    return sequence_vers_ordre(recherche.sequence), journal
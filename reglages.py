@@ -0,0 +1,47 @@
+import math
+
+from modele_creux import LIMITE_LICENCE
+
+# Jusqu'à ce nombre de photos, le modèle Gurobi complet est utilisé : ses (n + 1) n arcs entre
+# n diapositives (au plus une par photo) et le nœud fictif doivent tenir dans la licence
+SEUIL_CREUX = (math.isqrt(4 * LIMITE_LICENCE + 1) - 1) // 2 if LIMITE_LICENCE is not None else 100
+# Au-delà de ce nombre de photos, le modèle creux est remplacé par l'ordonnancement glouton
+# (le budget d'arêtes de la licence, modele_creux.budget_aretes, y tombe sous deux arêtes par diapositive)
+SEUIL_GLOUTON = 500
+# Au-delà de SEUIL_CREUX, résoudre par grappes en parallèle puis recoller les chemins
+DECOMPOSITION = False
+# Temps (secondes) accordé à la recherche locale après le modèle creux ou le glouton
+BUDGET_RECHERCHE_LOCALE = 10.0
+# Démarrer les modèles complets depuis le fichier de sortie précédent s'il existe (sinon départ glouton)
+REPRISE_SOLUTION = True
+# Limite de temps (secondes) des modèles Gurobi (None : résolution jusqu'à l'optimum)
+LIMITE_TEMPS = None
+# Mode à tout moment : chaque nouvelle meilleure solution des modèles Gurobi est écrite dans le fichier de sortie
+SAUVEGARDE_CONTINUE = True
+# Politique d'arrêt des modèles Gurobi (termination_policies, None : aucune)
+POLITIQUE_ARRET = None
+# Fichier (CSV ou JSON) où enregistrer la trajectoire de résolution du modèle Gurobi (None : aucun)
+FICHIER_TRAJECTOIRE = None
+
+
+class Reglages:
+    """
+    Options des programmes de diaporama (projet, slideshow, slideshow2) ;
+    chaque option vaut par défaut la constante de même nom en majuscules.
+    """
+
+    def __init__(
+        self, seuil_glouton=SEUIL_GLOUTON, seuil_creux=SEUIL_CREUX, budget_recherche_locale=BUDGET_RECHERCHE_LOCALE,
+        decomposition=DECOMPOSITION, reprise_solution=REPRISE_SOLUTION, limite_temps=LIMITE_TEMPS,
+        sauvegarde_continue=SAUVEGARDE_CONTINUE, politique_arret=POLITIQUE_ARRET,
+        fichier_trajectoire=FICHIER_TRAJECTOIRE,
+    ):
+        self.seuil_glouton = seuil_glouton
+        self.seuil_creux = seuil_creux
+        self.budget_recherche_locale = budget_recherche_locale
+        self.decomposition = decomposition
+        self.reprise_solution = reprise_solution
+        self.limite_temps = limite_temps
+        self.sauvegarde_continue = sauvegarde_continue
+        self.politique_arret = politique_arret
+        self.fichier_trajectoire = fichier_trajectoire
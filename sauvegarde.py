@@ -0,0 +1,91 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+from gurobipy import GRB
+
+# Délai minimal (secondes) entre deux écritures du fichier de sortie pendant la résolution
+INTERVALLE_SAUVEGARDE = 1.0
+
+
+def ecrire_diaporama_atomique(fichier_sortie, diapositives_ids):
+    """
+    Écrire un diaporama (liste des identifiants de photos de chaque
+    diapositive) dans un fichier temporaire du même dossier, puis le renommer :
+    le fichier de sortie est toujours complet, même si le programme est tué.
+    """
+    dossier = os.path.dirname(os.path.abspath(fichier_sortie))
+    descripteur, temporaire = tempfile.mkstemp(dir=dossier, prefix=".sauvegarde-", suffix=".tmp")
+    try:
+        with os.fdopen(descripteur, "w") as fichier:
+            fichier.write(f"{len(diapositives_ids)}\n")
+            fichier.writelines(" ".join(map(str, ids)) + "\n" for ids in diapositives_ids)
+            fichier.flush()
+            os.fsync(fichier.fileno())
+        os.replace(temporaire, fichier_sortie)
+    except BaseException:
+        os.unlink(temporaire)
+        raise
+
+
+def enchainer_callbacks(*callbacks):
+    """
+    Composer plusieurs callbacks Gurobi en un seul (appelés dans l'ordre).
+    """
+    def callback(model, where):
+        for rappel in callbacks:
+            rappel(model, where)
+    return callback
+
+
+class DonneesSauvegarde:
+    """
+    Données du callback de sauvegarde : fichier de sortie, variables lues à
+    chaque solution, fonction de décodage valeurs -> diaporama (None si la
+    solution n'est pas un diaporama complet) et solution en attente
+    d'écriture.
+    """
+
+    def __init__(self, modele, fichier_sortie, variables, decoder, intervalle=INTERVALLE_SAUVEGARDE):
+        self.fichier_sortie = fichier_sortie
+        self.variables = variables
+        self.decoder = decoder
+        self.intervalle = intervalle
+        # Le sens d'optimisation n'est lisible qu'une fois le modèle mis à jour
+        modele.update()
+        self.sens = modele.ModelSense
+        self.meilleur = None
+        self.en_attente = None
+        self.derniere_ecriture = -float("inf")
+        self.ecritures = 0
+
+    def ecrire_en_attente(self):
+        if self.en_attente is None:
+            return
+        ecrire_diaporama_atomique(self.fichier_sortie, self.en_attente)
+        self.en_attente = None
+        self.derniere_ecriture = time.perf_counter()
+        self.ecritures += 1
+
+
+def callback_sauvegarde(model, where, *, cbdata):
+    """
+    À chaque nouvelle meilleure solution, la décoder et la garder en
+    attente ; elle est écrite dès que l'intervalle depuis la dernière
+    écriture est écoulé (les appels MIP périodiques vident l'attente).
+    """
+    if where == GRB.Callback.MIPSOL:
+        objectif = model.cbGet(GRB.Callback.MIPSOL_OBJ)
+        if cbdata.meilleur is not None and cbdata.sens * (objectif - cbdata.meilleur) >= 0:
+            return
+        diaporama = cbdata.decoder(np.asarray(model.cbGetSolution(cbdata.variables)))
+        if diaporama is None:
+            return
+        cbdata.meilleur = objectif
+        cbdata.en_attente = diaporama
+    elif where != GRB.Callback.MIP or cbdata.en_attente is None:
+        return
+
+    if time.perf_counter() - cbdata.derniere_ecriture >= cbdata.intervalle:
+        cbdata.ecrire_en_attente()
@@ -1,28 +1,29 @@
 import itertools
+import os
 import sys
-import gurobipy as gp
-from gurobipy import GRB
+
+from lecture import lire_entete, lire_photos
+from modele_diaporama import optimiser_diaporama, sequence_depuis_solution
+from phases import SANS_CHRONO, executer_grande_instance
+from reglages import Reglages
+from trajectory import TrajectoryRecorder
+from verify import lire_fichier_solution
 
 def lire_fichier_entree(fichier_entree):
     """
     Lire le fichier d'entrée et organiser les photos en horizontales ou verticales.
     """
-    with open(fichier_entree, "r") as fichier:
-        lignes = fichier.read().strip().split("\n")
-
-    N = int(lignes[0])  # Nombre de photos
     photos_horizontales = []
     photos_verticales = []
 
-    for i in range(1, N + 1):
-        donnees = lignes[i].split()
-        orientation = donnees[0]
-        etiquettes = set(donnees[2:])
+    for ident, orientation, etiquettes in lire_photos(fichier_entree):
+        orientation = orientation.decode()
+        etiquettes = {etiquette.decode() for etiquette in etiquettes}
 
         if orientation == "H":
-            photos_horizontales.append({"id": i - 1, "etiquettes": etiquettes})
+            photos_horizontales.append({"id": ident, "etiquettes": etiquettes})
         elif orientation == "V":
-            photos_verticales.append({"id": i - 1, "etiquettes": etiquettes})
+            photos_verticales.append({"id": ident, "etiquettes": etiquettes})
 
     return photos_horizontales, photos_verticales
 
@@ -45,53 +46,8 @@ def calculer_facteur_interet(etiquettes1, etiquettes2):
     """
     Calculer le facteur d'intérêt entre deux ensembles d'étiquettes.
     """
-    etiquettes_communes = len(etiquettes1.intersection(etiquettes2))
-    etiquettes_uniques_1 = len(etiquettes1 - etiquettes2)
-    etiquettes_uniques_2 = len(etiquettes2 - etiquettes1)
-    return min(etiquettes_communes, etiquettes_uniques_1, etiquettes_uniques_2)
-
-def optimiser_diaporama(diapositives):
-    """
-    Optimisation du diaporama avec Gurobi.
-    """
-    modele = gp.Model("Diaporama")
-    n_diapositives = len(diapositives)
-
-    Z = modele.addVars(n_diapositives, n_diapositives, vtype=GRB.BINARY, name="Z")
-
-    # Contrainte: Chaque diapositive est utilisée exactement une fois
-    for i in range(n_diapositives):
-        modele.addConstr(gp.quicksum(Z[i, j] for j in range(n_diapositives) if i != j) == 1)
-        modele.addConstr(gp.quicksum(Z[j, i] for j in range(n_diapositives) if i != j) == 1)
-
-    # ** Empêcher les auto-références (éviter que i pointe vers lui-même)**
-    for i in range(n_diapositives):
-        modele.addConstr(Z[i, i] == 0)
-
-    # ** Empêcher les Cycles**
-    for i in range(n_diapositives):
-        for j in range(n_diapositives):
-            if i != j:
-                modele.addConstr(Z[i, j] + Z[j, i] <= 1, name=f"AntiCycle_{i}_{j}")
-    
-    # Fonction objectif: maximiser le score
-    modele.setObjective(
-        gp.quicksum(
-            calculer_facteur_interet(diapositives[i]["etiquettes"], diapositives[j]["etiquettes"]) * Z[i, j]
-            for i in range(n_diapositives) for j in range(n_diapositives) if j == i+1
-        ),
-        GRB.MAXIMIZE
-    )
-
-    modele.optimize()
-    ordre = []
-    if modele.Status == GRB.OPTIMAL:
-        for i in range(n_diapositives):
-            for j in range(n_diapositives):
-                if i != j and Z[i, j].x > 0.5:
-                    ordre.append((i, j))
-    return ordre
-
+    etiquettes_communes = len(etiquettes1 & etiquettes2)
+    return min(etiquettes_communes, len(etiquettes1) - etiquettes_communes, len(etiquettes2) - etiquettes_communes)
 
 def ecrire_fichier_sortie(fichier_sortie, ordre, diapositives):
     """
@@ -105,29 +61,65 @@ def ecrire_fichier_sortie(fichier_sortie, ordre, diapositives):
             if id_diapositive not in diapositives_utilisees:
                 fichier.write(" ".join(map(str, id_diapositive)) + "\n")
                 diapositives_utilisees.add(id_diapositive)
+        if ordre:
+            # Écrire la dernière diapositive du chemin
+            id_diapositive = tuple(diapositives[ordre[-1][1]]["ids"])
+            if id_diapositive not in diapositives_utilisees:
+                fichier.write(" ".join(map(str, id_diapositive)) + "\n")
+        else:
+            # Aucune transition (une seule diapositive) : écrire les diapositives telles quelles
+            for i in range(len(diapositives)):
+                fichier.write(" ".join(map(str, diapositives[i]["ids"])) + "\n")
 
 
-def principal():
-    if len(sys.argv) != 2:
-        print("Lancement: python slideshow.py <fichier_donnee>")
-        sys.exit(1)
-
-    fichier_entree = sys.argv[1]
-    fichier_sortie = "slideshow.sol"
-
+def executer(fichier_entree, fichier_sortie, reglages=None, chrono=SANS_CHRONO):
+    """
+    Enchaîner les phases du programme (lecture, appariement, ordonnancement,
+    recherche locale, écriture), chacune mesurée par chrono.
+    """
+    if reglages is None:
+        reglages = Reglages()
     try:
-        photos_horizontales, photos_verticales = lire_fichier_entree(fichier_entree)
+        nombre_photos = lire_entete(fichier_entree)
+        if nombre_photos <= reglages.seuil_creux:
+            with chrono.phase("lecture"):
+                photos_horizontales, photos_verticales = lire_fichier_entree(fichier_entree)
     except Exception as e:
         print(f"Erreur lors de la lecture du fichier: {e}")
         sys.exit(1)
 
-    diapositives = []
-    diapositives.extend([{ "ids": [photo["id"]], "etiquettes": photo["etiquettes"] } for photo in photos_horizontales])
-    diapositives.extend(combiner_photos_verticales(photos_verticales))
-
-    ordre = optimiser_diaporama(diapositives)
-    ecrire_fichier_sortie(fichier_sortie, ordre, diapositives)
+    fichier_sauvegarde = fichier_sortie if reglages.sauvegarde_continue else None
+    trajectoire = TrajectoryRecorder() if reglages.fichier_trajectoire is not None else None
+    if nombre_photos > reglages.seuil_creux:
+        diapositives, ordre = executer_grande_instance(
+            fichier_entree, nombre_photos, reglages, fichier_sauvegarde, trajectoire, chrono
+        )
+    else:
+        with chrono.phase("appariement"):
+            diapositives = []
+            diapositives.extend([{ "ids": [photo["id"]], "etiquettes": photo["etiquettes"] } for photo in photos_horizontales])
+            diapositives.extend(combiner_photos_verticales(photos_verticales))
+
+        with chrono.phase("ordonnancement"):
+            depart = None
+            if reglages.reprise_solution and os.path.exists(fichier_sortie):
+                depart = sequence_depuis_solution(diapositives, lire_fichier_solution(fichier_sortie))
+            ordre = optimiser_diaporama(
+                diapositives, depart, reglages.limite_temps, fichier_sauvegarde, reglages.politique_arret, trajectoire
+            )
+    with chrono.phase("ecriture"):
+        ecrire_fichier_sortie(fichier_sortie, ordre, diapositives)
     print(f"Diaporama généré dans le fichier : {fichier_sortie}")
+    if trajectoire is not None and trajectoire.start_time is not None:
+        trajectoire.save(reglages.fichier_trajectoire)
+        print(f"Trajectoire de résolution écrite dans le fichier : {reglages.fichier_trajectoire}")
+
+def principal(reglages=None):
+    if len(sys.argv) != 2:
+        print("Lancement: python slideshow.py <fichier_donnee>")
+        sys.exit(1)
+
+    executer(sys.argv[1], "slideshow.sol", reglages)
 
 if __name__ == "__main__":
     principal()
\ No newline at end of file
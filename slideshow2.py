@@ -1,27 +1,39 @@
+import os
 import sys
-import gurobipy as gp
-from gurobipy import GRB
+
+import numpy as np
+
+from lecture import lire_entete, lire_photos
+from matrice_interet import interet_dicts
+from modele_diaporama import (
+    construire_modele_couplage,
+    couplage_glouton_interets,
+    fixer_depart_couplage,
+    optimiser_diaporama,
+    paires_depuis_solution,
+    sequence_depuis_solution,
+)
+from phases import SANS_CHRONO, executer_grande_instance
+from reglages import Reglages
+from stockage import ordre_vers_sequence, score_sequence
+from trajectory import TrajectoryRecorder
+from verify import lire_fichier_solution
 
 def lire_fichier_entree(fichier_entree):
     """
     Lire le fichier d'entrée et organiser les photos en horizontales ou verticales.
     """
-    with open(fichier_entree, "r") as fichier:
-        lignes = fichier.read().strip().split("\n")
-
-    N = int(lignes[0])  # Nombre de photos
     photos_horizontales = []
     photos_verticales = []
 
-    for i in range(1, N + 1):
-        donnees = lignes[i].split()
-        orientation = donnees[0]
-        etiquettes = set(donnees[2:])
+    for ident, orientation, etiquettes in lire_photos(fichier_entree):
+        orientation = orientation.decode()
+        etiquettes = {etiquette.decode() for etiquette in etiquettes}
 
         if orientation == "H":
-            photos_horizontales.append({"id": i - 1, "sens": orientation, "etiquettes": etiquettes})
+            photos_horizontales.append({"id": ident, "sens": orientation, "etiquettes": etiquettes})
         elif orientation == "V":
-            photos_verticales.append({"id": i - 1, "sens": orientation, "etiquettes": etiquettes})
+            photos_verticales.append({"id": ident, "sens": orientation, "etiquettes": etiquettes})
 
     return photos_horizontales, photos_verticales
 
@@ -29,123 +41,39 @@ def calculer_facteur_interet(etiquettes1, etiquettes2):
     """
     Calculer le facteur d'intérêt entre deux ensembles d'étiquettes.
     """
-    etiquettes_communes = len(etiquettes1.intersection(etiquettes2))
-    etiquettes_uniques_1 = len(etiquettes1 - etiquettes2)
-    etiquettes_uniques_2 = len(etiquettes2 - etiquettes1)
-    return min(etiquettes_communes, etiquettes_uniques_1, etiquettes_uniques_2)
-
-def optimiser_diaporama(diapositives):
-    """
-    Optimisation du diaporama avec Gurobi en maximisant l'intérêt total.
-    """
-    modele = gp.Model("Diaporama")
-    n_diapositives = len(diapositives)
-    
-    U = modele.addVars(n_diapositives, vtype=GRB.BINARY, name="U")
-    # Variables binaires : Z[i, j] indique si la diapositive i est suivie de la diapositive j
-    Z = modele.addVars(n_diapositives, n_diapositives, vtype=GRB.BINARY, name="Z")
-
-    # ** Contrainte : Chaque diapositive a un unique successeur et un unique prédécesseur**
-    for i in range(n_diapositives):
-        modele.addConstr(gp.quicksum(Z[i, j] for j in range(n_diapositives) if i != j) == 1)
-        modele.addConstr(gp.quicksum(Z[j, i] for j in range(n_diapositives) if i != j) == 1)
-
-    # ** Empêcher les auto-références (éviter que i pointe vers lui-même)**
-    for i in range(n_diapositives):
-        modele.addConstr(Z[i, i] == 0)
-
-    for i in range(n_diapositives):
-        for j in range(n_diapositives):
-            if i != j:
-                modele.addConstr(Z[i, j] + Z[j, i] <= 1, name=f"AntiCycle_{i}_{j}")
-    
-    # Préparation des termes de la somme pour affichage
-    termes_objectif = []
-
-    for i in range(n_diapositives):
-        for j in range(n_diapositives):
-            if  j == i+1 :  # Exclure les cas i == j
-                facteur_interet = calculer_facteur_interet(diapositives[i]["etiquettes"], diapositives[j]["etiquettes"])
-                termes_objectif.append((i, j, facteur_interet))
-
-    
-    # Définition de l'objectif dans Gurobi
-    modele.setObjective(
-        gp.quicksum(
-            facteur_interet * Z[i, j]
-            for i, j, facteur_interet in termes_objectif
-        ),
-        GRB.MAXIMIZE
-    )
-
-    # ** Résolution du modèle**
-    modele.optimize()
-
-    ordre = []
-    if modele.Status == GRB.OPTIMAL:
-        print("\n Solution optimale trouvée !")
-        print(f" Objectif optimal : {modele.ObjVal}")
-
-        # Récupération des valeurs optimales pour O[i]
-        order_values = {i: U[i].x for i in range(n_diapositives)}
+    etiquettes_communes = len(etiquettes1 & etiquettes2)
+    return min(etiquettes_communes, len(etiquettes1) - etiquettes_communes, len(etiquettes2) - etiquettes_communes)
 
-        # Trier les diapositives selon leur ordre dans le chemin
-        sorted_order = sorted(order_values.keys(), key=lambda x: order_values[x])
-
-        # Construire la séquence ordonnée
-        for i in range(len(sorted_order) - 1):
-            ordre.append((sorted_order[i], sorted_order[i + 1]))
-
-    else:
-        print("\n Aucune solution optimale trouvée.")
-
-    return ordre
-
-def combiner_photos_verticales_optimise(photos_verticales):
+def combiner_photos_verticales_optimise(photos_verticales, depart=None):
     """
     Optimiser la combinaison des photos verticales en maximisant l'intérêt total.
     """
-    modele = gp.Model("CombinaisonVerticale")
-    modele.setParam('OutputFlag', 0)
     n = len(photos_verticales)
-
     if n < 2:
         return []
 
-    # **Variables de décision X[i, j]** : indique si la photo i est appariée avec la photo j
-    X = modele.addVars(n, n, vtype=GRB.BINARY, name="X")
-
-    # ** Contraintes : Chaque photo verticale doit être appariée une seule fois**
-    for i in range(n):
-        modele.addConstr(gp.quicksum(X[i, j] for j in range(n) if i != j) == 1)
-        modele.addConstr(gp.quicksum(X[j, i] for j in range(n) if i != j) == 1)
+    # **Variables de décision X[k]** : indique si les photos paires[0][k] < paires[1][k] forment une paire ;
+    # couplage (chaque photo dans au plus une paire, n // 2 paires), intérêt des paires en coût
+    interets = interet_dicts(photos_verticales)
+    modele, X, paires = construire_modele_couplage(interets)
+    modele.setParam('OutputFlag', 0)
 
-    # ** Fonction objectif : Maximiser l'intérêt des paires**
-    modele.setObjective(
-        gp.quicksum(
-            calculer_facteur_interet(photos_verticales[i]["etiquettes"], photos_verticales[j]["etiquettes"]) * X[i, j]
-            for i in range(n) for j in range(n) if i != j
-        ),
-        GRB.MAXIMIZE
-    )
+    # **Démarrage à chaud : paires données (solution précédente) ou couplage glouton**
+    fixer_depart_couplage(X, n, depart or couplage_glouton_interets(interets))
 
     # **Résolution du modèle**
     modele.optimize()
 
     # **Construction des diapositives verticales optimisées**
     diapositives = []
-    used = set()
-    for i in range(n):
-        for j in range(n):
-            if i!=j and X[i, j].x > 0.5 and i not in used and j not in used:
-                etiquettes_combinees = photos_verticales[i]["etiquettes"].union(photos_verticales[j]["etiquettes"])
-                diapositives.append({
-                    "ids": [photos_verticales[i]["id"], photos_verticales[j]["id"]],
-                    "sens": ["V"],
-                    "etiquettes": etiquettes_combinees
-                })
-                used.add(i)
-                used.add(j)
+    for k in np.flatnonzero(X.X > 0.5):
+        i, j = paires[0][k], paires[1][k]
+        etiquettes_combinees = photos_verticales[i]["etiquettes"].union(photos_verticales[j]["etiquettes"])
+        diapositives.append({
+            "ids": [photos_verticales[i]["id"], photos_verticales[j]["id"]],
+            "sens": ["V"],
+            "etiquettes": etiquettes_combinees
+        })
     return diapositives
 
 
@@ -172,12 +100,18 @@ def ecrire_fichier_sortie(fichier_sortie, ordre, diapositives):
             if j not in diapositives_utilisees:
                 fichier.write(" ".join(map(str, diapo_j["ids"])) + "\n")
                 diapositives_utilisees.add(j)
+
+        # Aucune transition (une seule diapositive) : écrire les diapositives telles quelles
+        if not ordre:
+            for i in range(len(diapositives)):
+                fichier.write(" ".join(map(str, diapositives[i]["ids"])) + "\n")
                 
 def calculer_score_diaporama(diapositives, ordre):
     """
     Calculer le score total du diaporama en fonction de l'ordre des diapositives.
     """
     score_total = 0
+    interets = interet_dicts(diapositives)
 
     for i, j in ordre:
         # Obtenir les étiquettes des diapositives i et j
@@ -185,7 +119,7 @@ def calculer_score_diaporama(diapositives, ordre):
         etiquettes2 = diapositives[j]["etiquettes"]
 
         # Calculer le facteur d'intérêt entre les deux diapositives
-        facteur_interet = calculer_facteur_interet(etiquettes1, etiquettes2)
+        facteur_interet = interets[i, j]
         score_total += facteur_interet
 
         # Afficher les détails de la transition
@@ -198,32 +132,67 @@ def calculer_score_diaporama(diapositives, ordre):
 
     return score_total
 
-def principal():
-    if len(sys.argv) != 2:
-        print("Lancement: python slideshow.py <fichier_donnee>")
-        sys.exit(1)
-
-    fichier_entree = sys.argv[1]
-    fichier_sortie = "slideshow2.sol"
-
+def executer(fichier_entree, fichier_sortie, reglages=None, chrono=SANS_CHRONO):
+    """
+    Enchaîner les phases du programme (lecture, appariement, ordonnancement,
+    recherche locale, score, écriture), chacune mesurée par chrono.
+    """
+    if reglages is None:
+        reglages = Reglages()
     try:
-        photos_horizontales, photos_verticales = lire_fichier_entree(fichier_entree)
+        nombre_photos = lire_entete(fichier_entree)
+        if nombre_photos <= reglages.seuil_creux:
+            with chrono.phase("lecture"):
+                photos_horizontales, photos_verticales = lire_fichier_entree(fichier_entree)
     except Exception as e:
         print(f"Erreur lors de la lecture du fichier: {e}")
         sys.exit(1)
 
-    diapositives = []
-    diapositives.extend([{ "ids": [photo["id"]], "sens": [photo["sens"]], "etiquettes": photo["etiquettes"] } for photo in photos_horizontales])
-    diapositives.extend(combiner_photos_verticales_optimise(photos_verticales))
+    fichier_sauvegarde = fichier_sortie if reglages.sauvegarde_continue else None
+    trajectoire = TrajectoryRecorder() if reglages.fichier_trajectoire is not None else None
+    if nombre_photos > reglages.seuil_creux:
+        diapositives, ordre = executer_grande_instance(
+            fichier_entree, nombre_photos, reglages, fichier_sauvegarde, trajectoire, chrono
+        )
 
-    ordre = optimiser_diaporama(diapositives)
-   
-    # Calculer le score en fonction de l'ordre final
-    score = calculer_score_diaporama(diapositives, ordre)
+        # Pas d'affichage transition par transition sur les grandes instances
+        with chrono.phase("score"):
+            score = score_sequence(diapositives, ordre_vers_sequence(ordre))
+    else:
+        with chrono.phase("appariement"):
+            diapositives = []
+            diapositives.extend([{ "ids": [photo["id"]], "sens": [photo["sens"]], "etiquettes": photo["etiquettes"] } for photo in photos_horizontales])
+            lignes_precedentes = []
+            if reglages.reprise_solution and os.path.exists(fichier_sortie):
+                lignes_precedentes = lire_fichier_solution(fichier_sortie)
+            diapositives.extend(combiner_photos_verticales_optimise(
+                photos_verticales, paires_depuis_solution(photos_verticales, lignes_precedentes)
+            ))
+
+        with chrono.phase("ordonnancement"):
+            ordre = optimiser_diaporama(
+                diapositives, sequence_depuis_solution(diapositives, lignes_precedentes), reglages.limite_temps,
+                fichier_sauvegarde, reglages.politique_arret, trajectoire, verbeux=True,
+            )
+
+        # Calculer le score en fonction de l'ordre final
+        with chrono.phase("score"):
+            score = calculer_score_diaporama(diapositives, ordre)
     print(f"\n **Score total du diaporama : {score}**")
 
-    ecrire_fichier_sortie(fichier_sortie, ordre, diapositives)
+    with chrono.phase("ecriture"):
+        ecrire_fichier_sortie(fichier_sortie, ordre, diapositives)
     print(f"Diaporama généré dans le fichier : {fichier_sortie}")
+    if trajectoire is not None and trajectoire.start_time is not None:
+        trajectoire.save(reglages.fichier_trajectoire)
+        print(f"Trajectoire de résolution écrite dans le fichier : {reglages.fichier_trajectoire}")
+
+def principal(reglages=None):
+    if len(sys.argv) != 2:
+        print("Lancement: python slideshow.py <fichier_donnee>")
+        sys.exit(1)
+
+    executer(sys.argv[1], "slideshow2.sol", reglages)
 
 if __name__ == "__main__":
     principal()
\ No newline at end of file
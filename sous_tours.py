@@ -0,0 +1,97 @@
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+
+class DonneesSousTours:
+    """
+    Données passées au callback d'élimination des sous-tours : les variables
+    d'arc et les extrémités (origine, destination) de chaque arc, rangées par
+    origine pour retrouver sans dictionnaire les arcs sortants d'un nœud.
+
+    arcs est soit un tupledict (i, j) -> variable, soit le couple de tableaux
+    (origines, destinations) lorsque variables est le MVar correspondant.
+    """
+
+    def __init__(self, arcs, noeud_autorise=None, variables=None):
+        if variables is None:
+            cles = list(arcs.keys())
+            self.variables = list(arcs.values())
+            self.origines = np.array([i for i, _ in cles], dtype=np.int64)
+            self.destinations = np.array([j for _, j in cles], dtype=np.int64)
+        else:
+            origines, destinations = arcs
+            self.variables = variables
+            self.origines = np.asarray(origines, dtype=np.int64)
+            self.destinations = np.asarray(destinations, dtype=np.int64)
+        # Arcs sortants du nœud i : positions rangees[debuts[i]:debuts[i + 1]]
+        self.rangees = np.argsort(self.origines, kind="stable")
+        nombre_noeuds = int(self.origines.max()) + 1 if len(self.origines) else 0
+        self.debuts = np.searchsorted(self.origines[self.rangees], np.arange(nombre_noeuds + 1))
+        # Le cycle passant par ce nœud (nœud fictif de la tournée) est autorisé
+        self.noeud_autorise = noeud_autorise
+        self.coupes = 0
+
+    def arcs_internes(self, noeuds):
+        """
+        Positions des arcs dont les deux extrémités sont dans noeuds.
+        """
+        sortants = np.concatenate([self.rangees[self.debuts[i]:self.debuts[i + 1]] for i in noeuds])
+        return sortants[np.isin(self.destinations[sortants], noeuds)]
+
+
+def trouver_cycles(successeurs, noeud_autorise=None):
+    """
+    Retourner les cycles d'une application nœud -> successeur, sauf celui qui
+    passe par noeud_autorise. Les nœuds sans successeur terminent un chemin.
+    """
+    cycles = []
+    etat = {}  # 1 : en cours d'exploration, 2 : terminé
+    for depart in successeurs:
+        if depart in etat:
+            continue
+        chemin = []
+        i = depart
+        while i is not None and i not in etat:
+            etat[i] = 1
+            chemin.append(i)
+            i = successeurs.get(i)
+        if i is not None and etat[i] == 1:
+            cycle = chemin[chemin.index(i):]
+            if noeud_autorise not in cycle:
+                cycles.append(cycle)
+        for k in chemin:
+            etat[k] = 2
+    return cycles
+
+
+def callback_sous_tours(model, where, *, cbdata):
+    """
+    À chaque nouvelle solution entière, couper les cycles qui ne passent pas
+    par le nœud autorisé : somme des arcs internes <= taille du cycle - 1.
+    """
+    if where != GRB.Callback.MIPSOL:
+        return
+
+    valeurs = np.asarray(model.cbGetSolution(cbdata.variables))
+    choisis = np.flatnonzero(valeurs > 0.5)
+    successeurs = dict(zip(cbdata.origines[choisis].tolist(), cbdata.destinations[choisis].tolist()))
+
+    for cycle in trouver_cycles(successeurs, cbdata.noeud_autorise):
+        model.cbLazy(
+            gp.quicksum(cbdata.variables[k] for k in cbdata.arcs_internes(cycle).tolist()) <= len(cycle) - 1
+        )
+        cbdata.coupes += 1
+
+
+def chemin_depuis_fictif(successeurs, fictif):
+    """
+    Lire la tournée à partir du nœud fictif et retourner le chemin des
+    diapositives réelles.
+    """
+    sequence = []
+    i = successeurs[fictif]
+    while i != fictif:
+        sequence.append(i)
+        i = successeurs[i]
+    return sequence
@@ -0,0 +1,296 @@
+from array import array
+
+
+def compter_communes(etiquettes1, etiquettes2):
+    """
+    Compter les étiquettes communes à deux suites triées d'identifiants entiers.
+    """
+    i = j = communes = 0
+    n1 = len(etiquettes1)
+    n2 = len(etiquettes2)
+    while i < n1 and j < n2:
+        a = etiquettes1[i]
+        b = etiquettes2[j]
+        if a == b:
+            communes += 1
+            i += 1
+            j += 1
+        elif a < b:
+            i += 1
+        else:
+            j += 1
+    return communes
+
+
+def compter_communes_plages(etiquettes, debut1, fin1, debut2, fin2):
+    """
+    Compter les étiquettes communes à deux plages triées d'un même tableau,
+    sans copier les plages.
+    """
+    communes = 0
+    while debut1 < fin1 and debut2 < fin2:
+        a = etiquettes[debut1]
+        b = etiquettes[debut2]
+        if a == b:
+            communes += 1
+            debut1 += 1
+            debut2 += 1
+        elif a < b:
+            debut1 += 1
+        else:
+            debut2 += 1
+    return communes
+
+
+def facteur_interet(etiquettes1, etiquettes2):
+    """
+    Calculer le facteur d'intérêt à partir d'un seul comptage d'intersection.
+    """
+    communes = compter_communes(etiquettes1, etiquettes2)
+    return min(communes, len(etiquettes1) - communes, len(etiquettes2) - communes)
+
+
+def fusionner(etiquettes1, etiquettes2):
+    """
+    Union triée de deux suites triées d'identifiants entiers.
+    """
+    resultat = array("l")
+    i = j = 0
+    n1 = len(etiquettes1)
+    n2 = len(etiquettes2)
+    while i < n1 and j < n2:
+        a = etiquettes1[i]
+        b = etiquettes2[j]
+        if a == b:
+            resultat.append(a)
+            i += 1
+            j += 1
+        elif a < b:
+            resultat.append(a)
+            i += 1
+        else:
+            resultat.append(b)
+            j += 1
+    resultat.extend(etiquettes1[i:])
+    resultat.extend(etiquettes2[j:])
+    return resultat
+
+
+class DictionnaireEtiquettes:
+    """
+    Associer chaque étiquette (chaîne ou octets) à un identifiant entier unique.
+    """
+
+    __slots__ = ("identifiants",)
+
+    def __init__(self):
+        self.identifiants = {}
+
+    def __len__(self):
+        return len(self.identifiants)
+
+    def identifiant(self, etiquette):
+        identifiants = self.identifiants
+        ident = identifiants.get(etiquette)
+        if ident is None:
+            ident = len(identifiants)
+            identifiants[etiquette] = ident
+        return ident
+
+    def encoder(self, etiquettes):
+        """
+        Retourner les identifiants triés (sans doublon) d'une suite d'étiquettes.
+        """
+        identifiants = self.identifiants
+        ajouter = identifiants.setdefault
+        return array("l", sorted({ajouter(e, len(identifiants)) for e in etiquettes}))
+
+
+class MagasinPhotos:
+    """
+    Stockage en colonnes des photos : orientation, puis étiquettes triées
+    rangées bout à bout dans un seul tableau d'entiers.
+    """
+
+    __slots__ = ("dictionnaire", "orientations", "debuts", "etiquettes")
+
+    def __init__(self, dictionnaire=None):
+        self.dictionnaire = dictionnaire if dictionnaire is not None else DictionnaireEtiquettes()
+        self.orientations = bytearray()
+        self.debuts = array("l", [0])
+        self.etiquettes = array("l")
+
+    def __len__(self):
+        return len(self.orientations)
+
+    def ajouter(self, orientation, etiquettes):
+        """
+        Ajouter une photo ('H' ou 'V') et retourner son identifiant.
+        """
+        ident = len(self.orientations)
+        self.orientations.append(ord(orientation) if isinstance(orientation, str) else orientation[0])
+        self.etiquettes.extend(self.dictionnaire.encoder(etiquettes))
+        self.debuts.append(len(self.etiquettes))
+        return ident
+
+    def orientation(self, i):
+        return chr(self.orientations[i])
+
+    def etiquettes_de(self, i):
+        return self.etiquettes[self.debuts[i]:self.debuts[i + 1]]
+
+    def nombre_etiquettes(self, i):
+        return self.debuts[i + 1] - self.debuts[i]
+
+    def identifiants(self, orientation):
+        """
+        Identifiants des photos d'une orientation donnée ('H' ou 'V').
+        """
+        code = ord(orientation)
+        return array("l", (i for i, o in enumerate(self.orientations) if o == code))
+
+
+class MagasinDiapositives:
+    """
+    Stockage en colonnes des diapositives construites sur un MagasinPhotos.
+
+    Chaque diapositive garde ses photos (photo2 vaut -1 pour une horizontale)
+    et la plage de ses étiquettes triées dans un tableau partagé ; mortes
+    compte les entrées de ce tableau qui n'appartiennent plus à aucune
+    diapositive (voir remplacer_verticale).
+    """
+
+    __slots__ = ("photos", "photo1", "photo2", "debuts", "longueurs", "etiquettes", "mortes")
+
+    def __init__(self, photos):
+        self.photos = photos
+        self.photo1 = array("l")
+        self.photo2 = array("l")
+        self.debuts = array("l")
+        self.longueurs = array("l")
+        self.etiquettes = array("l")
+        self.mortes = 0
+
+    def __len__(self):
+        return len(self.photo1)
+
+    def __getitem__(self, i):
+        """
+        Vue dictionnaire compatible avec le code existant (petites instances).
+        """
+        return {"ids": self.ids(i), "etiquettes": set(self.etiquettes_de(i))}
+
+    def _ranger(self, etiquettes):
+        self.debuts.append(len(self.etiquettes))
+        self.longueurs.append(len(etiquettes))
+        self.etiquettes.extend(etiquettes)
+
+    def ajouter_horizontale(self, photo):
+        self.photo1.append(photo)
+        self.photo2.append(-1)
+        self._ranger(self.photos.etiquettes_de(photo))
+        return len(self.photo1) - 1
+
+    def ajouter_verticale(self, photo1, photo2):
+        self.photo1.append(photo1)
+        self.photo2.append(photo2)
+        self._ranger(fusionner(self.photos.etiquettes_de(photo1), self.photos.etiquettes_de(photo2)))
+        return len(self.photo1) - 1
+
+    def remplacer_verticale(self, i, photo1, photo2):
+        """
+        Changer les photos d'une diapositive verticale ; les nouvelles étiquettes
+        sont ajoutées en fin de tableau (voir compacter).
+        """
+        etiquettes = fusionner(self.photos.etiquettes_de(photo1), self.photos.etiquettes_de(photo2))
+        self.photo1[i] = photo1
+        self.photo2[i] = photo2
+        self.mortes += self.longueurs[i]
+        self.debuts[i] = len(self.etiquettes)
+        self.longueurs[i] = len(etiquettes)
+        self.etiquettes.extend(etiquettes)
+
+    def compacter(self):
+        """
+        Libérer les plages d'étiquettes laissées par remplacer_verticale.
+        """
+        etiquettes = array("l")
+        for i in range(len(self.photo1)):
+            debut = self.debuts[i]
+            self.debuts[i] = len(etiquettes)
+            etiquettes.extend(self.etiquettes[debut:debut + self.longueurs[i]])
+        self.etiquettes = etiquettes
+        self.mortes = 0
+
+    def ids(self, i):
+        if self.photo2[i] < 0:
+            return [self.photo1[i]]
+        return [self.photo1[i], self.photo2[i]]
+
+    def etiquettes_de(self, i):
+        debut = self.debuts[i]
+        return self.etiquettes[debut:debut + self.longueurs[i]]
+
+    def nombre_etiquettes(self, i):
+        return self.longueurs[i]
+
+    def communes(self, i, j):
+        debut1 = self.debuts[i]
+        debut2 = self.debuts[j]
+        return compter_communes_plages(
+            self.etiquettes, debut1, debut1 + self.longueurs[i], debut2, debut2 + self.longueurs[j]
+        )
+
+    def interet(self, i, j):
+        communes = self.communes(i, j)
+        return min(communes, self.longueurs[i] - communes, self.longueurs[j] - communes)
+
+
+def construire_diapositives(photos, horizontales, paires):
+    """
+    Construire le magasin de diapositives : les horizontales d'abord,
+    puis les paires de verticales.
+    """
+    diapositives = MagasinDiapositives(photos)
+    for photo in horizontales:
+        diapositives.ajouter_horizontale(photo)
+    for photo1, photo2 in paires:
+        diapositives.ajouter_verticale(photo1, photo2)
+    return diapositives
+
+
+def construire_index_inverse(diapositives):
+    """
+    Index inversé étiquette -> liste des diapositives qui la portent.
+    """
+    index = [[] for _ in range(len(diapositives.photos.dictionnaire))]
+    etiquettes = diapositives.etiquettes
+    for i in range(len(diapositives)):
+        debut = diapositives.debuts[i]
+        for k in range(debut, debut + diapositives.longueurs[i]):
+            index[etiquettes[k]].append(i)
+    return index
+
+
+def sequence_vers_ordre(sequence):
+    """
+    Convertir une suite d'indices de diapositives en transitions (i, j).
+    """
+    return list(zip(sequence, sequence[1:]))
+
+
+def ordre_vers_sequence(ordre):
+    """
+    Retrouver la suite d'indices parcourue par une liste de transitions (i, j).
+    """
+    if not ordre:
+        return []
+    return [ordre[0][0]] + [j for _, j in ordre]
+
+
+def score_sequence(diapositives, sequence):
+    """
+    Score total d'une suite d'indices de diapositives.
+    """
+    interet = diapositives.interet
+    return sum(interet(i, j) for i, j in zip(sequence, sequence[1:]))
@@ -0,0 +1,213 @@
+import abc
+from functools import partial
+
+from gurobipy import GRB
+
+from sauvegarde import enchainer_callbacks
+
+
+class Progress:
+    """Snapshot of the MIP search, refreshed in place at every MIP callback."""
+
+    __slots__ = ("runtime", "obj_best", "obj_bound", "sol_count", "node_count", "iter_count")
+
+    def __init__(self):
+        self.runtime = 0.0
+        self.obj_best = GRB.INFINITY
+        self.obj_bound = -GRB.INFINITY
+        self.sol_count = 0
+        self.node_count = 0.0
+        self.iter_count = 0.0
+
+    def poll(self, model):
+        self.runtime = model.cbGet(GRB.Callback.RUNTIME)
+        self.obj_best = model.cbGet(GRB.Callback.MIP_OBJBST)
+        self.obj_bound = model.cbGet(GRB.Callback.MIP_OBJBND)
+        self.sol_count = model.cbGet(GRB.Callback.MIP_SOLCNT)
+        self.node_count = model.cbGet(GRB.Callback.MIP_NODCNT)
+        self.iter_count = model.cbGet(GRB.Callback.MIP_ITRCNT)
+
+    @property
+    def gap(self):
+        if self.sol_count == 0:
+            return GRB.INFINITY
+        if self.obj_best == 0:
+            return 0.0 if self.obj_bound == 0 else GRB.INFINITY
+        return abs(self.obj_best - self.obj_bound) / abs(self.obj_best)
+
+
+class TerminationPolicy(abc.ABC):
+    """
+    Base class: reset() is called before each solve, should_stop() at each
+    MIP callback with the shared Progress snapshot.
+    """
+
+    def reset(self, model):
+        pass
+
+    @abc.abstractmethod
+    def should_stop(self, progress):
+        pass
+
+    def __or__(self, other):
+        return AnyOf(self, other)
+
+    def __and__(self, other):
+        return AllOf(self, other)
+
+
+class GapStagnation(TerminationPolicy):
+    """Stop when the MIP gap has not improved by more than epsilon for window seconds."""
+
+    def __init__(self, window, epsilon=1e-4):
+        self.window = window
+        self.epsilon = epsilon
+        self.reset(None)
+
+    def reset(self, model):
+        self.last_gap_change_time = None
+        self.last_gap = GRB.INFINITY
+
+    def should_stop(self, progress):
+        gap = progress.gap
+        if gap >= GRB.INFINITY:
+            # No incumbent yet, or a zero objective against a nonzero bound: no gap to watch
+            return False
+        # The window starts at the first finite gap
+        if self.last_gap_change_time is None or self.last_gap - gap > self.epsilon:
+            self.last_gap = gap
+            self.last_gap_change_time = progress.runtime
+            return False
+        return progress.runtime - self.last_gap_change_time > self.window
+
+
+class TimeSinceIncumbent(TerminationPolicy):
+    """Stop when no new incumbent has been found for seconds."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.reset(None)
+
+    def reset(self, model):
+        self.last_obj = None
+        self.last_incumbent_time = 0.0
+
+    def should_stop(self, progress):
+        if progress.sol_count == 0:
+            return False
+        if progress.obj_best != self.last_obj:
+            self.last_obj = progress.obj_best
+            self.last_incumbent_time = progress.runtime
+            return False
+        return progress.runtime - self.last_incumbent_time > self.seconds
+
+
+class ObjectiveTarget(TerminationPolicy):
+    """
+    Stop when the incumbent reaches target, up to an absolute and a relative
+    tolerance (relative to |target|), in the model's optimisation sense.
+    """
+
+    def __init__(self, target, absolute=0.0, relative=0.0):
+        self.target = target
+        self.tolerance = absolute + relative * abs(target)
+        self.sense = GRB.MINIMIZE
+
+    def reset(self, model):
+        if model is not None:
+            self.sense = model.ModelSense
+
+    def should_stop(self, progress):
+        if progress.sol_count == 0:
+            return False
+        return self.sense * (progress.obj_best - self.target) <= self.tolerance
+
+
+class NodeBudget(TerminationPolicy):
+    """Stop once the branch-and-bound tree has explored nodes nodes."""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def should_stop(self, progress):
+        return progress.node_count >= self.nodes
+
+
+class IterationBudget(TerminationPolicy):
+    """Stop once iterations simplex iterations have been performed."""
+
+    def __init__(self, iterations):
+        self.iterations = iterations
+
+    def should_stop(self, progress):
+        return progress.iter_count >= self.iterations
+
+
+class AnyOf(TerminationPolicy):
+    """Stop as soon as one policy asks to; every policy still sees each snapshot."""
+
+    def __init__(self, *policies):
+        self.policies = policies
+
+    def reset(self, model):
+        for policy in self.policies:
+            policy.reset(model)
+
+    def should_stop(self, progress):
+        stop = False
+        for policy in self.policies:
+            stop = policy.should_stop(progress) or stop
+        return stop
+
+
+class AllOf(AnyOf):
+    """Stop only when every policy asks to."""
+
+    def should_stop(self, progress):
+        stop = True
+        for policy in self.policies:
+            stop = policy.should_stop(progress) and stop
+        return stop
+
+
+class CallbackData:
+    """Data passed to termination_callback: the policy and the reused snapshot."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.progress = Progress()
+        self.stopped_at = None
+
+
+def termination_callback(model, where, *, cbdata):
+    if where != GRB.Callback.MIP:
+        return
+    progress = cbdata.progress
+    progress.poll(model)
+    if cbdata.policy.should_stop(progress):
+        cbdata.stopped_at = progress.runtime
+        model.terminate()
+
+
+def attach(model, policy):
+    """
+    Reset policy for a new solve of model and return the callback to pass to
+    model.optimize() (or to combine with other callbacks).
+    """
+    # Pending changes (such as ModelSense) are only visible after an update
+    model.update()
+    policy.reset(model)
+    return partial(termination_callback, cbdata=CallbackData(policy))
+
+
+def optimize(model, policy=None, *callbacks):
+    """
+    Optimize model, stopping when policy asks to; extra callbacks are called
+    first, in order, at every callback invocation.
+    """
+    if policy is not None:
+        callbacks = callbacks + (attach(model, policy),)
+    if not callbacks:
+        model.optimize()
+        return
+    model.optimize(enchainer_callbacks(*callbacks))
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Les modules du dépôt sont à la racine, sans paquet
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generateur import generer_instance  # noqa: E402
+
+
+@pytest.fixture
+def fichier_instance(tmp_path):
+    """
+    Fabrique d'instances synthétiques (generateur.generer_instance) écrites
+    dans le dossier temporaire du test.
+    """
+    def generer(nombre_photos, graine=0, **options):
+        chemin = tmp_path / f"instance-{nombre_photos}-{graine}.txt"
+        generer_instance(str(chemin), nombre_photos, graine=graine, **options)
+        return str(chemin)
+    return generer
+
+
+@pytest.fixture(scope="session")
+def env():
+    """Environnement Gurobi silencieux partagé par les tests."""
+    gp = pytest.importorskip("gurobipy")
+    with gp.Env(params={"OutputFlag": 0}) as env:
+        yield env
+
+
+@pytest.fixture
+def small_mkp(env):
+    """
+    Fabrique de petits sacs à dos multidimensionnels binaires (n objets, m
+    contraintes de capacité), partagée par les tests des exemples Gurobi.
+    Plusieurs lignes de capacité : la résolution passe par les callbacks MIP.
+    """
+    gp = pytest.importorskip("gurobipy")
+
+    def construire(n=40, m=5, seed=0, sense=gp.GRB.MAXIMIZE):
+        rng = np.random.default_rng(seed)
+        model = gp.Model("small_mkp", env=env)
+        profits = rng.integers(10, 100, n)
+        x = model.addMVar(n, vtype=gp.GRB.BINARY, obj=profits if sense == gp.GRB.MAXIMIZE else -profits, name="x")
+        model.addConstr(rng.integers(10, 100, (m, n)) @ x <= 25 * n, name="capacity")
+        model.ModelSense = sense
+        return model
+    return construire
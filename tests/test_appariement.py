@@ -0,0 +1,55 @@
+import random
+
+from appariement import apparier_glouton, raffiner_paires_mip
+from stockage import MagasinPhotos
+
+
+def magasin_verticales(nombre_photos, graine=0, vocabulaire=10):
+    aleatoire = random.Random(graine)
+    photos = MagasinPhotos()
+    ensembles = []
+    for _ in range(nombre_photos):
+        etiquettes = {f"t{aleatoire.randrange(vocabulaire)}" for _ in range(aleatoire.randint(1, 5))}
+        photos.ajouter("V", etiquettes)
+        ensembles.append(etiquettes)
+    return photos, ensembles
+
+
+def couplages(photos):
+    if not photos:
+        yield []
+        return
+    premiere, reste = photos[0], photos[1:]
+    for k, partenaire in enumerate(reste):
+        for suite in couplages(reste[:k] + reste[k + 1:]):
+            yield [(premiere, partenaire)] + suite
+
+
+def etiquettes_totales(ensembles, paires):
+    return sum(len(ensembles[p] | ensembles[q]) for p, q in paires)
+
+
+def test_chaque_verticale_une_fois():
+    photos, _ = magasin_verticales(40, graine=1)
+    paires = apparier_glouton(photos, range(40), fenetre=5)
+    assert sorted(photo for paire in paires for photo in paire) == list(range(40))
+
+
+def test_nombre_impair_laisse_la_plus_pauvre():
+    photos, ensembles = magasin_verticales(21, graine=2)
+    paires = apparier_glouton(photos, range(21))
+    utilisees = {photo for paire in paires for photo in paire}
+
+    assert len(paires) == 10 and len(utilisees) == 20
+    seule = (set(range(21)) - utilisees).pop()
+    assert len(ensembles[seule]) == min(len(e) for e in ensembles)
+
+
+def test_raffinement_mip_optimal_sur_un_bloc(env):
+    photos, ensembles = magasin_verticales(8, graine=3, vocabulaire=6)
+    paires = apparier_glouton(photos, range(8), fenetre=1)
+    raffinees = raffiner_paires_mip(photos, paires, taille_bloc=4, env=env)
+
+    assert sorted(photo for paire in raffinees for photo in paire) == list(range(8))
+    meilleur = max(etiquettes_totales(ensembles, c) for c in couplages(list(range(8))))
+    assert etiquettes_totales(ensembles, raffinees) == meilleur >= etiquettes_totales(ensembles, paires)
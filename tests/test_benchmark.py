@@ -0,0 +1,42 @@
+import pytest
+
+from benchmark import executer_benchmark
+from generateur import generer_instance
+from lecture import lire_photos
+
+
+def test_generateur_deterministe(tmp_path):
+    premier, second, autre = (str(tmp_path / nom) for nom in ("a.txt", "b.txt", "c.txt"))
+    generer_instance(premier, 200, graine=3)
+    generer_instance(second, 200, graine=3)
+    generer_instance(autre, 200, graine=4)
+
+    with open(premier) as a, open(second) as b, open(autre) as c:
+        contenu = a.read()
+        assert contenu == b.read()
+        assert contenu != c.read()
+
+
+def test_generateur_respecte_les_options(tmp_path):
+    fichier = str(tmp_path / "instance.txt")
+    generer_instance(fichier, 100, ratio_horizontal=1.0, nombre_etiquettes=20, etiquettes_par_photo=(2, 5))
+
+    photos = list(lire_photos(fichier))
+    assert len(photos) == 100
+    for _, orientation, etiquettes in photos:
+        assert orientation == b"H"
+        assert 1 <= len(etiquettes) <= 5 and len(set(etiquettes)) == len(etiquettes)
+        assert all(0 <= int(e[1:]) < 20 for e in etiquettes)
+
+
+def test_benchmark_phases_et_score(fichier_instance, capsys):
+    pytest.importorskip("gurobipy")
+    fichier = fichier_instance(150, graine=13)
+    resultats = executer_benchmark([fichier], budget_recherche_locale=0.1, memoire=False)
+
+    (instance,) = resultats["instances"]
+    assert instance["nombre_photos"] == 150
+    for nom, programme in instance["programmes"].items():
+        assert {"lecture", "ordonnancement", "ecriture"} <= set(programme["phases"]), nom
+        assert set(programme["verification"]) == {"lecture_entree", "lecture_solution", "validation", "score"}
+        assert isinstance(programme["score"], int) and programme["score"] > 0
@@ -0,0 +1,39 @@
+import pytest
+
+from appariement import charger_diapositives
+from decomposition import LIMITE_LICENCE, TAILLE_GRAPPE, optimiser_diaporama_decompose, partitionner, recoller
+from modele_creux import TOP_K
+from stockage import MagasinPhotos, construire_diapositives, ordre_vers_sequence
+
+
+def test_taille_grappe_sous_la_licence():
+    # Au plus top_k arêtes par diapositive : 2 |E| + 2 n variables
+    assert 2 * TAILLE_GRAPPE * TOP_K + 2 * TAILLE_GRAPPE <= LIMITE_LICENCE
+
+
+def test_partitionner_couvre_tout(fichier_instance):
+    diapositives = charger_diapositives(fichier_instance(250, graine=10))
+    grappes = partitionner(diapositives, taille_grappe=40)
+
+    assert all(len(grappe) <= 40 for grappe in grappes)
+    assert sorted(i for grappe in grappes for i in grappe) == list(range(len(diapositives)))
+
+
+def test_recoller_inverse_le_chemin_le_mieux_relie():
+    photos = MagasinPhotos()
+    for etiquettes in (["a", "b"], ["b", "c"], ["x", "y"], ["c", "d"]):
+        photos.ajouter("H", etiquettes)
+    diapositives = construire_diapositives(photos, range(4), [])
+
+    # Le second chemin se termine par la diapositive qui partage « c » avec 1
+    assert recoller(diapositives, [[0, 1], [2, 3]]) == [0, 1, 3, 2]
+    assert recoller(diapositives, []) == []
+
+
+def test_decomposition_sans_echec(fichier_instance):
+    pytest.importorskip("gurobipy")
+    diapositives = charger_diapositives(fichier_instance(200, graine=11))
+    ordre, echecs = optimiser_diaporama_decompose(diapositives, taille_grappe=40, limite_temps=5, processus=2)
+
+    assert echecs == 0
+    assert sorted(ordre_vers_sequence(ordre)) == list(range(len(diapositives)))
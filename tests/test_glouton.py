@@ -0,0 +1,50 @@
+from appariement import charger_diapositives
+from glouton import construire_diaporama_glouton, ordonner_glouton
+from stockage import MagasinPhotos, construire_diapositives, ordre_vers_sequence
+
+
+def test_ordre_glouton_est_une_permutation(fichier_instance):
+    diapositives, ordre = construire_diaporama_glouton(fichier_instance(300, graine=3))
+    sequence = ordre_vers_sequence(ordre)
+    assert sorted(sequence) == list(range(len(diapositives)))
+
+
+def test_chaque_pas_prend_la_meilleure_suivante(fichier_instance):
+    diapositives = charger_diapositives(fichier_instance(80, graine=4))
+    # Sans limite de candidates, le glouton est exact à chaque pas
+    sequence = ordre_vers_sequence(ordonner_glouton(diapositives, max_candidats=10**9))
+
+    restantes = set(range(len(diapositives))) - {sequence[0]}
+    for courant, suivante in zip(sequence, sequence[1:]):
+        meilleur = max(diapositives.interet(courant, j) for j in restantes)
+        assert diapositives.interet(courant, suivante) == meilleur
+        restantes.remove(suivante)
+
+
+def test_sans_etiquette_commune_et_vide():
+    photos = MagasinPhotos()
+    for etiquette in ("a", "b", "c"):
+        photos.ajouter("H", [etiquette])
+    diapositives = construire_diapositives(photos, range(3), [])
+
+    assert sorted(ordre_vers_sequence(ordonner_glouton(diapositives))) == [0, 1, 2]
+    assert ordonner_glouton(construire_diapositives(MagasinPhotos(), [], [])) == []
+
+
+def test_budget_epuise_note_sur_les_comptes_complets():
+    photos = MagasinPhotos()
+    for etiquettes in (["a", "b", "c", "d"], ["a", "b", "x", "y"], ["a", "z", "w"]):
+        photos.ajouter("H", etiquettes)
+    diapositives = construire_diapositives(photos, range(3), [])
+
+    # Le budget de deux entrées s'épuise sur la liste de « a » : chaque candidate
+    # n'y a qu'une étiquette commune, mais 1 en partage deux avec 0 (intérêt 2 contre 1)
+    sequence = ordre_vers_sequence(ordonner_glouton(diapositives, max_candidats=2))
+    assert sequence[:2] == [0, 1]
+
+
+def test_budget_limite_reste_une_permutation(fichier_instance):
+    diapositives = charger_diapositives(fichier_instance(200, graine=15))
+    for max_candidats in (1, 5, 10**9):
+        sequence = ordre_vers_sequence(ordonner_glouton(diapositives, max_candidats=max_candidats))
+        assert sorted(sequence) == list(range(len(diapositives)))
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+gp = pytest.importorskip("gurobipy")
+from gurobipy import GRB  # noqa: E402
+
+from knapsasck import (  # noqa: E402
+    _build_knapsack_model_dicts,
+    _solve_instance,
+    build_knapsack_model,
+    dantzig_bound,
+    generate_knapsack,
+    integer_scale,
+    reduce_knapsack,
+    solve_knapsack,
+    solve_knapsack_batch,
+    solve_knapsack_dp,
+)
+
+
+def solve(model):
+    with model:
+        model.optimize()
+        return model.ObjVal
+
+
+def test_array_builder_matches_the_dict_builder(env):
+    for seed in range(5):
+        instance = generate_knapsack(30, seed)
+        assert solve(build_knapsack_model(env, *instance)[0]) == pytest.approx(
+            solve(_build_knapsack_model_dicts(env, *instance)[0])
+        )
+
+
+def test_multidimensional_builder(env):
+    values, weights, capacity = generate_knapsack(25, seed=3, dimensions=3)
+    model, x = build_knapsack_model(env, values, weights, capacity)
+    with model:
+        model.optimize()
+        assert model.NumConstrs == 3 and model.Status == GRB.OPTIMAL
+        assert np.all(weights @ x.X <= capacity + 1e-6)
+
+
+def test_batch_matches_individual_solves(env):
+    instances = [generate_knapsack(40, seed) for seed in range(12)]
+    expected = [solve(build_knapsack_model(env, *instance)[0]) for instance in instances]
+
+    for processes in (None, 2):
+        objectives, statuses, runtimes, selected = solve_knapsack_batch(instances, env=env, processes=processes, chunksize=4)
+        assert objectives == pytest.approx(expected)
+        assert np.all(statuses == GRB.OPTIMAL) and np.all(runtimes >= 0)
+        for (values, weights, capacity), mask, objective in zip(instances, selected, objectives):
+            assert values[mask].sum() == pytest.approx(objective)
+            assert weights[mask].sum() <= capacity + 1e-6
+
+
+def test_batch_without_solution_reports_nan(env):
+    values, weights, capacity = generate_knapsack(30, seed=1)
+    objectives, statuses, _, selected = solve_knapsack_batch([(values, weights, -1.0)], env=env)
+    assert np.isnan(objectives[0]) and statuses[0] == GRB.INFEASIBLE and not selected[0].any()
+
+
+def brute_force(values, weights, capacity):
+    masks = ((np.arange(2 ** len(values))[:, None] >> np.arange(len(values))) & 1).astype(bool)
+    feasible = masks @ weights <= capacity + 1e-9
+    return (masks[feasible] @ values).max()
+
+
+def test_dp_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        values = rng.uniform(1, 25, 12)
+        weights = rng.integers(1, 30, 12)
+        capacity = int(0.5 * weights.sum())
+        objective, selected = solve_knapsack_dp(values, weights, capacity)
+        assert objective == pytest.approx(brute_force(values, weights, capacity))
+        assert values[selected].sum() == pytest.approx(objective) and weights[selected].sum() <= capacity
+
+
+def test_dantzig_bound_and_reduction_keep_the_optimum():
+    for seed in range(20):
+        values, weights, capacity = generate_knapsack(14, seed)
+        optimum = brute_force(values, weights, capacity)
+        bound, greedy, _ = dantzig_bound(values, weights, capacity)
+        assert weights[greedy].sum() <= capacity
+        assert values[greedy].sum() <= optimum <= bound + 1e-9
+
+        # Fixing the items outside the core and solving the core gives the optimum back
+        _, fixed, core = reduce_knapsack(values, weights, capacity)
+        assert not (fixed & core).any()
+        residual = capacity - weights[fixed].sum()
+        core_optimum = brute_force(values[core], weights[core], residual) if core.any() else 0.0
+        assert values[fixed].sum() + core_optimum == pytest.approx(optimum)
+
+
+def test_integer_scale():
+    assert integer_scale(np.array([3.0, 7.0])) == 1
+    assert integer_scale(np.array([0.5, 1.25])) == 100
+    assert integer_scale(np.array([0.1234, 1.0])) is None
+
+
+@pytest.mark.parametrize("decimals", [None, 0, 1])
+def test_solve_knapsack_matches_gurobi(env, decimals):
+    methods = set()
+    for num_items in (10, 100, 1000):
+        for seed in range(3):
+            instance = generate_knapsack(num_items, seed, decimals=decimals)
+            objective, selected, method = solve_knapsack(*instance, env=env)
+            reference = _solve_instance(env, instance, mip_gap=0.0)[0]
+            assert objective == pytest.approx(reference, rel=1e-9)
+            assert instance[1][selected].sum() <= instance[2] + 1e-6
+            methods.add(method)
+    # Weights with few decimals scale to integers and reach the dynamic programme
+    if decimals is None:
+        assert "dp" not in methods
+    else:
+        assert "dp" in methods
+
+
+def test_solve_knapsack_multidimensional_goes_to_the_mip(env):
+    values, weights, capacity = generate_knapsack(30, seed=2, dimensions=2)
+    objective, selected, method = solve_knapsack(values, weights, capacity, env=env)
+    assert method == "mip"
+    assert objective == pytest.approx(solve(build_knapsack_model(env, values, weights, capacity)[0]))
+    assert np.all(weights[:, selected].sum(axis=1) <= capacity + 1e-6)
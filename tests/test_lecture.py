@@ -0,0 +1,40 @@
+from lecture import charger_magasin, lire_entete, lire_photos, lire_photos_bloc
+
+
+def lecture_naive(fichier_entree):
+    with open(fichier_entree, "rb") as fichier:
+        lignes = fichier.read().splitlines()
+    return [(i, ligne.split()[0], ligne.split()[2:]) for i, ligne in enumerate(lignes[1:int(lignes[0]) + 1])]
+
+
+def test_flux_et_bloc_comme_lecture_naive(fichier_instance):
+    fichier = fichier_instance(200, graine=1)
+    attendu = lecture_naive(fichier)
+
+    assert lire_entete(fichier) == 200
+    assert list(lire_photos(fichier)) == attendu
+    assert list(lire_photos_bloc(fichier)) == attendu
+
+
+def test_photo_sans_etiquette_et_sans_fin_de_ligne(tmp_path):
+    fichier = tmp_path / "bord.txt"
+    fichier.write_bytes(b"3\nH 0\nV 2 a b\nV 1 c")
+    attendu = [(0, b"H", []), (1, b"V", [b"a", b"b"]), (2, b"V", [b"c"])]
+
+    assert list(lire_photos(str(fichier))) == attendu
+    assert list(lire_photos_bloc(str(fichier))) == attendu
+
+
+def test_charger_magasin_modes_identiques(fichier_instance):
+    fichier = fichier_instance(150, graine=2)
+    photos_flux, horizontales_flux, verticales_flux = charger_magasin(fichier, "flux")
+    photos_bloc, horizontales_bloc, verticales_bloc = charger_magasin(fichier, "bloc")
+
+    assert list(horizontales_flux) == list(horizontales_bloc)
+    assert list(verticales_flux) == list(verticales_bloc)
+    assert sorted(list(horizontales_flux) + list(verticales_flux)) == list(range(150))
+    assert photos_flux.etiquettes == photos_bloc.etiquettes
+    assert photos_flux.debuts == photos_bloc.debuts
+    for ident, orientation, etiquettes in lecture_naive(fichier):
+        assert photos_flux.orientation(ident) == orientation.decode()
+        assert photos_flux.nombre_etiquettes(ident) == len(set(etiquettes))
@@ -0,0 +1,68 @@
+import numpy as np
+
+from appariement import charger_diapositives
+from matrice_interet import (
+    CacheInteret,
+    interet_dicts,
+    interet_depuis_incidence,
+    interet_diapositives,
+    incidence_ensembles,
+    taille_octets,
+)
+
+
+def test_interet_comme_les_diapositives(fichier_instance):
+    diapositives = charger_diapositives(fichier_instance(90, graine=9))
+    n = len(diapositives)
+    attendu = np.array([[diapositives.interet(i, j) if i != j else 0 for j in range(n)] for i in range(n)])
+
+    cache = CacheInteret()
+    dense = interet_diapositives(diapositives, dense=True, cache=cache)
+    creuse = interet_diapositives(diapositives, dense=False, cache=cache)
+    assert np.array_equal(dense, attendu)
+    assert np.array_equal(creuse.toarray(), attendu)
+
+    indices = [5, 0, 17, 3]
+    bloc = interet_diapositives(diapositives, indices, dense=True, cache=cache)
+    assert np.array_equal(bloc, attendu[np.ix_(indices, indices)])
+
+
+def test_ensembles_et_bloc_sans_etiquette():
+    ensembles = [{"a", "b", "c"}, {"b", "c", "d", "e"}, set(), {"a"}]
+    interets = interet_depuis_incidence(incidence_ensembles(ensembles), dense=True)
+    assert interets.tolist() == [[0, 1, 0, 0], [1, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]]
+
+    vide = interet_depuis_incidence(incidence_ensembles([set(), set()]), dense=True)
+    assert vide.tolist() == [[0, 0], [0, 0]]
+
+
+def test_cache_succes_et_echecs():
+    cache = CacheInteret()
+    elements = [{"etiquettes": {"a", "b"}}, {"etiquettes": {"b", "c"}}]
+    premiere = interet_dicts(elements, dense=True, cache=cache)
+    seconde = interet_dicts([dict(e) for e in elements], dense=True, cache=cache)
+
+    assert seconde is premiere
+    assert (cache.succes, cache.echecs) == (1, 1)
+    interet_dicts(elements + [{"etiquettes": {"a"}}], dense=True, cache=cache)
+    assert cache.echecs == 2
+
+
+def test_cache_borne_en_octets():
+    matrice = np.zeros((10, 10), dtype=np.int32)
+    cache = CacheInteret(capacite=3 * taille_octets(matrice))
+    for cle in range(5):
+        cache.obtenir(cle, lambda: matrice.copy())
+        assert cache.octets <= cache.capacite
+
+    assert list(cache.matrices) == [2, 3, 4]
+    cache.obtenir(2, lambda: matrice.copy())
+    cache.obtenir(5, lambda: matrice.copy())
+    assert list(cache.matrices) == [4, 2, 5]
+
+    # Une matrice plus grande que la capacité est rendue sans être gardée
+    cache.obtenir("grande", lambda: np.zeros((40, 40), dtype=np.int32))
+    assert "grande" not in cache.matrices
+
+    cache.vider()
+    assert cache.octets == 0 and not cache.matrices
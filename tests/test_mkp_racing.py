@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("gurobipy")
+
+from mkp_racing import race  # noqa: E402
+
+
+@pytest.fixture
+def small_mkp_file(tmp_path, small_mkp):
+    with small_mkp() as model:
+        path = str(tmp_path / "small_mkp.mps.bz2")
+        model.write(path)
+        model.optimize()
+        return path, model.ObjVal
+
+
+def test_race_finds_the_optimum(small_mkp_file, tmp_path, monkeypatch):
+    # The model cache is created in the working directory
+    monkeypatch.chdir(tmp_path)
+    path, optimum = small_mkp_file
+    configs = [{}, {"Seed": 1}, {"MIPFocus": 1}]
+
+    results, wall_time, best = race(path, configs, processes=2, target_gap=0.0, time_limit=30.0)
+
+    assert len(results) == 3 and [result["params"] for result in results] == configs
+    assert best == pytest.approx(optimum)
+    assert any(result["proved"] for result in results)
+    for result in results:
+        if not result["skipped"] and result["objective"] is not None:
+            # No configuration reports an objective better than the optimum
+            assert result["objective"] <= optimum + 1e-6
+    assert wall_time < 30.0
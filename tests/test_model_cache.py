@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+gp = pytest.importorskip("gurobipy")
+from model_cache import artifact_paths, read_cached  # noqa: E402
+
+
+def write_mkp(small_mkp, path, seed=0):
+    with small_mkp(n=30, m=4, seed=seed) as model:
+        # A fixed variable, so that presolve has something to remove
+        model.addVar(lb=1, ub=1, obj=5, name="fixed")
+        model.write(path)
+
+
+def statistics(model):
+    model.optimize()
+    return model.NumVars, model.NumConstrs, model.ModelSense, [v.VarName for v in model.getVars()], model.ObjVal
+
+
+def test_cached_model_equals_the_source(tmp_path, env, small_mkp):
+    source = str(tmp_path / "small.mps.bz2")
+    cache_dir = str(tmp_path / "cache")
+    write_mkp(small_mkp, source)
+
+    with gp.read(source, env=env) as model:
+        expected = statistics(model)
+    with read_cached(source, env=env, cache_dir=cache_dir) as first:
+        assert statistics(first) == expected
+    parsed, reduced = artifact_paths(source, cache_dir)
+    assert os.listdir(cache_dir) == [os.path.basename(parsed)]
+    with read_cached(source, env=env, cache_dir=cache_dir) as second:
+        assert statistics(second) == expected
+
+    with read_cached(source, env=env, presolved=True, cache_dir=cache_dir) as presolved:
+        presolved.optimize()
+        assert presolved.NumVars < expected[0]
+    assert sorted(os.listdir(cache_dir)) == sorted(os.path.basename(p) for p in (parsed, reduced))
+
+
+def test_changed_source_replaces_stale_artifacts(tmp_path, env, small_mkp):
+    source = str(tmp_path / "small.mps.bz2")
+    cache_dir = str(tmp_path / "cache")
+    write_mkp(small_mkp, source, seed=0)
+    read_cached(source, env=env, presolved=True, cache_dir=cache_dir).dispose()
+    old = set(os.listdir(cache_dir))
+
+    write_mkp(small_mkp, source, seed=1)
+    with gp.read(source, env=env) as model:
+        expected = statistics(model)
+    with read_cached(source, env=env, cache_dir=cache_dir) as model:
+        assert statistics(model) == expected
+
+    assert os.listdir(cache_dir) == [os.path.basename(artifact_paths(source, cache_dir)[0])]
+    assert not old & set(os.listdir(cache_dir))
+
+
+def test_artifacts_of_other_sources_are_kept(tmp_path, env, small_mkp):
+    # "a-*" used to match the artifacts of "a-b" too, and same-named sources evicted each other
+    (tmp_path / "other").mkdir()
+    sources = [str(tmp_path / "a.mps"), str(tmp_path / "a-b.mps"), str(tmp_path / "other" / "a.mps")]
+    cache_dir = str(tmp_path / "cache")
+    for seed, source in enumerate(sources):
+        write_mkp(small_mkp, source, seed)
+        read_cached(source, env=env, cache_dir=cache_dir).dispose()
+    expected = {os.path.basename(artifact_paths(source, cache_dir)[0]) for source in sources}
+    assert set(os.listdir(cache_dir)) == expected
+
+    # Rewriting one source only replaces its own artifact
+    write_mkp(small_mkp, sources[0], seed=5)
+    read_cached(sources[0], env=env, cache_dir=cache_dir).dispose()
+    expected = {os.path.basename(artifact_paths(source, cache_dir)[0]) for source in sources}
+    assert set(os.listdir(cache_dir)) == expected and len(expected) == 3
@@ -0,0 +1,52 @@
+import itertools
+
+from appariement import charger_diapositives
+from modele_creux import LIMITE_LICENCE, aretes_candidates, budget_aretes, optimiser_diaporama_creux
+from stockage import ordre_vers_sequence, score_sequence
+
+
+def test_budget_aretes_tient_dans_la_licence():
+    for n in (10, 107, 400, 999):
+        aretes = budget_aretes(n)
+        assert 2 * aretes + 2 * n <= LIMITE_LICENCE
+        assert aretes + 2 * n + 1 <= LIMITE_LICENCE
+    assert budget_aretes(1200) == 0
+    assert budget_aretes(5000, None) is None
+
+
+def test_aretes_candidates_garde_les_plus_fortes(fichier_instance):
+    diapositives = charger_diapositives(fichier_instance(60, graine=5))
+    toutes = aretes_candidates(diapositives, top_k=None)
+    gardees = aretes_candidates(diapositives, top_k=None, max_aretes=25)
+
+    assert len(gardees) == 25
+    assert all(toutes[arete] == interet for arete, interet in gardees.items())
+    assert min(gardees.values()) >= max(interet for arete, interet in toutes.items() if arete not in gardees)
+    for (i, j), interet in toutes.items():
+        assert i < j and interet == diapositives.interet(i, j) > 0
+
+
+def test_optimum_egal_a_la_force_brute(fichier_instance, env):
+    diapositives = charger_diapositives(fichier_instance(7, graine=6, ratio_horizontal=1.0))
+    sequence = ordre_vers_sequence(optimiser_diaporama_creux(diapositives, top_k=None, env=env))
+
+    assert sorted(sequence) == list(range(7))
+    meilleur = max(score_sequence(diapositives, permutation) for permutation in itertools.permutations(range(7)))
+    assert score_sequence(diapositives, sequence) == meilleur
+
+
+def test_instance_moyenne_sous_la_licence(fichier_instance, env):
+    # 150 photos : le modèle à dix voisines par diapositive dépassait la licence
+    diapositives = charger_diapositives(fichier_instance(150))
+    sequence = ordre_vers_sequence(optimiser_diaporama_creux(diapositives, limite_temps=20, env=env))
+    assert sorted(sequence) == list(range(len(diapositives)))
+
+
+def test_muet_sauf_en_mode_verbeux(fichier_instance, env, capsys):
+    # La décomposition résout un modèle par grappe : rien ne doit s'afficher par défaut
+    diapositives = charger_diapositives(fichier_instance(30, graine=7))
+    muet = optimiser_diaporama_creux(diapositives, env=env)
+    assert capsys.readouterr().out == ""
+
+    assert optimiser_diaporama_creux(diapositives, env=env, verbeux=True) == muet
+    assert capsys.readouterr().out.startswith(f"Modèle creux : {len(diapositives)} diapositives")
@@ -0,0 +1,130 @@
+import itertools
+from functools import partial
+
+import numpy as np
+import pytest
+
+gp = pytest.importorskip("gurobipy")
+from gurobipy import GRB  # noqa: E402
+
+from modele_diaporama import (  # noqa: E402
+    construire_modele_couplage,
+    construire_modele_couplage_quicksum,
+    construire_modele_diaporama,
+    construire_modele_diaporama_quicksum,
+    couplage_glouton_interets,
+    fixer_depart_couplage,
+    fixer_depart_tournee,
+    interets_aleatoires,
+    ordre_glouton_interets,
+    paires_depuis_solution,
+    sequence_depuis_solution,
+    sequence_depuis_valeurs,
+)
+from sous_tours import DonneesSousTours, callback_sous_tours  # noqa: E402
+
+
+def score(interets, sequence):
+    return sum(interets[i, j] for i, j in zip(sequence, sequence[1:]))
+
+
+def resoudre_tournee(interets, env):
+    n = len(interets)
+    modele, Z, arcs = construire_modele_diaporama(interets, env)
+    modele.setParam("LazyConstraints", 1)
+    modele.optimize(partial(callback_sous_tours, cbdata=DonneesSousTours(arcs, noeud_autorise=n, variables=Z)))
+    return modele, sequence_depuis_valeurs(arcs, Z.X, n)
+
+
+@pytest.mark.parametrize("constructeurs", [
+    (construire_modele_diaporama_quicksum, construire_modele_diaporama),
+    (construire_modele_couplage_quicksum, construire_modele_couplage),
+])
+def test_matriciel_comme_quicksum(constructeurs, env):
+    interets = interets_aleatoires(np.random.default_rng(seed=1), 12, nombre_etiquettes=30)
+    resultats = []
+    for constructeur in constructeurs:
+        modele = constructeur(interets, env)[0]
+        with modele:
+            modele.optimize()
+            resultats.append((modele.NumVars, modele.NumConstrs, modele.ModelSense, round(modele.ObjVal)))
+    assert resultats[0] == resultats[1]
+
+
+def test_tournee_optimale_comme_la_force_brute(env):
+    interets = interets_aleatoires(np.random.default_rng(seed=2), 6, etiquettes_par_diapositive=4, nombre_etiquettes=12)
+    modele, sequence = resoudre_tournee(interets, env)
+
+    assert modele.Status == GRB.OPTIMAL and sorted(sequence) == list(range(6))
+    meilleur = max(score(interets, permutation) for permutation in itertools.permutations(range(6)))
+    assert score(interets, sequence) == meilleur == round(modele.ObjVal)
+
+
+def test_couplage_optimal_comme_la_force_brute(env):
+    interets = interets_aleatoires(np.random.default_rng(seed=3), 7, etiquettes_par_diapositive=4, nombre_etiquettes=12)
+    modele, X, (premiers, seconds) = construire_modele_couplage(interets, env)
+    modele.optimize()
+
+    choisies = np.flatnonzero(X.X > 0.5)
+    photos = np.concatenate([premiers[choisies], seconds[choisies]])
+    assert len(choisies) == 3 and len(set(photos.tolist())) == 6
+    meilleur = max(
+        sum(interets[i, j] for i, j in zip(ordre[0:6:2], ordre[1:6:2])) for ordre in itertools.permutations(range(7))
+    )
+    assert round(modele.ObjVal) == meilleur
+
+
+def test_depart_tournee_relu_a_l_identique(env):
+    interets = interets_aleatoires(np.random.default_rng(seed=4), 9)
+    modele, Z, arcs = construire_modele_diaporama(interets, env)
+
+    sequence = ordre_glouton_interets(interets)
+    assert sorted(sequence) == list(range(9))
+    fixer_depart_tournee(Z, 9, sequence)
+    modele.update()
+    assert sequence_depuis_valeurs(arcs, Z.Start, 9) == sequence
+
+    # Les diapositives absentes de la séquence sont ajoutées à la fin
+    fixer_depart_tournee(Z, 9, [4, 2])
+    modele.update()
+    assert sequence_depuis_valeurs(arcs, Z.Start, 9) == [4, 2, 0, 1, 3, 5, 6, 7, 8]
+    modele.dispose()
+
+
+def test_depart_couplage_complet(env):
+    interets = interets_aleatoires(np.random.default_rng(seed=5), 9)
+    modele, X, (premiers, seconds) = construire_modele_couplage(interets, env)
+
+    paires = couplage_glouton_interets(interets)
+    assert len(paires) == 4 and len({photo for paire in paires for photo in paire}) == 8
+    fixer_depart_couplage(X, 9, paires)
+    modele.update()
+    depart = np.flatnonzero(X.Start > 0.5)
+    assert sorted(zip(premiers[depart].tolist(), seconds[depart].tolist())) == sorted(paires)
+
+    # Paires incomplètes ou en conflit : le départ forme quand même n // 2 paires
+    fixer_depart_couplage(X, 9, [(5, 1), (1, 3)])
+    modele.update()
+    depart = np.flatnonzero(X.Start > 0.5)
+    assert sorted(zip(premiers[depart].tolist(), seconds[depart].tolist())) == [(0, 2), (1, 5), (3, 4), (6, 7)]
+    modele.dispose()
+
+
+def test_depart_glouton_accepte_par_gurobi(env):
+    interets = interets_aleatoires(np.random.default_rng(seed=6), 8)
+    modele, Z, arcs = construire_modele_diaporama(interets, env)
+    fixer_depart_tournee(Z, 8, ordre_glouton_interets(interets))
+    modele.setParam("LazyConstraints", 1)
+    modele.setParam("SolutionLimit", 1)
+    modele.optimize(partial(callback_sous_tours, cbdata=DonneesSousTours(arcs, noeud_autorise=8, variables=Z)))
+
+    assert round(modele.ObjVal) >= score(interets, ordre_glouton_interets(interets))
+    modele.dispose()
+
+
+def test_relire_une_solution():
+    diapositives = [{"ids": [0]}, {"ids": [3, 1]}, {"ids": [2]}, {"ids": [5, 4]}]
+    assert sequence_depuis_solution(diapositives, [[2], [1, 3], [9], [4, 5], [0]]) == [2, 1, 3, 0]
+
+    verticales = [{"id": 1}, {"id": 3}, {"id": 4}, {"id": 5}]
+    assert paires_depuis_solution(verticales, [[0], [3, 1], [4, 5], [4, 9]]) == [(1, 0), (2, 3)]
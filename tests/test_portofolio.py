@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+gp = pytest.importorskip("gurobipy")
+from gurobipy import GRB  # noqa: E402
+
+from portofolio import build_portfolio_model, efficient_frontier, load_portfolio  # noqa: E402
+
+# The size-limited licence caps quadratic models at 200 variables: keep a sub-portfolio
+NUM_ASSETS, MAX_ASSETS = 8, 3
+
+
+@pytest.fixture(scope="module")
+def portfolio():
+    sigma, mu, _, _ = load_portfolio()
+    return sigma[:NUM_ASSETS, :NUM_ASSETS], mu[:NUM_ASSETS]
+
+
+def cold_risks(sigma, mu, targets, env):
+    risks = []
+    for target in targets:
+        with build_portfolio_model(sigma, mu, MAX_ASSETS, target, env) as model:
+            model.Params.MIPGap = 0.0
+            model.optimize()
+            risks.append(model.ObjVal if model.SolCount > 0 else np.nan)
+    return np.array(risks)
+
+
+def test_frontier_matches_cold_solves(portfolio, env):
+    sigma, mu = portfolio
+    # The last target is above every asset's return: infeasible
+    targets = np.append(np.linspace(mu.min(), mu.max(), 9), mu.max() * 1.1)
+    frontier = efficient_frontier(sigma, mu, MAX_ASSETS, targets)
+
+    assert frontier.index.tolist() == sorted(targets.tolist())
+    assert frontier["risk"].to_numpy() == pytest.approx(cold_risks(sigma, mu, frontier.index, env), rel=1e-3, nan_ok=True)
+    assert np.isnan(frontier["risk"].iloc[-1]) and frontier["status"].iloc[-1] == GRB.INFEASIBLE
+
+    weights = frontier.filter(like="asset_").dropna().to_numpy()
+    assert weights.sum(axis=1) == pytest.approx(1.0)
+    assert np.all(np.count_nonzero(weights > 1e-6, axis=1) <= MAX_ASSETS)
+    solved = frontier.dropna()
+    assert np.all(solved["return"].to_numpy() >= solved.index.to_numpy() - 1e-6)
+    # Risk never decreases as the target return rises
+    assert np.all(np.diff(solved["risk"].to_numpy()) >= -1e-6 * solved["risk"].max())
+
+
+def test_parallel_and_cold_sweeps_agree(portfolio):
+    sigma, mu = portfolio
+    targets = np.linspace(mu.min(), mu.max(), 8)
+    frontier = efficient_frontier(sigma, mu, MAX_ASSETS, targets)
+
+    for options in ({"processes": 2}, {"warm_start": False}):
+        other = efficient_frontier(sigma, mu, MAX_ASSETS, targets, **options)
+        assert other.index.tolist() == frontier.index.tolist()
+        assert other["risk"].to_numpy() == pytest.approx(frontier["risk"].to_numpy(), rel=1e-3)
+
+
+def test_zero_time_limit_gives_nan_rows(portfolio):
+    sigma, mu = portfolio
+    targets = np.linspace(mu.min(), mu.max(), 4)
+    frontier = efficient_frontier(sigma, mu, MAX_ASSETS, targets, time_limit=0)
+
+    assert len(frontier) == 4
+    assert frontier["risk"].isna().all()
+    assert (frontier["status"] == GRB.TIME_LIMIT).all()
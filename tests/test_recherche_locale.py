@@ -0,0 +1,63 @@
+from appariement import charger_diapositives
+from recherche_locale import RechercheLocale, ameliorer_ordre
+from stockage import ordre_vers_sequence, score_sequence, sequence_vers_ordre
+
+
+def photos_utilisees(diapositives, sequence):
+    photos = []
+    for i in sequence:
+        photos.extend(diapositives.ids(i))
+    return sorted(photos)
+
+
+def test_delta_egal_au_score_recalcule(fichier_instance):
+    diapositives = charger_diapositives(fichier_instance(120, graine=7))
+    recherche = RechercheLocale(diapositives, range(len(diapositives)), fenetre=10, graine=1)
+    photos = photos_utilisees(diapositives, recherche.sequence)
+
+    for mouvement in recherche.mouvements:
+        for _ in range(300):
+            avant = score_sequence(diapositives, recherche.sequence)
+            sequence_avant = list(recherche.sequence)
+            delta = mouvement()
+            apres = score_sequence(diapositives, recherche.sequence)
+            if delta >= 0:
+                assert apres - avant == delta
+            else:
+                assert recherche.sequence == sequence_avant and apres == avant
+            assert recherche.score == apres
+    assert sorted(recherche.sequence) == list(range(len(diapositives)))
+    assert photos_utilisees(diapositives, recherche.sequence) == photos
+
+
+def test_ameliorer_ordre_ne_degrade_pas(fichier_instance):
+    diapositives = charger_diapositives(fichier_instance(150, graine=8))
+    ordre = sequence_vers_ordre(list(range(len(diapositives))))
+    initial = score_sequence(diapositives, ordre_vers_sequence(ordre))
+
+    nouvel_ordre, journal = ameliorer_ordre(diapositives, ordre, budget_secondes=0.2)
+    sequence = ordre_vers_sequence(nouvel_ordre)
+
+    assert sorted(sequence) == list(range(len(diapositives)))
+    assert journal[0][1] == initial
+    assert score_sequence(diapositives, sequence) == journal[-1][1] >= initial
+
+
+def test_compactage_pendant_la_recherche(fichier_instance, monkeypatch):
+    # Que des verticales : les échanges de partenaires acceptés font grossir le tableau d'étiquettes
+    diapositives = charger_diapositives(fichier_instance(80, graine=9, ratio_horizontal=0.0))
+    tailles = []
+    compacter = type(diapositives).compacter
+
+    def compacter_mesure(magasin):
+        tailles.append(len(magasin.etiquettes))
+        compacter(magasin)
+
+    monkeypatch.setattr(type(diapositives), "compacter", compacter_mesure)
+    recherche = RechercheLocale(diapositives, range(len(diapositives)), graine=2)
+    recherche.executer(budget_secondes=0.3)
+
+    # Compacté en cours de route, et pas seulement à la fin
+    assert len(tailles) > 1
+    assert diapositives.mortes == 0 and len(diapositives.etiquettes) == sum(diapositives.longueurs)
+    assert score_sequence(diapositives, recherche.sequence) == recherche.score
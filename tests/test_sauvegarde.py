@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+import projet
+import slideshow
+import slideshow2
+from appariement import charger_diapositives
+from modele_creux import optimiser_diaporama_creux
+from reglages import SEUIL_CREUX, Reglages
+from sauvegarde import ecrire_diaporama_atomique, enchainer_callbacks
+from stockage import score_sequence
+from verify import lire_fichier_entree, lire_fichier_solution, valider_diaporama
+
+
+def test_ecriture_atomique_sans_fichier_temporaire(tmp_path):
+    sortie = tmp_path / "diaporama.sol"
+    ecrire_diaporama_atomique(str(sortie), [[0], [2, 1]])
+    assert sortie.read_text() == "2\n0\n2 1\n"
+
+    ecrire_diaporama_atomique(str(sortie), [[3]])
+    assert sortie.read_text() == "1\n3\n"
+    assert os.listdir(tmp_path) == ["diaporama.sol"]
+
+
+def test_echec_d_ecriture_garde_l_ancien_fichier(tmp_path):
+    sortie = tmp_path / "diaporama.sol"
+    ecrire_diaporama_atomique(str(sortie), [[0], [1]])
+
+    with pytest.raises(TypeError):
+        ecrire_diaporama_atomique(str(sortie), [[2], None])
+    assert sortie.read_text() == "2\n0\n1\n"
+    assert os.listdir(tmp_path) == ["diaporama.sol"]
+
+
+def test_enchainer_callbacks_dans_l_ordre():
+    appels = []
+    callback = enchainer_callbacks(
+        lambda model, where: appels.append(("a", where)), lambda model, where: appels.append(("b", where))
+    )
+    callback(None, 1)
+    callback(None, 2)
+    assert appels == [("a", 1), ("b", 1), ("a", 2), ("b", 2)]
+
+
+@pytest.mark.parametrize("module", [projet, slideshow, slideshow2])
+def test_sortie_d_une_seule_diapositive(module, tmp_path):
+    sortie = tmp_path / "une.sol"
+    module.ecrire_fichier_sortie(str(sortie), [], [{"ids": [4, 7]}])
+    assert sortie.read_text() == "1\n4 7\n"
+
+
+def test_sauvegarde_continue_du_modele_creux(fichier_instance, env, tmp_path):
+    fichier = fichier_instance(60, graine=14)
+    diapositives = charger_diapositives(fichier)
+    sauvegarde = str(tmp_path / "continu.sol")
+    ordre = optimiser_diaporama_creux(diapositives, env=env, fichier_sauvegarde=sauvegarde)
+
+    # Le fichier écrit pendant la résolution est valide et porte la solution finale
+    lignes = lire_fichier_solution(sauvegarde)
+    assert valider_diaporama(lire_fichier_entree(fichier), lignes, len(diapositives)) == []
+    positions = {tuple(diapositives.ids(k)): k for k in range(len(diapositives))}
+    sequence = [positions[tuple(ids)] for ids in lignes]
+    assert score_sequence(diapositives, sequence) == sum(diapositives.interet(i, j) for i, j in ordre)
+
+
+@pytest.mark.parametrize("nombre_photos", [SEUIL_CREUX, 100])
+@pytest.mark.parametrize("module", [projet, slideshow, slideshow2])
+def test_programmes_autour_du_seuil_creux(module, nombre_photos, fichier_instance, tmp_path):
+    # Le modèle complet à SEUIL_CREUX photos tient dans la licence ; au-delà, le modèle creux prend le relais
+    fichier = fichier_instance(nombre_photos, graine=3)
+    sortie = str(tmp_path / "diaporama.sol")
+    module.executer(fichier, sortie, Reglages(budget_recherche_locale=0.5))
+
+    lignes = lire_fichier_solution(sortie)
+    assert valider_diaporama(lire_fichier_entree(fichier), lignes, len(lignes)) == []
@@ -0,0 +1,30 @@
+import numpy as np
+
+from sous_tours import DonneesSousTours, chemin_depuis_fictif, trouver_cycles
+
+
+def test_trouver_cycles():
+    # Chemin 0 -> 1 -> 2, cycle 3 -> 4 -> 3, cycle 5 -> 6 -> 7 -> 5
+    successeurs = {0: 1, 1: 2, 3: 4, 4: 3, 5: 6, 6: 7, 7: 5}
+    cycles = sorted(sorted(cycle) for cycle in trouver_cycles(successeurs))
+    assert cycles == [[3, 4], [5, 6, 7]]
+
+
+def test_cycle_autorise_ignore():
+    successeurs = {0: 1, 1: 2, 2: 0, 3: 4, 4: 3}
+    assert [sorted(cycle) for cycle in trouver_cycles(successeurs, noeud_autorise=0)] == [[3, 4]]
+    assert trouver_cycles({0: 1, 1: 2, 2: 0}, noeud_autorise=2) == []
+
+
+def test_arcs_internes():
+    origines = np.array([0, 1, 2, 0, 3, 2])
+    destinations = np.array([1, 2, 0, 3, 0, 3])
+    donnees = DonneesSousTours((origines, destinations), variables=list(range(6)))
+
+    internes = sorted(donnees.arcs_internes([0, 1, 2]).tolist())
+    assert internes == [0, 1, 2]
+    assert sorted(donnees.arcs_internes([0, 3]).tolist()) == [3, 4]
+
+
+def test_chemin_depuis_fictif():
+    assert chemin_depuis_fictif({9: 2, 2: 0, 0: 1, 1: 9}, 9) == [2, 0, 1]
@@ -0,0 +1,110 @@
+import random
+
+from stockage import (
+    DictionnaireEtiquettes,
+    MagasinPhotos,
+    compter_communes,
+    construire_diapositives,
+    construire_index_inverse,
+    facteur_interet,
+    fusionner,
+    ordre_vers_sequence,
+    score_sequence,
+    sequence_vers_ordre,
+)
+
+
+def interet_ensembles(a, b):
+    communes = len(a & b)
+    return min(communes, len(a) - communes, len(b) - communes)
+
+
+def magasin_aleatoire(nombre_photos, graine=0, vocabulaire=12):
+    aleatoire = random.Random(graine)
+    photos = MagasinPhotos()
+    ensembles = []
+    for _ in range(nombre_photos):
+        etiquettes = {f"t{aleatoire.randrange(vocabulaire)}" for _ in range(aleatoire.randint(1, 6))}
+        photos.ajouter(aleatoire.choice("HV"), etiquettes)
+        ensembles.append(etiquettes)
+    return photos, ensembles
+
+
+def test_encoder_trie_sans_doublon_et_stable():
+    dictionnaire = DictionnaireEtiquettes()
+    premier = dictionnaire.encoder(["chat", "plage", "chat"])
+    second = dictionnaire.encoder(["plage", "soleil"])
+
+    assert list(premier) == sorted(set(premier)) and len(premier) == 2
+    assert dictionnaire.identifiant("plage") in premier
+    assert dictionnaire.identifiant("plage") in second
+    assert len(dictionnaire) == 3
+
+
+def test_communes_et_fusion_comme_les_ensembles():
+    aleatoire = random.Random(1)
+    for _ in range(200):
+        a = sorted(aleatoire.sample(range(30), aleatoire.randint(0, 10)))
+        b = sorted(aleatoire.sample(range(30), aleatoire.randint(0, 10)))
+        assert compter_communes(a, b) == len(set(a) & set(b))
+        assert list(fusionner(a, b)) == sorted(set(a) | set(b))
+        assert facteur_interet(a, b) == interet_ensembles(set(a), set(b))
+
+
+def test_magasin_photos_etiquettes():
+    photos, ensembles = magasin_aleatoire(30)
+    dictionnaire = photos.dictionnaire.identifiants
+
+    assert len(photos) == 30
+    for i, etiquettes in enumerate(ensembles):
+        assert set(photos.etiquettes_de(i)) == {dictionnaire[e] for e in etiquettes}
+        assert photos.nombre_etiquettes(i) == len(etiquettes)
+    assert set(photos.identifiants("H")) | set(photos.identifiants("V")) == set(range(30))
+
+
+def test_interet_diapositives_comme_les_ensembles():
+    photos, ensembles = magasin_aleatoire(40, graine=2)
+    horizontales = photos.identifiants("H")
+    verticales = photos.identifiants("V")
+    paires = list(zip(verticales[::2], verticales[1::2]))
+    diapositives = construire_diapositives(photos, horizontales, paires)
+
+    attendues = [ensembles[h] for h in horizontales] + [ensembles[p] | ensembles[q] for p, q in paires]
+    assert len(diapositives) == len(attendues)
+    for i in range(len(diapositives)):
+        for j in range(len(diapositives)):
+            if i != j:
+                assert diapositives.interet(i, j) == interet_ensembles(attendues[i], attendues[j])
+
+
+def test_remplacer_verticale_puis_compacter():
+    photos, ensembles = magasin_aleatoire(8, graine=3)
+    diapositives = construire_diapositives(photos, [], [(0, 1), (2, 3)])
+    diapositives.remplacer_verticale(0, 0, 2)
+    diapositives.remplacer_verticale(1, 1, 3)
+    avant = [list(diapositives.etiquettes_de(i)) for i in range(2)]
+
+    diapositives.compacter()
+
+    assert [list(diapositives.etiquettes_de(i)) for i in range(2)] == avant
+    assert len(diapositives.etiquettes) == sum(len(e) for e in avant)
+    assert diapositives.ids(0) == [0, 2]
+
+
+def test_index_inverse():
+    photos, _ = magasin_aleatoire(20, graine=4)
+    diapositives = construire_diapositives(photos, range(20), [])
+    index = construire_index_inverse(diapositives)
+    for etiquette, liste in enumerate(index):
+        assert liste == [i for i in range(20) if etiquette in diapositives.etiquettes_de(i)]
+
+
+def test_sequence_ordre_aller_retour():
+    sequence = [3, 0, 2, 1]
+    assert ordre_vers_sequence(sequence_vers_ordre(sequence)) == sequence
+    assert ordre_vers_sequence([]) == []
+
+    photos, _ = magasin_aleatoire(10, graine=5)
+    diapositives = construire_diapositives(photos, range(10), [])
+    attendu = sum(diapositives.interet(i, j) for i, j in zip(range(9), range(1, 10)))
+    assert score_sequence(diapositives, list(range(10))) == attendu
@@ -0,0 +1,123 @@
+import pytest
+
+gp = pytest.importorskip("gurobipy")
+from gurobipy import GRB  # noqa: E402
+
+from termination_policies import (  # noqa: E402
+    AllOf,
+    AnyOf,
+    GapStagnation,
+    NodeBudget,
+    ObjectiveTarget,
+    Progress,
+    TerminationPolicy,
+    TimeSinceIncumbent,
+    optimize,
+)
+
+
+def progress(runtime, obj_best, obj_bound, sol_count=1, node_count=0.0):
+    snapshot = Progress()
+    snapshot.runtime = runtime
+    snapshot.obj_best = obj_best
+    snapshot.obj_bound = obj_bound
+    snapshot.sol_count = sol_count
+    snapshot.node_count = node_count
+    return snapshot
+
+
+class Always(TerminationPolicy):
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    def should_stop(self, progress):
+        self.calls += 1
+        return self.answer
+
+
+def test_policy_base_is_abstract():
+    with pytest.raises(TypeError):
+        TerminationPolicy()
+
+
+def test_gap_stagnation_with_zero_objective():
+    policy = GapStagnation(window=5)
+    # A zero incumbent against a nonzero bound has no finite gap: never a reason to stop
+    for runtime in (0.0, 10.0, 100.0):
+        assert not policy.should_stop(progress(runtime, 0.0, 50.0))
+    # The window starts at the first finite gap, not at the start of the solve
+    assert not policy.should_stop(progress(101.0, 40.0, 50.0))
+    assert not policy.should_stop(progress(105.0, 40.0, 50.0))
+    assert policy.should_stop(progress(106.5, 40.0, 50.0))
+    # An optimal zero objective has a zero gap
+    assert Progress().gap == GRB.INFINITY
+    assert progress(0.0, 0.0, 0.0).gap == 0.0
+
+
+def test_gap_stagnation_restarts_on_improvement():
+    policy = GapStagnation(window=5, epsilon=0.01)
+    assert not policy.should_stop(progress(0.0, 50.0, 100.0))
+    assert not policy.should_stop(progress(4.0, 60.0, 100.0))
+    assert not policy.should_stop(progress(8.0, 60.0, 100.0))
+    assert policy.should_stop(progress(9.5, 60.0, 100.0))
+    policy.reset(None)
+    assert not policy.should_stop(progress(9.5, 60.0, 100.0))
+
+
+def test_time_since_incumbent():
+    policy = TimeSinceIncumbent(3)
+    assert not policy.should_stop(progress(1.0, 0.0, 0.0, sol_count=0))
+    assert not policy.should_stop(progress(2.0, 10.0, 20.0))
+    assert not policy.should_stop(progress(4.0, 10.0, 20.0))
+    assert policy.should_stop(progress(5.5, 10.0, 20.0))
+
+
+def test_objective_target_follows_the_model_sense(env):
+    target = ObjectiveTarget(100, absolute=1.0)
+    assert target.should_stop(progress(0.0, 100.5, 0.0))
+    assert not target.should_stop(progress(0.0, 102.0, 0.0))
+
+    with gp.Model(env=env) as model:
+        model.ModelSense = GRB.MAXIMIZE
+        model.update()
+        target.reset(model)
+    assert target.should_stop(progress(0.0, 120.0, 200.0))
+    assert not target.should_stop(progress(0.0, 98.0, 200.0))
+    assert not target.should_stop(progress(0.0, 120.0, 200.0, sol_count=0))
+
+
+def test_any_of_and_all_of_poll_every_policy():
+    yes, no = Always(True), Always(False)
+    assert (yes | no).should_stop(Progress())
+    assert not (yes & no).should_stop(Progress())
+    assert AllOf(yes, yes).should_stop(Progress())
+    assert not AnyOf(no, no).should_stop(Progress())
+    assert (yes.calls, no.calls) == (4, 4)
+
+
+def test_optimize_runs_extra_callbacks_first(small_mkp):
+    calls = []
+
+    class Recording(TerminationPolicy):
+        def should_stop(self, progress):
+            calls.append("policy")
+            return False
+
+    def first(model, where):
+        if where == GRB.Callback.MIP:
+            calls.append("callback")
+
+    with small_mkp() as model:
+        optimize(model, Recording(), first)
+        assert model.Status == GRB.OPTIMAL
+    assert calls and calls[::2] == ["callback"] * (len(calls) // 2) and calls[1::2] == ["policy"] * (len(calls) // 2)
+
+
+def test_optimize_stops_on_policy(small_mkp):
+    with small_mkp(seed=1) as model:
+        optimize(model, NodeBudget(0) | Always(False))
+        assert model.Status == GRB.INTERRUPTED
+    with small_mkp(seed=1) as model:
+        optimize(model)
+        assert model.Status == GRB.OPTIMAL
@@ -0,0 +1,63 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+gp = pytest.importorskip("gurobipy")
+from gurobipy import GRB  # noqa: E402
+
+from trajectory import COLUMNS, TrajectoryRecorder, attach_recorder  # noqa: E402
+
+
+def test_ring_buffer_keeps_the_latest_rows():
+    recorder = TrajectoryRecorder(capacity=4)
+    for k in range(10):
+        recorder.record(float(k), 10.0 + k, 20.0, k, 1)
+
+    assert recorder.count == 10
+    assert recorder.rows()[:, 0].tolist() == [6.0, 7.0, 8.0, 9.0]
+    recorder.record(10.0, 0.0, 5.0, 10, 1)
+    assert recorder.rows()[-1, 3] == GRB.INFINITY
+
+
+@pytest.mark.parametrize("sense", [GRB.MAXIMIZE, GRB.MINIMIZE])
+def test_incumbents_end_at_the_final_objective(sense, small_mkp):
+    recorder = TrajectoryRecorder()
+    with small_mkp(sense=sense) as model:
+        model.optimize(attach_recorder(model, recorder))
+        recorder.finish(model)
+        objective = model.ObjVal
+        solutions = model.SolCount
+
+    rows = recorder.rows()
+    found = rows[rows[:, 5] > 0]
+    assert len(found) > 0
+    # Incumbents only improve, and the best one recorded is the final objective
+    assert np.all(sense * np.diff(found[:, 1]) <= 1e-9)
+    assert found[-1, 1] == pytest.approx(objective)
+    assert found[:, 5].max() <= solutions
+    assert recorder.summary["objective"] == objective
+    assert recorder.summary["recorded"] == recorder.count and recorder.summary["dropped"] == 0
+
+
+def test_csv_and_json_output(tmp_path, small_mkp):
+    recorder = TrajectoryRecorder(capacity=2)
+    with small_mkp(seed=1) as model:
+        model.optimize(attach_recorder(model, recorder))
+        recorder.finish(model)
+
+    recorder.save(str(tmp_path / "trace.csv"))
+    recorder.save(str(tmp_path / "trace.json"))
+
+    with open(tmp_path / "trace.csv") as f:
+        lines = f.read().splitlines()
+    comments = [line for line in lines if line.startswith("#")]
+    assert "# model=small_mkp" in comments
+    table = list(csv.reader(line for line in lines if not line.startswith("#")))
+    assert tuple(table[0]) == COLUMNS and len(table) == 1 + len(recorder.rows())
+
+    with open(tmp_path / "trace.json") as f:
+        content = json.load(f)
+    assert content["trajectory"] == recorder.rows().tolist()
+    assert content["summary"]["dropped"] == max(0, recorder.count - 2)
@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+
+gp = pytest.importorskip("gurobipy")
+from gurobipy import GRB  # noqa: E402
+
+from Unit_Commitment_Problem_API import (  # noqa: E402
+    COST_MODES,
+    _build_model_loops,
+    build_model,
+    evaluate_commitment,
+    generate_fleet,
+    generate_scenarios,
+    load_forecast,
+    load_units,
+    schedule,
+    schedule_cost,
+    solve_rolling_horizon,
+    solve_scenarios_together,
+)
+
+# The size-limited licence caps quadratic models at 200 variables: 3 units x 6 intervals x 4 blocks
+NUM_UNITS, NUM_INTERVALS = 3, 6
+
+
+def solve(model):
+    """Optimal objective of a model, disposed afterwards."""
+    with model:
+        model.optimize()
+        assert model.Status == GRB.OPTIMAL
+        return model.ObjVal
+
+
+def solve_schedule(model):
+    """Optimal objective and (power, commitment) schedule of an array model."""
+    with model:
+        model.optimize()
+        assert model.Status == GRB.OPTIMAL
+        return model.ObjVal, schedule(model)
+
+
+def test_array_model_matches_the_loop_model(env):
+    for seed in range(3):
+        units, load, solar = generate_fleet(NUM_UNITS, NUM_INTERVALS, seed)
+        objective, (power, commitment) = solve_schedule(build_model(units, load, solar, env))
+        expected = solve(_build_model_loops(units, load, solar, env))
+        assert objective == pytest.approx(expected, rel=1e-5)
+
+        # The schedule meets the net load within the operating limits, at the model's cost
+        assert power.sum(axis=0) == pytest.approx(load - solar, abs=1e-5)
+        assert np.all(power <= units["pmax"][:, None] * commitment + 1e-6)
+        assert np.all(power >= units["pmin"][:, None] * commitment - 1e-6)
+        assert schedule_cost(units, power, commitment) == pytest.approx(objective, rel=1e-5)
+
+
+def test_sample_data(env):
+    units = load_units()
+    load, solar = load_forecast()
+    assert list(units["name"]) == ["gen1", "gen2", "gen3"] and units["pmax"].tolist() == [5.0, 10.0, 3.0]
+
+    load, solar = load[:NUM_INTERVALS], solar[:NUM_INTERVALS]
+    objective = solve(build_model(units, load, solar, env))
+    expected = solve(_build_model_loops(units, load, solar, env))
+    assert objective == pytest.approx(expected, rel=1e-5)
+
+
+@pytest.mark.parametrize("window, step", [(0, 0), (4, 0), (3, 4), (NUM_INTERVALS + 1, 2)])
+def test_rolling_horizon_rejects_bad_windows(window, step, env):
+    units, load, solar = generate_fleet(NUM_UNITS, NUM_INTERVALS)
+    with pytest.raises(ValueError):
+        solve_rolling_horizon(units, load, solar, window, step, env)
+
+
+def test_single_window_is_the_monolithic_solve(env):
+    units, load, solar = generate_fleet(NUM_UNITS, NUM_INTERVALS, seed=1)
+    power, commitment, window_times = solve_rolling_horizon(units, load, solar, NUM_INTERVALS, NUM_INTERVALS, env)
+    assert len(window_times) == 1
+    assert schedule_cost(units, power, commitment) == pytest.approx(solve(build_model(units, load, solar, env)), rel=1e-5)
+
+
+@pytest.mark.parametrize("window, step", [(4, 2), (3, 3), (4, 3), (2, 1)])
+def test_rolling_schedule_is_feasible_and_no_cheaper(window, step, env):
+    units, load, solar = generate_fleet(NUM_UNITS, NUM_INTERVALS, seed=2)
+    power, commitment, window_times = solve_rolling_horizon(units, load, solar, window, step, env)
+
+    assert len(window_times) == -(-NUM_INTERVALS // step)
+    assert power.sum(axis=0) == pytest.approx(load - solar, abs=1e-5)
+    assert np.all(power <= units["pmax"][:, None] * commitment + 1e-6)
+    assert np.all(power >= units["pmin"][:, None] * commitment - 1e-6)
+    monolithic = solve(build_model(units, load, solar, env))
+    assert schedule_cost(units, power, commitment) >= monolithic - 1e-6 * abs(monolithic)
+
+
+def test_scenario_solves_agree(env):
+    units, load, solar = generate_fleet(NUM_UNITS, NUM_INTERVALS, seed=3)
+    load_scenarios, solar_scenarios = generate_scenarios(load, solar, 6, seed=1)
+
+    together, feasible = solve_scenarios_together(units, load_scenarios, solar_scenarios, env)
+    rebuilt = np.array([solve(build_model(units, row, solar_row, env)) for row, solar_row in zip(load_scenarios, solar_scenarios)])
+    assert feasible.all()
+    assert together == pytest.approx(rebuilt, rel=1e-4)
+
+    # The forecast's commitment costs at least each scenario's own optimum, and the same in every worker layout
+    _, (_, commitment) = solve_schedule(build_model(units, load, solar, env))
+    plan, plan_feasible = evaluate_commitment(units, commitment, load_scenarios, solar_scenarios, env)
+    assert np.all(plan[plan_feasible] >= together[plan_feasible] * (1 - 1e-6))
+    assert np.all(np.isinf(plan[~plan_feasible]))
+    pooled, pooled_feasible = evaluate_commitment(units, commitment, load_scenarios, solar_scenarios, processes=2, chunksize=2)
+    assert np.array_equal(pooled_feasible, plan_feasible)
+    assert pooled[plan_feasible] == pytest.approx(plan[plan_feasible], rel=1e-6)
+
+
+def test_fixed_plan_on_its_own_forecast(env):
+    units, load, solar = generate_fleet(NUM_UNITS, NUM_INTERVALS, seed=4)
+    objective, (_, commitment) = solve_schedule(build_model(units, load, solar, env))
+    costs, feasible = evaluate_commitment(units, commitment, load[None, :], solar[None, :], env)
+    assert feasible.all() and costs[0] == pytest.approx(objective, rel=1e-5)
+
+
+def test_cost_modes_bracket_the_quadratic_optimum(env):
+    units, load, solar = generate_fleet(NUM_UNITS, NUM_INTERVALS, seed=5)
+    quadratic = solve(build_model(units, load, solar, env))
+    for segments in (2, 4, 8):
+        # Tangents under-estimate the convex cost, chords over-estimate it
+        tangent = solve(build_model(units, load, solar, env, "tangent", segments))
+        pwl, (power, commitment) = solve_schedule(build_model(units, load, solar, env, "pwl", segments))
+        assert tangent <= quadratic * (1 + 1e-6) <= pwl * (1 + 2e-6)
+        assert schedule_cost(units, power, commitment) <= pwl * (1 + 1e-6)
+    assert (pwl - tangent) / quadratic < 0.05
+
+
+def test_more_segments_tighten_the_approximations(env):
+    units, load, solar = generate_fleet(NUM_UNITS, NUM_INTERVALS, seed=6)
+    tangents = [solve(build_model(units, load, solar, env, "tangent", segments)) for segments in (1, 2, 4, 8)]
+    chords = [solve(build_model(units, load, solar, env, "pwl", segments)) for segments in (1, 2, 4, 8)]
+    assert tangents == sorted(tangents) and chords == sorted(chords, reverse=True)
+
+
+def test_unknown_cost_mode(env):
+    assert COST_MODES == ("quadratic", "tangent", "pwl")
+    with pytest.raises(ValueError):
+        build_model(*generate_fleet(NUM_UNITS, NUM_INTERVALS), env, "cubic")
+
+
+@pytest.mark.parametrize("cost_mode", ["tangent", "pwl"])
+def test_cost_mode_reaches_rolling_and_scenarios(cost_mode, env):
+    # Linear cost modes lift the quadratic size limit: a full day fits in the licence
+    units, load, solar = generate_fleet(NUM_UNITS, 24, seed=7)
+    expected = solve(build_model(units, load, solar, env, cost_mode))
+
+    costs, feasible = solve_scenarios_together(units, load[None, :], solar[None, :], env, cost_mode)
+    assert feasible.all() and costs[0] == pytest.approx(expected, rel=1e-5)
+
+    # A single full window is optimal for the same cost mode: re-dispatching its plan gives the optimum back
+    _, commitment, _ = solve_rolling_horizon(units, load, solar, 24, 24, env, cost_mode=cost_mode)
+    plan, _ = evaluate_commitment(units, commitment, load[None, :], solar[None, :], env, cost_mode=cost_mode)
+    assert plan[0] == pytest.approx(expected, rel=1e-5)
@@ -0,0 +1,83 @@
+import random
+
+from verify import calculer_score_diaporama, lire_fichier_entree, principal, valider_diaporama
+
+
+def photos_naives(fichier_entree):
+    with open(fichier_entree) as fichier:
+        lignes = fichier.read().splitlines()
+    return [(ligne.split()[0], set(ligne.split()[2:])) for ligne in lignes[1:int(lignes[0]) + 1]]
+
+
+def diaporama_aleatoire(photos, graine=0):
+    aleatoire = random.Random(graine)
+    horizontales = [[i] for i, (orientation, _) in enumerate(photos) if orientation == "H"]
+    verticales = [i for i, (orientation, _) in enumerate(photos) if orientation == "V"]
+    aleatoire.shuffle(verticales)
+    diapositives = horizontales + [list(paire) for paire in zip(verticales[::2], verticales[1::2])]
+    aleatoire.shuffle(diapositives)
+    return diapositives
+
+
+def score_naif(photos, diapositives):
+    ensembles = [set().union(*(photos[i][1] for i in ids)) for ids in diapositives]
+    return sum(
+        min(len(a & b), len(a - b), len(b - a)) for a, b in zip(ensembles, ensembles[1:])
+    )
+
+
+def test_score_comme_la_force_brute(fichier_instance, tmp_path):
+    fichier = fichier_instance(300, graine=12)
+    naives = photos_naives(fichier)
+    photos = lire_fichier_entree(fichier)
+
+    for graine in range(3):
+        diapositives = diaporama_aleatoire(naives, graine)
+        assert calculer_score_diaporama(photos, diapositives) == score_naif(naives, diapositives)
+
+    rapport = tmp_path / "rapport.txt"
+    score = calculer_score_diaporama(photos, diapositives, str(rapport))
+    lignes = rapport.read_text().splitlines()
+    assert len(lignes) == len(diapositives) - 1
+    assert sum(int(ligne.rsplit(":", 1)[1]) for ligne in lignes) == score
+
+
+def test_sans_etiquette_et_trop_court(tmp_path):
+    fichier = tmp_path / "vide.txt"
+    fichier.write_text("3\nH 0\nH 0\nV 0\n")
+    photos = lire_fichier_entree(str(fichier))
+
+    assert calculer_score_diaporama(photos, [[0], [1]]) == 0
+    assert calculer_score_diaporama(photos, [[0]]) == 0
+    assert calculer_score_diaporama(photos, []) == 0
+
+
+def test_erreurs_de_validation(tmp_path):
+    fichier = tmp_path / "entree.txt"
+    fichier.write_text("4\nH 1 a\nV 1 b\nV 1 c\nH 1 d\n")
+    photos = lire_fichier_entree(str(fichier))
+
+    assert valider_diaporama(photos, [[0], [1, 2], [3]], 3) == []
+    erreurs = valider_diaporama(photos, [[0], [0], [1], [2, 3], [7], [], [1, 2, 3]], 2)
+    assert erreurs == [
+        "2 diapositives annoncées, 7 trouvées",
+        "Diapositive 5 : 0 photos",
+        "Diapositive 6 : 3 photos",
+        "Photo 7 inexistante",
+        "Photo 0 utilisée 2 fois",
+        # La première photo d'une diapositive mal formée compte comme utilisée
+        "Photo 1 utilisée 2 fois",
+        "Diapositive 2 : photo verticale seule",
+        "Diapositive 3 : deux photos dont une horizontale",
+    ]
+
+
+def test_principal_refuse_une_solution_invalide(tmp_path):
+    entree = tmp_path / "entree.txt"
+    entree.write_text("3\nH 2 a b\nV 1 a\nV 1 c\n")
+    solution = tmp_path / "solution.txt"
+
+    solution.write_text("2\n0\n1 2\n")
+    assert principal(str(entree), str(solution)) == 1
+    solution.write_text("2\n0\n1\n")
+    assert principal(str(entree), str(solution)) is None
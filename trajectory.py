@@ -0,0 +1,140 @@
+import csv
+import json
+import time
+from functools import partial
+
+import numpy as np
+from gurobipy import GRB
+
+COLUMNS = ("time", "incumbent", "bound", "gap", "nodes", "solutions")
+
+
+class TrajectoryRecorder:
+    """
+    Record (time, incumbent, best bound, gap, node count, solution count)
+    during a solve into a preallocated ring buffer: once capacity rows have
+    been written, the oldest rows are overwritten. MIP callbacks are sampled
+    at most every min_interval seconds; new incumbents are always recorded.
+    """
+
+    def __init__(self, capacity=4096, min_interval=0.0):
+        self.buffer = np.empty((capacity, len(COLUMNS)))
+        self.capacity = capacity
+        self.min_interval = min_interval
+        self.count = 0
+        self.last_sample = -GRB.INFINITY
+        self.sense = GRB.MINIMIZE
+        self.build_time = None
+        self.columns_removed = 0
+        self.rows_removed = 0
+        self.start_time = None
+        self.wall_time = None
+        self.summary = {}
+
+    def record(self, runtime, incumbent, bound, nodes, solutions):
+        row = self.buffer[self.count % self.capacity]
+        row[0] = runtime
+        row[1] = incumbent
+        row[2] = bound
+        if solutions == 0 or incumbent == 0:
+            row[3] = GRB.INFINITY
+        else:
+            row[3] = abs(incumbent - bound) / abs(incumbent)
+        row[4] = nodes
+        row[5] = solutions
+        self.count += 1
+
+    def rows(self):
+        """Recorded rows, oldest first."""
+        if self.count <= self.capacity:
+            return self.buffer[:self.count]
+        split = self.count % self.capacity
+        return np.concatenate([self.buffer[split:], self.buffer[:split]])
+
+    def start(self):
+        self.start_time = time.perf_counter()
+
+    def finish(self, model):
+        """Stop the wall clock and capture the final model statistics."""
+        self.wall_time = time.perf_counter() - self.start_time
+        self.summary = {
+            "model": model.ModelName,
+            "status": model.Status,
+            "build_time": self.build_time,
+            "wall_time": self.wall_time,
+            "runtime": model.Runtime,
+            "num_vars": model.NumVars,
+            "num_constrs": model.NumConstrs,
+            "presolved_vars": model.NumVars - self.columns_removed,
+            "presolved_constrs": model.NumConstrs - self.rows_removed,
+            "objective": model.ObjVal if model.SolCount > 0 else None,
+            "bound": model.ObjBound if model.IsMIP else None,
+            "nodes": model.NodeCount if model.IsMIP else None,
+            "solutions": model.SolCount,
+            "recorded": self.count,
+            "dropped": max(0, self.count - self.capacity),
+        }
+
+    def to_csv(self, path):
+        """Write the trajectory; the summary goes in leading '#' comment lines."""
+        with open(path, "w", newline="") as f:
+            for key, value in self.summary.items():
+                f.write(f"# {key}={value}\n")
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            writer.writerows(self.rows().tolist())
+
+    def to_json(self, path):
+        with open(path, "w") as f:
+            json.dump({"summary": self.summary, "columns": COLUMNS, "trajectory": self.rows().tolist()}, f, indent=2)
+
+    def save(self, path):
+        """Write to CSV or JSON depending on the file extension."""
+        if path.endswith(".json"):
+            self.to_json(path)
+        else:
+            self.to_csv(path)
+
+
+def trajectory_callback(model, where, *, cbdata):
+    if where == GRB.Callback.MIPSOL:
+        # MIPSOL_OBJBST and MIPSOL_SOLCNT do not include the solution being reported yet
+        objective = model.cbGet(GRB.Callback.MIPSOL_OBJ)
+        incumbent = model.cbGet(GRB.Callback.MIPSOL_OBJBST)
+        if cbdata.sense * (objective - incumbent) < 0:
+            incumbent = objective
+        cbdata.record(
+            model.cbGet(GRB.Callback.RUNTIME),
+            incumbent,
+            model.cbGet(GRB.Callback.MIPSOL_OBJBND),
+            model.cbGet(GRB.Callback.MIPSOL_NODCNT),
+            model.cbGet(GRB.Callback.MIPSOL_SOLCNT) + 1,
+        )
+    elif where == GRB.Callback.MIP:
+        runtime = model.cbGet(GRB.Callback.RUNTIME)
+        if runtime - cbdata.last_sample < cbdata.min_interval:
+            return
+        cbdata.last_sample = runtime
+        cbdata.record(
+            runtime,
+            model.cbGet(GRB.Callback.MIP_OBJBST),
+            model.cbGet(GRB.Callback.MIP_OBJBND),
+            model.cbGet(GRB.Callback.MIP_NODCNT),
+            model.cbGet(GRB.Callback.MIP_SOLCNT),
+        )
+    elif where == GRB.Callback.PRESOLVE:
+        cbdata.columns_removed = model.cbGet(GRB.Callback.PRE_COLDEL)
+        cbdata.rows_removed = model.cbGet(GRB.Callback.PRE_ROWDEL)
+
+
+def attach_recorder(model, recorder):
+    """
+    Start the recorder's wall clock and return the callback to pass to
+    model.optimize() (or to combine with other callbacks). Call
+    recorder.finish(model) once the solve is over.
+    """
+    # Pending changes (such as ModelSense) are only visible after an update
+    model.update()
+    recorder.sense = model.ModelSense
+    recorder.start()
+    return partial(trajectory_callback, cbdata=recorder)
@@ -1,28 +1,12 @@
-def calculer_facteur_interet(etiquettes1, etiquettes2):
-    """
-    Calculer le facteur d'intérêt entre deux ensembles d'étiquettes.
-    """
-    etiquettes_communes = len(etiquettes1.intersection(etiquettes2))
-    etiquettes_uniques_1 = len(etiquettes1 - etiquettes2)
-    etiquettes_uniques_2 = len(etiquettes2 - etiquettes1)
-    return min(etiquettes_communes, etiquettes_uniques_1, etiquettes_uniques_2)
+import numpy as np
+
+from lecture import charger_magasin, lire_entete
 
 def lire_fichier_entree(fichier_entree):
     """
     Lire le fichier d'entrée et organiser les photos en horizontales ou verticales.
     """
-    with open(fichier_entree, "r") as fichier:
-        lignes = fichier.read().strip().split("\n")
-
-    N = int(lignes[0])  # Nombre de photos
-    photos = []
-
-    for i in range(1, N + 1):
-        donnees = lignes[i].split()
-        orientation = donnees[0]
-        etiquettes = set(donnees[2:])
-        photos.append({"id": i - 1, "sens": orientation, "etiquettes": etiquettes})
-
+    photos, _, _ = charger_magasin(fichier_entree)
     return photos
 
 def lire_fichier_solution(fichier_solution):
@@ -32,9 +16,6 @@ def lire_fichier_solution(fichier_solution):
     with open(fichier_solution, "r") as fichier:
         lignes = fichier.read().strip().split("\n")
 
-    # La première ligne est le nombre de diapositives
-    S = int(lignes[0])
-
     # Les lignes suivantes décrivent les diapositives
     diapositives = []
     for ligne in lignes[1:]:
@@ -43,37 +24,115 @@ def lire_fichier_solution(fichier_solution):
 
     return diapositives
 
-def calculer_score_diaporama(photos, diapositives):
+def tableaux_diapositives(diapositives):
     """
-    Calculer le score total du diaporama en fonction de l'ordre des diapositives.
+    Convertir les diapositives en deux colonnes d'identifiants de photos
+    (photo2 vaut -1 pour une diapositive à une seule photo).
     """
-    score_total = 0
-
-    for i in range(len(diapositives) - 1):
-        # Obtenir les étiquettes des diapositives i et i+1
-        diapo1 = diapositives[i]
-        diapo2 = diapositives[i + 1]
-
-        # Si la diapositive contient une seule photo (horizontale)
-        if len(diapo1) == 1:
-            etiquettes1 = photos[diapo1[0]]["etiquettes"]
-        else:
-            # Si la diapositive contient deux photos (verticales)
-            etiquettes1 = photos[diapo1[0]]["etiquettes"].union(photos[diapo1[1]]["etiquettes"])
+    photo1 = np.array([ids[0] if ids else -1 for ids in diapositives], dtype=np.int64)
+    photo2 = np.array([ids[1] if len(ids) > 1 else -1 for ids in diapositives], dtype=np.int64)
+    return photo1, photo2
 
-        if len(diapo2) == 1:
-            etiquettes2 = photos[diapo2[0]]["etiquettes"]
-        else:
-            etiquettes2 = photos[diapo2[0]]["etiquettes"].union(photos[diapo2[1]]["etiquettes"])
-
-        # Calculer le facteur d'intérêt entre les deux diapositives
-        score_transition = calculer_facteur_interet(etiquettes1, etiquettes2)
-        score_total += score_transition
-        print(f"Transition {i} -> {i + 1} : {score_transition}")
+def valider_diaporama(photos, diapositives, nombre_annonce=None):
+    """
+    Vérifier en une passe la validité d'une solution : nombre de diapositives
+    annoncé, lignes mal formées, identifiants hors limites, photos utilisées
+    plusieurs fois et règles d'orientation (une H seule ou deux V).
 
-    return score_total
+    Retourne la liste des erreurs (vide si la solution est valide).
+    """
+    erreurs = []
+    n_photos = len(photos)
+
+    if nombre_annonce is not None and nombre_annonce != len(diapositives):
+        erreurs.append(f"{nombre_annonce} diapositives annoncées, {len(diapositives)} trouvées")
+
+    tailles = np.array([len(ids) for ids in diapositives], dtype=np.int64)
+    for k in np.flatnonzero((tailles < 1) | (tailles > 2)):
+        erreurs.append(f"Diapositive {k} : {tailles[k]} photos")
+
+    photo1, photo2 = tableaux_diapositives(diapositives)
+    utilisees = np.concatenate([photo1[tailles >= 1], photo2[tailles == 2]])
+    hors_limites = (utilisees < 0) | (utilisees >= n_photos)
+    for ident in np.unique(utilisees[hors_limites]):
+        erreurs.append(f"Photo {ident} inexistante")
+
+    valides = utilisees[~hors_limites]
+    comptes = np.bincount(valides, minlength=n_photos)
+    for ident in np.flatnonzero(comptes > 1):
+        erreurs.append(f"Photo {ident} utilisée {comptes[ident]} fois")
+
+    orientations = np.frombuffer(bytes(photos.orientations), dtype=np.uint8)
+    photo1_valide = (photo1 >= 0) & (photo1 < n_photos)
+    photo2_valide = (photo2 >= 0) & (photo2 < n_photos)
+    simples = (tailles == 1) & photo1_valide
+    for k in np.flatnonzero(simples & (orientations[np.where(simples, photo1, 0)] != ord("H"))):
+        erreurs.append(f"Diapositive {k} : photo verticale seule")
+    doubles = (tailles == 2) & photo1_valide & photo2_valide
+    verticales_1 = orientations[np.where(doubles, photo1, 0)] == ord("V")
+    verticales_2 = orientations[np.where(doubles, photo2, 0)] == ord("V")
+    for k in np.flatnonzero(doubles & ~(verticales_1 & verticales_2)):
+        erreurs.append(f"Diapositive {k} : deux photos dont une horizontale")
+
+    return erreurs
+
+def _etiquettes_photos(photos, identifiants):
+    """
+    Pour une suite d'identifiants de photos, retourner (rang, étiquette) pour
+    toutes leurs étiquettes, sans boucle Python.
+    """
+    debuts = np.asarray(photos.debuts)
+    etiquettes = np.asarray(photos.etiquettes)
+    longueurs = debuts[identifiants + 1] - debuts[identifiants]
+    rangs = np.repeat(np.arange(len(identifiants)), longueurs)
+    decalages = np.arange(longueurs.sum()) - np.repeat(np.cumsum(longueurs) - longueurs, longueurs)
+    return rangs, etiquettes[np.repeat(debuts[identifiants], longueurs) + decalages]
+
+def calculer_score_diaporama(photos, diapositives, fichier_rapport=None):
+    """
+    Calculer le score total du diaporama en fonction de l'ordre des diapositives.
 
-def principal(fichier_entree, fichier_solution):
+    Toutes les transitions sont évaluées ensemble : les étiquettes de chaque
+    diapositive sont réunies, puis les étiquettes communes de chaque paire de
+    diapositives consécutives sont comptées par un tri unique. Le détail par
+    transition peut être écrit dans fichier_rapport.
+    """
+    n = len(diapositives)
+    if n < 2:
+        return 0
+
+    photo1, photo2 = tableaux_diapositives(diapositives)
+    # Au moins 1 : sans aucune étiquette, les clés ci-dessous sont vides et le score est nul
+    nombre_etiquettes = max(len(photos.dictionnaire), 1)
+
+    # Étiquettes de chaque diapositive (union des deux photos pour les verticales)
+    rangs1, etiquettes1 = _etiquettes_photos(photos, photo1)
+    verticales = np.flatnonzero(photo2 >= 0)
+    rangs2, etiquettes2 = _etiquettes_photos(photos, photo2[verticales])
+    cles = np.concatenate([rangs1, verticales[rangs2]]) * nombre_etiquettes + np.concatenate([etiquettes1, etiquettes2])
+    # Dédoublonnage par tri et différence adjacente (np.unique est bien plus lent)
+    cles.sort()
+    cles = cles[np.concatenate((cles[:1] == cles[:1], cles[1:] != cles[:-1]))]
+    diapo, etiquette = np.divmod(cles, nombre_etiquettes)
+    longueurs = np.bincount(diapo, minlength=n)
+
+    # Chaque diapositive apparaît dans la transition qui la précède et dans celle qui la suit
+    gauche = diapo < n - 1
+    droite = diapo > 0
+    transitions = np.concatenate([diapo[gauche], diapo[droite] - 1])
+    cles_transitions = np.sort(transitions * nombre_etiquettes + np.concatenate([etiquette[gauche], etiquette[droite]]))
+    doublons = cles_transitions[1:][cles_transitions[1:] == cles_transitions[:-1]]
+    communes = np.bincount(doublons // nombre_etiquettes, minlength=n - 1)
+
+    scores = np.minimum(communes, np.minimum(longueurs[:-1] - communes, longueurs[1:] - communes))
+
+    if fichier_rapport is not None:
+        with open(fichier_rapport, "w") as rapport:
+            rapport.writelines(f"Transition {i} -> {i + 1} : {score}\n" for i, score in enumerate(scores.tolist()))
+
+    return int(scores.sum())
+
+def principal(fichier_entree, fichier_solution, fichier_rapport=None):
     """
     Fonction principale pour calculer le score d'un diaporama.
     """
@@ -82,19 +141,33 @@ def principal(fichier_entree, fichier_solution):
 
     # Lire l'ordre des diapositives à partir du fichier de solution
     diapositives = lire_fichier_solution(fichier_solution)
-    print(diapositives)
+
+    # Vérifier la solution avant de la noter
+    erreurs = valider_diaporama(photos, diapositives, lire_entete(fichier_solution))
+    if erreurs:
+        print(f"❌ Solution invalide ({len(erreurs)} erreurs) :")
+        for erreur in erreurs[:20]:
+            print(f"  {erreur}")
+        if len(erreurs) > 20:
+            print(f"  ... et {len(erreurs) - 20} autres")
+        return None
+
     # Calculer le score du diaporama
-    score = calculer_score_diaporama(photos, diapositives)
+    score = calculer_score_diaporama(photos, diapositives, fichier_rapport)
     print(f"\n🎯 **Score total du diaporama : {score}**")
+    if fichier_rapport is not None:
+        print(f"Détail des transitions écrit dans : {fichier_rapport}")
+    return score
 
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) != 3:
-        print("Utilisation: python verify.py <fichier_entree> <fichier_solution>")
+    if len(sys.argv) not in (3, 4):
+        print("Utilisation: python verify.py <fichier_entree> <fichier_solution> [fichier_rapport]")
         sys.exit(1)
 
     fichier_entree = sys.argv[1]
     fichier_solution = sys.argv[2]
+    fichier_rapport = sys.argv[3] if len(sys.argv) == 4 else None
 
-    principal(fichier_entree, fichier_solution)
\ No newline at end of file
+    principal(fichier_entree, fichier_solution, fichier_rapport)